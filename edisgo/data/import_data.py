@@ -4,7 +4,6 @@ from ..grid.grids import MVGrid, LVGrid
 from ..grid.connect import connect_mv_generators, connect_lv_generators
 from ..grid.tools import select_cable, position_switch_disconnectors
 from ..tools.geo import proj2equidistant
-from edisgo.tools import pypsa_io
 from edisgo.tools import session_scope
 
 from egoio.db_tables import model_draft, supply
@@ -1029,8 +1028,8 @@ def import_generators(network, data_source=None, file=None):
                         'imported from the oedb.')
         _import_genos_from_oedb(network=network)
         network.mv_grid._weather_cells = None
-        if network.pypsa is not None:
-            pypsa_io.update_pypsa_generator_import(network)
+        # apply imported generators to pypsa representation
+        network.pypsa_synchronizer.apply()
     elif data_source == 'pypsa':
         _import_genos_from_pypsa(network=network, file=file)
     else:
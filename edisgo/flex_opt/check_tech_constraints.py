@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import logging
 
 from edisgo.grid.grids import LVGrid
@@ -34,8 +35,7 @@ def mv_line_load(network):
 
     """
 
-    crit_lines = pd.DataFrame()
-    crit_lines = _line_load(network, network.mv_grid, crit_lines)
+    crit_lines = _line_load(network, [network.mv_grid])
 
     if not crit_lines.empty:
         logger.debug('==> {} line(s) in MV grid has/have load issues.'.format(
@@ -73,10 +73,7 @@ def lv_line_load(network):
 
     """
 
-    crit_lines = pd.DataFrame()
-
-    for lv_grid in network.mv_grid.lv_grids:
-        crit_lines = _line_load(network, lv_grid, crit_lines)
+    crit_lines = _line_load(network, list(network.mv_grid.lv_grids))
 
     if not crit_lines.empty:
         logger.debug('==> {} line(s) in LV grids has/have load issues.'.format(
@@ -87,23 +84,60 @@ def lv_line_load(network):
     return crit_lines
 
 
-def _line_load(network, grid, crit_lines):
+def line_load(network):
     """
-    Checks for over-loading issues of lines.
+    Checks for over-loading issues in MV grid and all LV grids.
 
     Parameters
     ----------
     network : :class:`~.grid.network.Network`
-    grid : :class:`~.grid.grids.LVGrid` or :class:`~.grid.grids.MVGrid`
-    crit_lines : :pandas:`pandas.DataFrame<dataframe>`
-        Dataframe containing over-loaded lines, their maximum relative
-        over-loading and the corresponding time step.
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Dataframe containing over-loaded MV and LV lines, their maximum
+        relative over-loading and the corresponding time step.
         Index of the dataframe are the over-loaded lines of type
         :class:`~.grid.components.Line`. Columns are 'max_rel_overload'
         containing the maximum relative over-loading as float and 'time_index'
         containing the corresponding time step the over-loading occured in as
         :pandas:`pandas.Timestamp<timestamp>`.
 
+    Notes
+    -----
+    Line over-load is determined based on allowed load factors for feed-in and
+    load cases that are defined in the config file 'config_grid_expansion' in
+    section 'grid_expansion_load_factors'.
+
+    """
+
+    crit_lines = _line_load(
+        network, [network.mv_grid] + list(network.mv_grid.lv_grids))
+
+    if not crit_lines.empty:
+        logger.debug('==> {} line(s) has/have load issues.'.format(
+            crit_lines.shape[0]))
+    else:
+        logger.debug('==> No line load issues.')
+
+    return crit_lines
+
+
+def _line_load(network, grids):
+    """
+    Checks for over-loading issues of lines.
+
+    The allowed current of all lines in all given grids is set up as one
+    time steps x lines matrix and compared to the currents from the power
+    flow analysis at once.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+    grids : :obj:`list`
+        List of grids (of type :class:`~.grid.grids.LVGrid` or
+        :class:`~.grid.grids.MVGrid`) to check lines for.
+
     Returns
     -------
     :pandas:`pandas.DataFrame<dataframe>`
@@ -116,43 +150,160 @@ def _line_load(network, grid, crit_lines):
         :pandas:`pandas.Timestamp<timestamp>`.
 
     """
-    if isinstance(grid, LVGrid):
-        grid_level = 'lv'
-    else:
-        grid_level = 'mv'
-
-    for line in list(grid.graph.lines()):
-        i_line_allowed_per_case = {}
-        i_line_allowed_per_case['feedin_case'] = \
-            line['line'].type['I_max_th'] * line['line'].quantity * \
-            network.config['grid_expansion_load_factors'][
-                '{}_feedin_case_line'.format(grid_level)]
-        i_line_allowed_per_case['load_case'] = \
-            line['line'].type['I_max_th'] * line['line'].quantity * \
-            network.config['grid_expansion_load_factors'][
-                '{}_load_case_line'.format(grid_level)]
-        # maximum allowed line load in each time step
-        i_line_allowed = \
-            network.timeseries.timesteps_load_feedin_case.case.apply(
-                lambda _: i_line_allowed_per_case[_])
-        try:
-            # check if maximum current from power flow analysis exceeds
-            # allowed maximum current
-            i_line_pfa = network.results.i_res[repr(line['line'])]
-            if any((i_line_allowed - i_line_pfa) < 0):
-                # find out largest relative deviation
-                relative_i_res = i_line_pfa / i_line_allowed
-                crit_lines = crit_lines.append(pd.DataFrame(
-                    {'max_rel_overload': relative_i_res.max(),
-                     'time_index': relative_i_res.idxmax()},
-                    index=[line['line']]))
-        except KeyError:
-            logger.debug('No results for line {} '.format(str(line)) +
-                         'to check overloading.')
+    i_res = network.results.i_res
+    lines, i_line_allowed_feedin_case, i_line_allowed_load_case = \
+        _allowed_line_load(network, grids, i_res.columns)
+
+    if not lines:
+        return pd.DataFrame()
+
+    feedin_case = (network.timeseries.timesteps_load_feedin_case.case.loc[
+        i_res.index] == 'feedin_case').values
+    overloaded, max_rel_overload, time_position = _critical_line_load(
+        i_res.loc[:, [repr(_) for _ in lines]].values,
+        i_line_allowed_feedin_case, i_line_allowed_load_case, feedin_case)
+
+    if not overloaded.any():
+        return pd.DataFrame()
+
+    crit_lines = pd.DataFrame(
+        {'max_rel_overload': max_rel_overload[overloaded],
+         'time_index': i_res.index[time_position[overloaded]]},
+        index=[l for l, o in zip(lines, overloaded) if o])
 
     return crit_lines
 
 
+def _allowed_line_load(network, grids, labels, mv_feeders=None):
+    """
+    Maximum allowed current of lines in feed-in and load case.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+    grids : :obj:`list`
+        List of grids (of type :class:`~.grid.grids.LVGrid` or
+        :class:`~.grid.grids.MVGrid`) to get lines for.
+    labels : :obj:`list`
+        Representatives of lines with power flow results. Lines not in
+        `labels` are skipped.
+    mv_feeders : :obj:`list` or None
+        MV feeders (see :func:`~.grid.tools.assign_mv_feeder_to_nodes`) to
+        get MV lines for. MV lines in other feeders are skipped. If None
+        lines in all MV feeders are returned. Default: None.
+
+    Returns
+    -------
+    :obj:`list`
+        Lines (of type :class:`~.grid.components.Line`).
+    :numpy:`numpy.ndarray<ndarray>`
+        Maximum allowed current of each line in A in feed-in case.
+    :numpy:`numpy.ndarray<ndarray>`
+        Maximum allowed current of each line in A in load case.
+
+    """
+    labels = set(labels)
+
+    lines = []
+    i_line_allowed_feedin_case = []
+    i_line_allowed_load_case = []
+    for grid in grids:
+        for line in grid.graph.lines():
+            if repr(line['line']) not in labels:
+                logger.debug('No results for line {} '.format(str(line)) +
+                             'to check overloading.')
+                continue
+            if mv_feeders is not None and not isinstance(grid, LVGrid):
+                mv_feeder = _mv_feeder(line['adj_nodes'])
+                if mv_feeder is not None and mv_feeder not in mv_feeders:
+                    continue
+            lines.append(line['line'])
+            i_allowed = network.limits.allowed_line_load(line['line'])
+            i_line_allowed_feedin_case.append(i_allowed[0])
+            i_line_allowed_load_case.append(i_allowed[1])
+
+    return (lines,
+            np.array(i_line_allowed_feedin_case, dtype=float),
+            np.array(i_line_allowed_load_case, dtype=float))
+
+
+def _mv_feeder(nodes):
+    """
+    MV feeder assigned to any of the given nodes.
+
+    Parameters
+    ----------
+    nodes : :obj:`list`
+        Nodes, e.g. the adjacent nodes of a line.
+
+    Returns
+    -------
+    :class:`~.grid.components.Line` or None
+        MV feeder assigned to the first node with an MV feeder (see
+        :func:`~.grid.tools.assign_mv_feeder_to_nodes`). None if no MV feeder
+        is assigned to any of the nodes (e.g. the MV station).
+
+    """
+    for node in nodes:
+        mv_feeder = getattr(node, 'mv_feeder', None)
+        if mv_feeder is not None:
+            return mv_feeder
+    return None
+
+
+def _critical_line_load(i_line_pfa, i_line_allowed_feedin_case,
+                        i_line_allowed_load_case, feedin_case):
+    """
+    Determines over-loaded lines and their maximum relative over-loading.
+
+    Parameters
+    ----------
+    i_line_pfa : :numpy:`numpy.ndarray<ndarray>`
+        Current from power flow analysis in A with one row per time step and
+        one column per line.
+    i_line_allowed_feedin_case : :numpy:`numpy.ndarray<ndarray>`
+        Maximum allowed current of each line in A in feed-in case.
+    i_line_allowed_load_case : :numpy:`numpy.ndarray<ndarray>`
+        Maximum allowed current of each line in A in load case.
+    feedin_case : :numpy:`numpy.ndarray<ndarray>`
+        Boolean array that is True for time steps that are feed-in cases.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`
+        Boolean array that is True for over-loaded lines.
+    :numpy:`numpy.ndarray<ndarray>`
+        Maximum relative over-loading of each line. NaN for lines that are
+        not over-loaded.
+    :numpy:`numpy.ndarray<ndarray>`
+        Position of the time step the maximum relative over-loading occurs in
+        for each line. -1 for lines that are not over-loaded.
+
+    """
+    number_of_lines = i_line_pfa.shape[1]
+    max_rel_overload = np.full(number_of_lines, np.nan)
+    time_position = np.full(number_of_lines, -1, dtype=int)
+
+    # maximum allowed line load in each time step (time steps x lines)
+    i_line_allowed = np.where(feedin_case[:, np.newaxis],
+                              i_line_allowed_feedin_case,
+                              i_line_allowed_load_case)
+
+    # check if maximum current from power flow analysis exceeds allowed
+    # maximum current
+    with np.errstate(invalid='ignore'):
+        overloaded = (i_line_pfa > i_line_allowed).any(axis=0)
+    if not overloaded.any():
+        return overloaded, max_rel_overload, time_position
+
+    # find out largest relative deviation
+    relative_i_res = i_line_pfa[:, overloaded] / i_line_allowed[:, overloaded]
+    max_rel_overload[overloaded] = np.nanmax(relative_i_res, axis=0)
+    time_position[overloaded] = np.nanargmax(relative_i_res, axis=0)
+
+    return overloaded, max_rel_overload, time_position
+
+
 def hv_mv_station_load(network):
     """
     Checks for over-loading of HV/MV station.
@@ -179,9 +330,7 @@ def hv_mv_station_load(network):
     section 'grid_expansion_load_factors'.
 
     """
-    crit_stations = pd.DataFrame()
-    crit_stations = _station_load(network, network.mv_grid.station,
-                                  crit_stations)
+    crit_stations = _station_load(network, [network.mv_grid.station])
     if not crit_stations.empty:
         logger.debug('==> HV/MV station has load issues.')
     else:
@@ -217,11 +366,8 @@ def mv_lv_station_load(network):
 
     """
 
-    crit_stations = pd.DataFrame()
-
-    for lv_grid in network.mv_grid.lv_grids:
-        crit_stations = _station_load(network, lv_grid.station,
-                                      crit_stations)
+    crit_stations = _station_load(
+        network, [lv_grid.station for lv_grid in network.mv_grid.lv_grids])
     if not crit_stations.empty:
         logger.debug('==> {} MV/LV station(s) has/have load issues.'.format(
             crit_stations.shape[0]))
@@ -231,23 +377,20 @@ def mv_lv_station_load(network):
     return crit_stations
 
 
-def _station_load(network, station, crit_stations):
+def _station_load(network, stations):
     """
     Checks for over-loading of stations.
 
+    The apparent power of all given stations (summed up over all
+    transformers of a station) is set up as one time steps x stations matrix
+    and compared to the allowed apparent power at once.
+
     Parameters
     ----------
     network : :class:`~.grid.network.Network`
-    station : :class:`~.grid.components.LVStation` or :class:`~.grid.components.MVStation`
-    crit_stations : :pandas:`pandas.DataFrame<dataframe>`
-        Dataframe containing over-loaded stations, their apparent power at
-        maximal over-loading and the corresponding time step.
-        Index of the dataframe are the over-loaded stations either of type
-        :class:`~.grid.components.LVStation` or
-        :class:`~.grid.components.MVStation`. Columns are 's_pfa'
-        containing the apparent power at maximal over-loading as float and
-        'time_index' containing the corresponding time step the over-loading
-        occured in as :pandas:`pandas.Timestamp<timestamp>`.
+    stations : :obj:`list`
+        List of stations (of type :class:`~.grid.components.LVStation` or
+        :class:`~.grid.components.MVStation`) to check.
 
     Returns
     -------
@@ -262,53 +405,188 @@ def _station_load(network, station, crit_stations):
         occured in as :pandas:`pandas.Timestamp<timestamp>`.
 
     """
-    if isinstance(station, LVStation):
-        grid_level = 'lv'
-    else:
-        grid_level = 'mv'
-
-    # maximum allowed apparent power of station for feed-in and load case
-    s_station = sum([_.type.S_nom for _ in station.transformers])
-    s_station_allowed_per_case = {}
-    s_station_allowed_per_case['feedin_case'] = s_station * network.config[
-        'grid_expansion_load_factors']['{}_feedin_case_transformer'.format(
-        grid_level)]
-    s_station_allowed_per_case['load_case'] = s_station * network.config[
-        'grid_expansion_load_factors']['{}_load_case_transformer'.format(
-        grid_level)]
-    # maximum allowed apparent power of station in each time step
-    s_station_allowed = \
-        network.timeseries.timesteps_load_feedin_case.case.apply(
-            lambda _: s_station_allowed_per_case[_])
-
-    try:
+    pfa_p = network.results.pfa_p
+    pfa_q = network.results.pfa_q
+    labels = set(pfa_p.columns) & set(pfa_q.columns)
+
+    (stations, transformer_labels, labels_offset, s_station,
+     load_factor_feedin_case, load_factor_load_case) = \
+        _allowed_station_load(network, stations, labels)
+
+    if not stations:
+        return pd.DataFrame()
+
+    # apparent power of stations from power flow analysis (time steps x
+    # stations)
+    s_station_pfa = _sum_apparent_power(
+        pfa_p.loc[:, transformer_labels].values,
+        pfa_q.loc[:, transformer_labels].values, labels_offset)
+    feedin_case = (network.timeseries.timesteps_load_feedin_case.case.loc[
+        pfa_p.index] == 'feedin_case').values
+    overloaded, s_pfa, time_position = _critical_station_load(
+        s_station_pfa, s_station, load_factor_feedin_case,
+        load_factor_load_case, feedin_case)
+
+    if not overloaded.any():
+        return pd.DataFrame()
+
+    crit_stations = pd.DataFrame(
+        {'s_pfa': s_pfa[overloaded],
+         'time_index': pfa_p.index[time_position[overloaded]]},
+        index=[s for s, o in zip(stations, overloaded) if o])
+
+    return crit_stations
+
+
+def _allowed_station_load(network, stations, labels):
+    """
+    Nominal apparent power and load factors of stations.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+    stations : :obj:`list`
+        List of stations (of type :class:`~.grid.components.LVStation` or
+        :class:`~.grid.components.MVStation`).
+    labels : :obj:`list`
+        Representatives of components with power flow results. For LV
+        stations these are the stations' transformers, for the MV station
+        the station itself. Stations without any of their components in
+        `labels` are skipped.
+
+    Returns
+    -------
+    :obj:`list`
+        Stations with power flow results.
+    :obj:`list`
+        Representatives of components to sum up apparent power from power
+        flow analysis over for each station.
+    :obj:`list`
+        Position of the first component of each station in the list of
+        representatives.
+    :numpy:`numpy.ndarray<ndarray>`
+        Nominal apparent power of each station in kVA.
+    :numpy:`numpy.ndarray<ndarray>`
+        Load factor of each station in feed-in case.
+    :numpy:`numpy.ndarray<ndarray>`
+        Load factor of each station in load case.
+
+    """
+    labels = set(labels)
+
+    stations_checked = []
+    station_labels = []
+    labels_offset = []
+    s_station = []
+    load_factor_feedin_case = []
+    load_factor_load_case = []
+    for station in stations:
         if isinstance(station, LVStation):
-            s_station_pfa = network.results.s_res(
-                station.transformers).sum(axis=1)
+            labels_included = [repr(_) for _ in station.transformers
+                               if repr(_) in labels]
         else:
-            s_station_pfa = network.results.s_res([station]).iloc[:, 0]
-        s_res = s_station_allowed - s_station_pfa
-        s_res = s_res[s_res < 0]
-        # check if maximum allowed apparent power of station exceeds
-        # apparent power from power flow analysis at any time step
-        if not s_res.empty:
-            # find out largest relative deviation
-            load_factor = \
-                network.timeseries.timesteps_load_feedin_case.case.apply(
-                    lambda _: network.config[
-                        'grid_expansion_load_factors'][
-                        '{}_{}_transformer'.format(grid_level, _)])
-            relative_s_res = load_factor * s_res
-            crit_stations = crit_stations.append(pd.DataFrame(
-                {'s_pfa': s_station_pfa.loc[relative_s_res.idxmin()],
-                 'time_index': relative_s_res.idxmin()},
-                index=[station]))
-
-    except KeyError:
-        logger.debug('No results for {} station to check overloading.'.format(
-            grid_level.upper()))
+            labels_included = [repr(station)] if repr(station) in labels \
+                else []
+        if not labels_included:
+            logger.debug(
+                'No results for {} station to check overloading.'.format(
+                    'LV' if isinstance(station, LVStation) else 'MV'))
+            continue
+        stations_checked.append(station)
+        labels_offset.append(len(station_labels))
+        station_labels.extend(labels_included)
+        s_allowed = network.limits.allowed_station_load(station)
+        s_station.append(s_allowed[0])
+        load_factor_feedin_case.append(s_allowed[1])
+        load_factor_load_case.append(s_allowed[2])
+
+    return (stations_checked, station_labels, labels_offset,
+            np.array(s_station, dtype=float),
+            np.array(load_factor_feedin_case, dtype=float),
+            np.array(load_factor_load_case, dtype=float))
+
+
+def _sum_apparent_power(p, q, labels_offset):
+    """
+    Sums up apparent power of components in groups.
 
-    return crit_stations
+    Parameters
+    ----------
+    p : :numpy:`numpy.ndarray<ndarray>`
+        Active power with one row per time step and one column per component.
+    q : :numpy:`numpy.ndarray<ndarray>`
+        Reactive power with one row per time step and one column per
+        component.
+    labels_offset : :obj:`list`
+        Position of the first component of each group.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`
+        Apparent power with one row per time step and one column per group.
+
+    """
+    return np.add.reduceat(np.hypot(p, q), labels_offset, axis=1)
+
+
+def _critical_station_load(s_station_pfa, s_station, load_factor_feedin_case,
+                           load_factor_load_case, feedin_case):
+    """
+    Determines over-loaded stations and their apparent power at maximal
+    over-loading.
+
+    Parameters
+    ----------
+    s_station_pfa : :numpy:`numpy.ndarray<ndarray>`
+        Apparent power from power flow analysis in kVA with one row per time
+        step and one column per station.
+    s_station : :numpy:`numpy.ndarray<ndarray>`
+        Nominal apparent power of each station in kVA.
+    load_factor_feedin_case : :numpy:`numpy.ndarray<ndarray>`
+        Load factor of each station in feed-in case.
+    load_factor_load_case : :numpy:`numpy.ndarray<ndarray>`
+        Load factor of each station in load case.
+    feedin_case : :numpy:`numpy.ndarray<ndarray>`
+        Boolean array that is True for time steps that are feed-in cases.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`
+        Boolean array that is True for over-loaded stations.
+    :numpy:`numpy.ndarray<ndarray>`
+        Apparent power at maximal over-loading of each station. NaN for
+        stations that are not over-loaded.
+    :numpy:`numpy.ndarray<ndarray>`
+        Position of the time step of maximal over-loading for each station.
+        -1 for stations that are not over-loaded.
+
+    """
+    number_of_stations = s_station_pfa.shape[1]
+    s_pfa = np.full(number_of_stations, np.nan)
+    time_position = np.full(number_of_stations, -1, dtype=int)
+
+    # maximum allowed apparent power of stations in each time step
+    load_factor = np.where(feedin_case[:, np.newaxis],
+                           load_factor_feedin_case, load_factor_load_case)
+    s_station_allowed = load_factor * s_station
+
+    # check if apparent power from power flow analysis exceeds maximum
+    # allowed apparent power of stations at any time step
+    s_res = s_station_allowed - s_station_pfa
+    with np.errstate(invalid='ignore'):
+        s_res_negative = s_res < 0
+    overloaded = s_res_negative.any(axis=0)
+    if not overloaded.any():
+        return overloaded, s_pfa, time_position
+
+    # find out largest relative deviation
+    relative_s_res = np.where(s_res_negative, load_factor * s_res, np.inf)
+    position = relative_s_res[:, overloaded].argmin(axis=0)
+    time_position[overloaded] = position
+    s_pfa[overloaded] = s_station_pfa[:, overloaded][
+        position, np.arange(len(position))]
+
+    return overloaded, s_pfa, time_position
 
 
 def mv_voltage_deviation(network, voltage_levels='mv_lv'):
@@ -351,54 +629,16 @@ def mv_voltage_deviation(network, voltage_levels='mv_lv'):
 
     """
 
-    crit_nodes = {}
+    v_dev_allowed_upper, v_dev_allowed_lower = _mv_voltage_limits(
+        network, voltage_levels)
 
-    v_dev_allowed_per_case = {}
-    v_dev_allowed_per_case['feedin_case_lower'] = 0.9
-    v_dev_allowed_per_case['load_case_upper'] = 1.1
-    offset = network.config[
-        'grid_expansion_allowed_voltage_deviations']['hv_mv_trafo_offset']
-    control_deviation = network.config[
-        'grid_expansion_allowed_voltage_deviations'][
-        'hv_mv_trafo_control_deviation']
-    if voltage_levels == 'mv_lv':
-        v_dev_allowed_per_case['feedin_case_upper'] = \
-            1 + offset + control_deviation + network.config[
-                'grid_expansion_allowed_voltage_deviations'][
-                'mv_lv_feedin_case_max_v_deviation']
-        v_dev_allowed_per_case['load_case_lower'] = \
-            1 + offset - control_deviation - network.config[
-                'grid_expansion_allowed_voltage_deviations'][
-                'mv_lv_load_case_max_v_deviation']
-    elif voltage_levels == 'mv':
-        v_dev_allowed_per_case['feedin_case_upper'] = \
-            1 + offset + control_deviation + network.config[
-                'grid_expansion_allowed_voltage_deviations'][
-                'mv_feedin_case_max_v_deviation']
-        v_dev_allowed_per_case['load_case_lower'] = \
-            1 + offset - control_deviation - network.config[
-                'grid_expansion_allowed_voltage_deviations'][
-                'mv_load_case_max_v_deviation']
-    else:
-        raise ValueError(
-            'Specified mode {} is not a valid option.'.format(voltage_levels))
-    # maximum allowed apparent power of station in each time step
-    v_dev_allowed_upper = \
-        network.timeseries.timesteps_load_feedin_case.case.apply(
-            lambda _: v_dev_allowed_per_case['{}_upper'.format(_)])
-    v_dev_allowed_lower = \
-        network.timeseries.timesteps_load_feedin_case.case.apply(
-            lambda _: v_dev_allowed_per_case['{}_lower'.format(_)])
+    nodes = {network.mv_grid: list(network.mv_grid.graph.nodes())}
 
-    nodes = list(network.mv_grid.graph.nodes())
-
-    crit_nodes_grid = _voltage_deviation(
+    crit_nodes = _voltage_deviation(
         network, nodes, v_dev_allowed_upper, v_dev_allowed_lower,
         voltage_level='mv')
 
-    if not crit_nodes_grid.empty:
-        crit_nodes[network.mv_grid] = crit_nodes_grid.sort_values(
-            by=['v_mag_pu'], ascending=False)
+    if crit_nodes:
         logger.debug(
             '==> {} node(s) in MV grid has/have voltage issues.'.format(
                 crit_nodes[network.mv_grid].shape[0]))
@@ -408,6 +648,28 @@ def mv_voltage_deviation(network, voltage_levels='mv_lv'):
     return crit_nodes
 
 
+def _mv_voltage_limits(network, voltage_levels):
+    """
+    Allowed upper and lower voltage in MV grid in each time step.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+    voltage_levels : :obj:`str`
+        Specifies which allowed voltage deviations to use. See
+        :func:`mv_voltage_deviation` for possible options.
+
+    Returns
+    -------
+    :pandas:`pandas.Series<series>`
+        Allowed upper voltage in p.u. in each time step.
+    :pandas:`pandas.Series<series>`
+        Allowed lower voltage in p.u. in each time step.
+
+    """
+    return network.limits.voltage_limits(voltage_levels)
+
+
 def lv_voltage_deviation(network, mode=None, voltage_levels='mv_lv'):
     """
     Checks for voltage stability issues in LV grids.
@@ -451,110 +713,30 @@ def lv_voltage_deviation(network, mode=None, voltage_levels='mv_lv'):
 
     """
 
-    crit_nodes = {}
-
-    v_dev_allowed_per_case = {}
-    if voltage_levels == 'mv_lv':
-        offset = network.config[
-            'grid_expansion_allowed_voltage_deviations']['hv_mv_trafo_offset']
-        control_deviation = network.config[
-            'grid_expansion_allowed_voltage_deviations'][
-            'hv_mv_trafo_control_deviation']
-        v_dev_allowed_per_case['feedin_case_upper'] = \
-            1 + offset + control_deviation + network.config[
-                'grid_expansion_allowed_voltage_deviations'][
-                'mv_lv_feedin_case_max_v_deviation']
-        v_dev_allowed_per_case['load_case_lower'] = \
-            1 + offset - control_deviation - network.config[
-                'grid_expansion_allowed_voltage_deviations'][
-                'mv_lv_load_case_max_v_deviation']
-
-        v_dev_allowed_per_case['feedin_case_lower'] = 0.9
-        v_dev_allowed_per_case['load_case_upper'] = 1.1
-
-        v_dev_allowed_upper = \
-                network.timeseries.timesteps_load_feedin_case.case.apply(
-                lambda _: v_dev_allowed_per_case['{}_upper'.format(_)])
-        v_dev_allowed_lower = \
-            network.timeseries.timesteps_load_feedin_case.case.apply(
-                lambda _: v_dev_allowed_per_case['{}_lower'.format(_)])
-    elif voltage_levels == 'lv':
-        pass
+    if mode:
+        if mode != 'stations':
+            raise ValueError(
+                "{} is not a valid option for input variable 'mode' in "
+                "function lv_voltage_deviation. Try 'stations' or "
+                "None".format(mode))
+
+    lv_grids = list(network.mv_grid.lv_grids)
+    if voltage_levels == 'lv':
+        # get voltage at primary side (stations) respectively secondary side
+        # of LV stations to calculate upper bound for feed-in case and lower
+        # bound for load case
+        v_lv_station = network.results.v_res(
+            nodes=[_.station for _ in lv_grids],
+            level='mv' if mode == 'stations' else 'lv')
     else:
-        raise ValueError(
-            'Specified mode {} is not a valid option.'.format(voltage_levels))
-
-    for lv_grid in network.mv_grid.lv_grids:
+        v_lv_station = None
+    lv_grids, v_dev_allowed_upper, v_dev_allowed_lower = _lv_voltage_limits(
+        network, lv_grids, mode, voltage_levels, v_lv_station)
+    nodes = _lv_voltage_nodes(lv_grids, mode)
 
-        if mode:
-            if mode == 'stations':
-                nodes = [lv_grid.station]
-            else:
-                raise ValueError(
-                    "{} is not a valid option for input variable 'mode' in "
-                    "function lv_voltage_deviation. Try 'stations' or "
-                    "None".format(mode))
-        else:
-            nodes = list(lv_grid.graph.nodes())
-
-        if voltage_levels == 'lv':
-            if mode == 'stations':
-                # get voltage at primary side to calculate upper bound for
-                # feed-in case and lower bound for load case
-                v_lv_station_primary = network.results.v_res(
-                    nodes=[lv_grid.station], level='mv').iloc[:, 0]
-                timeindex = v_lv_station_primary.index
-                v_dev_allowed_per_case['feedin_case_upper'] = \
-                    v_lv_station_primary + network.config[
-                        'grid_expansion_allowed_voltage_deviations'][
-                        'mv_lv_station_feedin_case_max_v_deviation']
-                v_dev_allowed_per_case['load_case_lower'] = \
-                    v_lv_station_primary - network.config[
-                        'grid_expansion_allowed_voltage_deviations'][
-                        'mv_lv_station_load_case_max_v_deviation']
-            else:
-                # get voltage at secondary side to calculate upper bound for
-                # feed-in case and lower bound for load case
-                v_lv_station_secondary = network.results.v_res(
-                    nodes=[lv_grid.station], level='lv').iloc[:, 0]
-                timeindex = v_lv_station_secondary.index
-                v_dev_allowed_per_case['feedin_case_upper'] = \
-                    v_lv_station_secondary + network.config[
-                        'grid_expansion_allowed_voltage_deviations'][
-                        'lv_feedin_case_max_v_deviation']
-                v_dev_allowed_per_case['load_case_lower'] = \
-                    v_lv_station_secondary - network.config[
-                        'grid_expansion_allowed_voltage_deviations'][
-                        'lv_load_case_max_v_deviation']
-            v_dev_allowed_per_case['feedin_case_lower'] = pd.Series(
-                0.9, index=timeindex)
-            v_dev_allowed_per_case['load_case_upper'] = pd.Series(
-                1.1, index=timeindex)
-            # maximum allowed voltage deviation in each time step
-            v_dev_allowed_upper = []
-            v_dev_allowed_lower = []
-            for t in timeindex:
-                case = \
-                    network.timeseries.timesteps_load_feedin_case.loc[
-                        t, 'case']
-                v_dev_allowed_upper.append(
-                    v_dev_allowed_per_case[
-                        '{}_upper'.format(case)].loc[t])
-                v_dev_allowed_lower.append(
-                    v_dev_allowed_per_case[
-                        '{}_lower'.format(case)].loc[t])
-            v_dev_allowed_upper = pd.Series(v_dev_allowed_upper,
-                                            index=timeindex)
-            v_dev_allowed_lower = pd.Series(v_dev_allowed_lower,
-                                            index=timeindex)
-
-        crit_nodes_grid = _voltage_deviation(
-            network, nodes, v_dev_allowed_upper, v_dev_allowed_lower,
-            voltage_level='lv')
-
-        if not crit_nodes_grid.empty:
-            crit_nodes[lv_grid] = crit_nodes_grid.sort_values(
-                by=['v_mag_pu'], ascending=False)
+    crit_nodes = _voltage_deviation(
+        network, nodes, v_dev_allowed_upper, v_dev_allowed_lower,
+        voltage_level='lv')
 
     if crit_nodes:
         if mode == 'stations':
@@ -574,32 +756,130 @@ def lv_voltage_deviation(network, mode=None, voltage_levels='mv_lv'):
     return crit_nodes
 
 
+def _lv_voltage_nodes(lv_grids, mode):
+    """
+    Nodes to check voltage deviation for in each LV grid.
+
+    Parameters
+    ----------
+    lv_grids : :obj:`list`
+        List of LV grids (of type :class:`~.grid.grids.LVGrid`).
+    mode : None or String
+        If None all nodes in LV grid are returned. If mode is set to
+        'stations' only the LV station is returned.
+
+    Returns
+    -------
+    :obj:`dict`
+        Dictionary with LV grid as key and list of its nodes as value.
+
+    """
+    if mode == 'stations':
+        return {lv_grid: [lv_grid.station] for lv_grid in lv_grids}
+    else:
+        return {lv_grid: list(lv_grid.graph.nodes()) for lv_grid in lv_grids}
+
+
+def _lv_voltage_limits(network, lv_grids, mode, voltage_levels,
+                       v_lv_station=None):
+    """
+    Allowed upper and lower voltage in LV grids in each time step.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+    lv_grids : :obj:`list`
+        List of LV grids (of type :class:`~.grid.grids.LVGrid`).
+    mode : None or String
+        If None limits for all nodes in LV grid are determined. If mode is set
+        to 'stations' limits for the busbar are determined.
+    voltage_levels : :obj:`str`
+        Specifies which allowed voltage deviations to use. See
+        :func:`lv_voltage_deviation` for possible options.
+    v_lv_station : :pandas:`pandas.DataFrame<dataframe>`
+        Voltage in p.u. from power flow analysis at primary side of LV
+        stations in case `mode` is 'stations' and at secondary side otherwise.
+        Columns are the representatives of the LV stations. Only required
+        if `voltage_levels` is 'lv'. Default: None.
+
+    Returns
+    -------
+    :obj:`list`
+        LV grids limits are determined for. In case `voltage_levels` is 'lv'
+        LV grids without voltage results at the station are dropped.
+    :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        Allowed upper voltage in p.u. in each time step. In case
+        `voltage_levels` is 'lv' a dataframe with one column per LV grid.
+    :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        Allowed lower voltage in p.u. in each time step. In case
+        `voltage_levels` is 'lv' a dataframe with one column per LV grid.
+
+    """
+    if voltage_levels == 'mv_lv':
+        v_dev_allowed_upper, v_dev_allowed_lower = \
+            network.limits.voltage_limits(voltage_levels)
+    elif voltage_levels == 'lv':
+        v_dev_feedin_case, v_dev_load_case = \
+            network.limits.voltage_deviation_from_station(mode)
+        # only keep LV grids with station voltage from power flow analysis
+        lv_grids = [_ for _ in lv_grids
+                    if repr(_.station) in v_lv_station.columns]
+        timeindex = v_lv_station.index
+        v_lv_station = v_lv_station.loc[
+                       :, [repr(_.station) for _ in lv_grids]].values
+        feedin_case = (network.timeseries.timesteps_load_feedin_case.case.loc[
+            timeindex] == 'feedin_case').values[:, np.newaxis]
+        # maximum allowed voltage deviation in each time step (time steps x
+        # LV grids)
+        v_dev_allowed_upper = pd.DataFrame(
+            np.where(feedin_case, v_lv_station + v_dev_feedin_case, 1.1),
+            index=timeindex, columns=lv_grids)
+        v_dev_allowed_lower = pd.DataFrame(
+            np.where(feedin_case, 0.9, v_lv_station - v_dev_load_case),
+            index=timeindex, columns=lv_grids)
+    else:
+        raise ValueError(
+            'Specified mode {} is not a valid option.'.format(voltage_levels))
+
+    return lv_grids, v_dev_allowed_upper, v_dev_allowed_lower
+
+
 def _voltage_deviation(network, nodes, v_dev_allowed_upper,
                        v_dev_allowed_lower, voltage_level):
     """
-    Checks for voltage stability issues in LV grids.
+    Checks for voltage stability issues of nodes in one or several grids.
+
+    Voltages of all given nodes are checked against the allowed limits at
+    once (see :func:`_critical_voltage_deviation`).
+
     Parameters
     ----------
     network : :class:`~.grid.network.Network`
-    nodes : :obj:`list`
-        List of nodes (of type :class:`~.grid.components.Generator`,
-        :class:`~.grid.components.Load`, etc.) to check voltage deviation for.
-    v_dev_allowed_upper : :pandas:`pandas.Series<series>`
-        Series with time steps (of type :pandas:`pandas.Timestamp<timestamp>`)
-        power flow analysis was conducted for and the allowed upper limit of
-        voltage deviation for each time step as float.
-    v_dev_allowed_lower : :pandas:`pandas.Series<series>`
-        Series with time steps (of type :pandas:`pandas.Timestamp<timestamp>`)
-        power flow analysis was conducted for and the allowed lower limit of
-        voltage deviation for each time step as float.
-    voltage_levels : :obj:`str`
+    nodes : :obj:`dict`
+        Dictionary with grid (of type :class:`~.grid.grids.MVGrid` or
+        :class:`~.grid.grids.LVGrid`) as key and list of nodes (of type
+        :class:`~.grid.components.Generator`, :class:`~.grid.components.Load`,
+        etc.) in that grid to check voltage deviation for as value.
+    v_dev_allowed_upper : :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        Allowed upper limit of voltage deviation for each time step
+        (of type :pandas:`pandas.Timestamp<timestamp>`) power flow analysis
+        was conducted for. Either a series in case the limit is the same for
+        all nodes or a dataframe with one column per grid in `nodes`.
+    v_dev_allowed_lower : :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        Allowed lower limit of voltage deviation for each time step
+        (of type :pandas:`pandas.Timestamp<timestamp>`) power flow analysis
+        was conducted for. Either a series in case the limit is the same for
+        all nodes or a dataframe with one column per grid in `nodes`.
+    voltage_level : :obj:`str`
         Specifies which voltage level to retrieve power flow analysis results
         for. Possible options are 'mv' and 'lv'.
 
     Returns
     -------
-    :pandas:`pandas.DataFrame<dataframe>`
-        Dataframe with critical nodes, sorted descending by voltage deviation.
+    :obj:`dict`
+        Dictionary with grids with voltage issues as keys and a
+        :pandas:`pandas.DataFrame<dataframe>` with their critical nodes, sorted
+        descending by voltage deviation, as values.
         Index of the dataframe are all nodes (of type
         :class:`~.grid.components.Generator`, :class:`~.grid.components.Load`,
         etc.) with over-voltage issues. Columns are 'v_mag_pu' containing the
@@ -608,48 +888,409 @@ def _voltage_deviation(network, nodes, v_dev_allowed_upper,
         :pandas:`pandas.Timestamp<timestamp>`.
 
     """
+    v_mag_pu_pfa = network.results.v_res(
+        nodes=[node for grid in nodes for node in nodes[grid]],
+        level=voltage_level)
 
-    def _append_crit_node(series):
-        return pd.DataFrame({'v_mag_pu': series.max(),
-                             'time_index': series.idxmax()},
-                            index=[node])
+    checked_nodes, checked_grids, v_dev, time_position = \
+        _voltage_deviation_from_pfa(
+            v_mag_pu_pfa, nodes, v_dev_allowed_upper, v_dev_allowed_lower)
+    critical = np.flatnonzero(time_position >= 0)
 
-    crit_nodes_grid = pd.DataFrame()
+    return _crit_nodes_by_grid(
+        [checked_nodes[_] for _ in critical],
+        [checked_grids[_] for _ in critical],
+        v_dev[critical], v_mag_pu_pfa.index[time_position[critical]])
 
-    v_mag_pu_pfa = network.results.v_res(nodes=nodes, level=voltage_level)
 
-    for node in nodes:
+def _voltage_deviation_from_pfa(v_mag_pu_pfa, nodes, v_dev_allowed_upper,
+                                v_dev_allowed_lower):
+    """
+    Determines voltage deviation of nodes from given voltage results.
+
+    Parameters
+    ----------
+    v_mag_pu_pfa : :pandas:`pandas.DataFrame<dataframe>`
+        Voltages in p.u. from power flow analysis of one voltage level. Columns
+        are the representatives of the nodes. Nodes without results are
+        skipped.
+    nodes : :obj:`dict`
+        See :func:`_voltage_deviation`.
+    v_dev_allowed_upper : :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        See :func:`_voltage_deviation`.
+    v_dev_allowed_lower : :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        See :func:`_voltage_deviation`.
+
+    Returns
+    -------
+    :obj:`list`
+        Checked nodes, i.e. nodes with voltage results.
+    :obj:`list`
+        Grid of each checked node.
+    :numpy:`numpy.ndarray<ndarray>`
+        Maximum voltage deviation of each checked node. See
+        :func:`_critical_voltage_deviation`.
+    :numpy:`numpy.ndarray<ndarray>`
+        Position of the time step in the index of `v_mag_pu_pfa` the maximum
+        voltage deviation occurs in. See :func:`_critical_voltage_deviation`.
+
+    """
+    labels, node_grids, v_dev_allowed_upper, v_dev_allowed_lower, \
+        limits_index = _voltage_limits_matrix(
+            v_mag_pu_pfa, nodes, v_dev_allowed_upper, v_dev_allowed_lower)
+
+    v_dev, time_position = _critical_voltage_deviation(
+        v_mag_pu_pfa.loc[:, labels].values, v_dev_allowed_upper,
+        v_dev_allowed_lower, limits_index)
+
+    return ([node_grids[_][0] for _ in labels],
+            [node_grids[_][1] for _ in labels],
+            v_dev, time_position)
+
+
+def _voltage_limits_matrix(v_mag_pu_pfa, nodes, v_dev_allowed_upper,
+                           v_dev_allowed_lower):
+    """
+    Sets up voltage limits as time steps x limits matrix.
+
+    Parameters
+    ----------
+    v_mag_pu_pfa : :pandas:`pandas.DataFrame<dataframe>`
+        See :func:`_voltage_deviation_from_pfa`.
+    nodes : :obj:`dict`
+        See :func:`_voltage_deviation`.
+    v_dev_allowed_upper : :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        See :func:`_voltage_deviation`.
+    v_dev_allowed_lower : :pandas:`pandas.Series<series>` or :pandas:`pandas.DataFrame<dataframe>`
+        See :func:`_voltage_deviation`.
+
+    Returns
+    -------
+    :obj:`list`
+        Representatives of the nodes with voltage results.
+    :obj:`dict`
+        Node and grid of each representative in `nodes`.
+    :numpy:`numpy.ndarray<ndarray>`
+        Allowed upper voltage in p.u. with one row per time step in
+        `v_mag_pu_pfa` and one column per set of limits.
+    :numpy:`numpy.ndarray<ndarray>`
+        Allowed lower voltage in p.u. with one row per time step in
+        `v_mag_pu_pfa` and one column per set of limits.
+    :numpy:`numpy.ndarray<ndarray>`
+        Column in the limits to use for each node with voltage results.
+
+    """
+    grids = list(nodes.keys())
+    node_grids = {repr(node): (node, grid)
+                  for grid in grids for node in nodes[grid]}
+
+    labels = [_ for _ in v_mag_pu_pfa.columns if _ in node_grids]
+    timeindex = v_mag_pu_pfa.index
+
+    # set up limits as time steps x limits matrix and get the column in
+    # the limits matrix for each node
+    if isinstance(v_dev_allowed_upper, pd.DataFrame):
+        v_dev_allowed_upper = v_dev_allowed_upper.loc[timeindex, grids].values
+        v_dev_allowed_lower = v_dev_allowed_lower.loc[timeindex, grids].values
+        grid_position = {grid: i for i, grid in enumerate(grids)}
+        limits_index = np.array(
+            [grid_position[node_grids[_][1]] for _ in labels], dtype=int)
+    else:
+        v_dev_allowed_upper = v_dev_allowed_upper.loc[
+            timeindex].values[:, np.newaxis]
+        v_dev_allowed_lower = v_dev_allowed_lower.loc[
+            timeindex].values[:, np.newaxis]
+        limits_index = np.zeros(len(labels), dtype=int)
+
+    return (labels, node_grids, v_dev_allowed_upper, v_dev_allowed_lower,
+            limits_index)
+
+
+def _crit_nodes_by_grid(nodes, grids, v_dev, time_index):
+    """
+    Sets up dataframe with critical nodes for each grid.
+
+    Parameters
+    ----------
+    nodes : :obj:`list`
+        Critical nodes.
+    grids : :obj:`list`
+        Grid of each critical node.
+    v_dev : :numpy:`numpy.ndarray<ndarray>`
+        Maximum voltage deviation of each critical node.
+    time_index : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time step of the maximum voltage deviation of each critical node.
+
+    Returns
+    -------
+    :obj:`dict`
+        See :func:`_voltage_deviation`.
+
+    """
+    crit_nodes_grid = {}
+    for node, grid, v, t in zip(nodes, grids, v_dev, time_index):
+        crit_nodes_grid.setdefault(grid, []).append((node, v, t))
+
+    crit_nodes = {}
+    for grid, crit in crit_nodes_grid.items():
+        crit_nodes_df = pd.DataFrame(
+            {'v_mag_pu': [_[1] for _ in crit],
+             'time_index': [_[2] for _ in crit]},
+            index=[_[0] for _ in crit])
+        crit_nodes[grid] = crit_nodes_df.sort_values(
+            by=['v_mag_pu'], ascending=False)
+
+    return crit_nodes
+
+
+def _critical_voltage_deviation(v_mag_pu, v_dev_allowed_upper,
+                                v_dev_allowed_lower, limits_index,
+                                chunksize=1000):
+    """
+    Determines the maximum voltage deviation outside the allowed limits.
+
+    For each node the over-voltage (voltage above upper limit) and
+    under-voltage (voltage below lower limit) is determined for all time steps
+    at once. The greater of both is returned, in case of a tie the
+    under-voltage.
+
+    Parameters
+    ----------
+    v_mag_pu : :numpy:`numpy.ndarray<ndarray>`
+        Voltages from power flow analysis in p.u. with one row per time step
+        and one column per node.
+    v_dev_allowed_upper : :numpy:`numpy.ndarray<ndarray>`
+        Allowed upper voltage limit in p.u. with one row per time step and one
+        column per set of limits (e.g. one column per grid).
+    v_dev_allowed_lower : :numpy:`numpy.ndarray<ndarray>`
+        Allowed lower voltage limit in p.u. with one row per time step and one
+        column per set of limits (e.g. one column per grid).
+    limits_index : :numpy:`numpy.ndarray<ndarray>`
+        Column in the limits to use for each node.
+    chunksize : :obj:`int`
+        Number of nodes checked in one array operation. Limits the size of
+        temporary arrays for large grids with many time steps.
+        Default: 1000.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`
+        Maximum voltage deviation of each node. NaN for nodes without voltage
+        issues.
+    :numpy:`numpy.ndarray<ndarray>`
+        Position of the time step the maximum voltage deviation occurs in for
+        each node. -1 for nodes without voltage issues.
+
+    """
+    number_of_nodes = v_mag_pu.shape[1]
+    v_dev = np.full(number_of_nodes, np.nan)
+    time_position = np.full(number_of_nodes, -1, dtype=int)
+    if v_mag_pu.shape[0] == 0:
+        return v_dev, time_position
+
+    for start in range(0, number_of_nodes, chunksize):
+        nodes = slice(start, start + chunksize)
+        v = v_mag_pu[:, nodes]
+        upper = v_dev_allowed_upper[:, limits_index[nodes]]
+        lower = v_dev_allowed_lower[:, limits_index[nodes]]
         # check for over- and under-voltage
-        overvoltage = v_mag_pu_pfa[repr(node)][
-            (v_mag_pu_pfa[repr(node)] > (v_dev_allowed_upper.loc[
-                v_mag_pu_pfa.index]))]
-        undervoltage = v_mag_pu_pfa[repr(node)][
-            (v_mag_pu_pfa[repr(node)] < (v_dev_allowed_lower.loc[
-                v_mag_pu_pfa.index]))]
-
-        # write greatest voltage deviation to dataframe
-        if not overvoltage.empty:
-            overvoltage_diff = overvoltage - v_dev_allowed_upper.loc[
-                overvoltage.index]
-            if not undervoltage.empty:
-                undervoltage_diff = v_dev_allowed_lower.loc[
-                    undervoltage.index] - undervoltage
-                if overvoltage_diff.max() > undervoltage_diff.max():
-                    crit_nodes_grid = crit_nodes_grid.append(
-                        _append_crit_node(overvoltage_diff))
-                else:
-                    crit_nodes_grid = crit_nodes_grid.append(
-                        _append_crit_node(undervoltage_diff))
-            else:
-                crit_nodes_grid = crit_nodes_grid.append(
-                    _append_crit_node(overvoltage_diff))
-        elif not undervoltage.empty:
-            undervoltage_diff = v_dev_allowed_lower.loc[
-                                    undervoltage.index] - undervoltage
-            crit_nodes_grid = crit_nodes_grid.append(
-                _append_crit_node(undervoltage_diff))
+        with np.errstate(invalid='ignore'):
+            overvoltage = np.where(v > upper, v - upper, -np.inf)
+            undervoltage = np.where(v < lower, lower - v, -np.inf)
+        overvoltage_max = overvoltage.max(axis=0)
+        undervoltage_max = undervoltage.max(axis=0)
+        # greatest voltage deviation
+        use_overvoltage = overvoltage_max > undervoltage_max
+        deviation = np.where(use_overvoltage, overvoltage_max,
+                             undervoltage_max)
+        position = np.where(use_overvoltage, overvoltage.argmax(axis=0),
+                            undervoltage.argmax(axis=0))
+        critical = deviation > -np.inf
+        v_dev[nodes] = np.where(critical, deviation, np.nan)
+        time_position[nodes] = np.where(critical, position, -1)
+
+    return v_dev, time_position
+
+
+def _near_voltage_limits(v_mag_pu, v_dev_allowed_upper, v_dev_allowed_lower,
+                         limits_index, margin, chunksize=1000):
+    """
+    Determines time steps with any node close to its voltage limits.
+
+    A node is close to its limits if its voltage is above the upper limit or
+    below the lower limit reduced by `margin` times the width of the allowed
+    voltage band.
+
+    Parameters
+    ----------
+    v_mag_pu : :numpy:`numpy.ndarray<ndarray>`
+        See :func:`_critical_voltage_deviation`.
+    v_dev_allowed_upper : :numpy:`numpy.ndarray<ndarray>`
+        See :func:`_critical_voltage_deviation`.
+    v_dev_allowed_lower : :numpy:`numpy.ndarray<ndarray>`
+        See :func:`_critical_voltage_deviation`.
+    limits_index : :numpy:`numpy.ndarray<ndarray>`
+        See :func:`_critical_voltage_deviation`.
+    margin : :obj:`float`
+        Margin as fraction of the allowed voltage band.
+    chunksize : :obj:`int`
+        See :func:`_critical_voltage_deviation`.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`
+        Boolean array that is True for time steps with at least one node
+        close to its voltage limits.
+
+    """
+    band = margin * (v_dev_allowed_upper - v_dev_allowed_lower)
+    upper = v_dev_allowed_upper - band
+    lower = v_dev_allowed_lower + band
+    near = np.zeros(v_mag_pu.shape[0], dtype=bool)
+    for start in range(0, v_mag_pu.shape[1], chunksize):
+        nodes = slice(start, start + chunksize)
+        v = v_mag_pu[:, nodes]
+        with np.errstate(invalid='ignore'):
+            near |= ((v >= upper[:, limits_index[nodes]]) |
+                     (v <= lower[:, limits_index[nodes]])).any(axis=1)
+    return near
+
+
+def timesteps_near_limits(network, margin=0.1, combined_analysis=False,
+                          kinds=None):
+    """
+    Time steps in which any line, station or node is close to its limits.
+
+    Lines and stations are close to their limits if their current or
+    apparent power is at least (1 - `margin`) times the allowed current or
+    apparent power. Nodes are close to their limits if their voltage is
+    within `margin` times the width of the allowed voltage band of the upper
+    or lower limit. Violations of the limits are included.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+    margin : :obj:`float`
+        Margin as fraction of the respective limit. A margin of 0 only
+        returns time steps with violations. Default: 0.1.
+    combined_analysis : :obj:`Boolean`
+        See parameter `combined_analysis` in :class:`ConstraintEvaluator`.
+        Default: False.
+    kinds : :obj:`list` of :obj:`str`, optional
+        Kinds of limits to consider, named like the kinds of violations in
+        :class:`ConstraintEvaluator`. If None all kinds are considered.
+        Default: None.
+
+    Returns
+    -------
+    :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps of the power flow results with at least one line, station
+        or node close to its limits.
+
+    Notes
+    -----
+    With a margin of 0 this is a cheap screen for violations of all grids,
+    as it only compares power flow results to the limits without
+    determining the violating components and the magnitude of violations.
+    It includes results exactly at the limits, which are not violations
+    in :class:`ConstraintEvaluator`.
 
-    return crit_nodes_grid
+    """
+    if not 0 <= margin < 1:
+        raise ValueError('Margin must be between 0 and 1 but is {}.'.format(
+            margin))
+    if kinds is None:
+        kinds = ConstraintEvaluator.kinds
+    invalid_kinds = [_ for _ in kinds if _ not in ConstraintEvaluator.kinds]
+    if invalid_kinds:
+        raise ValueError(
+            '{} is/are not valid kind(s) of violations.'.format(
+                invalid_kinds))
+    results = network.results
+    case = network.timeseries.timesteps_load_feedin_case.case
+    lv_grids = list(network.mv_grid.lv_grids)
+    timesteps = pd.DatetimeIndex([])
+
+    # load of stations
+    stations = []
+    if 'mv_station_load' in kinds:
+        stations.append(network.mv_grid.station)
+    if 'lv_station_load' in kinds:
+        stations.extend([_.station for _ in lv_grids])
+    if stations:
+        pfa_p = results.pfa_p
+        pfa_q = results.pfa_q
+        (stations, labels, labels_offset, s_station, load_factor_feedin_case,
+         load_factor_load_case) = _allowed_station_load(
+            network, stations, set(pfa_p.columns) & set(pfa_q.columns))
+    if stations:
+        feedin_case = (case.loc[pfa_p.index] == 'feedin_case').values
+        s_station_pfa = _sum_apparent_power(
+            pfa_p.loc[:, labels].values, pfa_q.loc[:, labels].values,
+            labels_offset)
+        s_station_allowed = np.where(
+            feedin_case[:, np.newaxis], load_factor_feedin_case,
+            load_factor_load_case) * s_station
+        with np.errstate(invalid='ignore'):
+            near = (s_station_pfa >=
+                    (1 - margin) * s_station_allowed).any(axis=1)
+        timesteps = timesteps.union(pfa_p.index[near])
+
+    # load of lines
+    grids = []
+    if 'mv_line_load' in kinds:
+        grids.append(network.mv_grid)
+    if 'lv_line_load' in kinds:
+        grids.extend(lv_grids)
+    lines = []
+    if grids:
+        i_res = results.i_res
+        lines, i_line_allowed_feedin_case, i_line_allowed_load_case = \
+            _allowed_line_load(network, grids, i_res.columns)
+    if lines:
+        feedin_case = (case.loc[i_res.index] == 'feedin_case').values
+        i_line_allowed = np.where(feedin_case[:, np.newaxis],
+                                  i_line_allowed_feedin_case,
+                                  i_line_allowed_load_case)
+        with np.errstate(invalid='ignore'):
+            near = (i_res.loc[:, [repr(_) for _ in lines]].values >=
+                    (1 - margin) * i_line_allowed).any(axis=1)
+        timesteps = timesteps.union(i_res.index[near])
+
+    # voltages
+    if not any([_ in kinds for _ in ['mv_voltage', 'lv_station_voltage',
+                                      'lv_voltage']]):
+        return timesteps
+    v_mag_pu = results.v_res()
+    voltage_checks = []
+    if 'mv_voltage' in kinds:
+        v_dev_allowed_upper, v_dev_allowed_lower = _mv_voltage_limits(
+            network, 'mv_lv' if combined_analysis else 'mv')
+        voltage_checks.append((
+            v_mag_pu['mv'],
+            {network.mv_grid: list(network.mv_grid.graph.nodes())},
+            v_dev_allowed_upper, v_dev_allowed_lower))
+    voltage_levels = 'mv_lv' if combined_analysis else 'lv'
+    for kind, mode in [('lv_station_voltage', 'stations'),
+                       ('lv_voltage', None)]:
+        if kind not in kinds:
+            continue
+        grids, v_dev_allowed_upper, v_dev_allowed_lower = _lv_voltage_limits(
+            network, lv_grids, mode, voltage_levels,
+            v_mag_pu['mv' if mode == 'stations' else 'lv'])
+        voltage_checks.append((v_mag_pu['lv'], _lv_voltage_nodes(grids, mode),
+                               v_dev_allowed_upper, v_dev_allowed_lower))
+    for v_mag_pu_pfa, nodes, v_dev_allowed_upper, v_dev_allowed_lower in \
+            voltage_checks:
+        labels, _, v_dev_allowed_upper, v_dev_allowed_lower, limits_index = \
+            _voltage_limits_matrix(v_mag_pu_pfa, nodes, v_dev_allowed_upper,
+                                   v_dev_allowed_lower)
+        near = _near_voltage_limits(
+            v_mag_pu_pfa.loc[:, labels].values, v_dev_allowed_upper,
+            v_dev_allowed_lower, limits_index, margin)
+        timesteps = timesteps.union(v_mag_pu_pfa.index[near])
+
+    return timesteps
 
 
 def check_ten_percent_voltage_deviation(network):
@@ -666,3 +1307,396 @@ def check_ten_percent_voltage_deviation(network):
     if (v_mag_pu_pfa > 1.1).any().any() or (v_mag_pu_pfa < 0.9).any().any():
         message = "Maximum allowed voltage deviation of 10% exceeded."
         raise ValueError(message)
+
+
+class ConstraintEvaluator:
+    """
+    Evaluates technical constraints for one set of power flow results.
+
+    Power flow results, load and feed-in case and grid topology are read
+    once, after which all kinds of violations are determined using array
+    operations. Violations of each kind are stored as arrays with the
+    position of the violating component, the magnitude of the violation and
+    the corresponding time step.
+
+    Possible kinds of violations are:
+
+    * 'mv_station_load'
+      Over-loading of HV/MV station. Magnitude is the apparent power in kVA
+      at maximal over-loading (see :func:`hv_mv_station_load`).
+    * 'lv_station_load'
+      Over-loading of MV/LV stations. Magnitude is the apparent power in kVA
+      at maximal over-loading (see :func:`mv_lv_station_load`).
+    * 'mv_line_load'
+      Over-loading of MV lines. Magnitude is the maximum relative
+      over-loading (see :func:`mv_line_load`).
+    * 'lv_line_load'
+      Over-loading of LV lines. Magnitude is the maximum relative
+      over-loading (see :func:`lv_line_load`).
+    * 'mv_voltage'
+      Voltage issues in MV grid. Magnitude is the maximum voltage deviation
+      in p.u. (see :func:`mv_voltage_deviation`).
+    * 'lv_station_voltage'
+      Voltage issues at secondary side of LV stations. Magnitude is the
+      maximum voltage deviation in p.u. (see :func:`lv_voltage_deviation`
+      with mode 'stations').
+    * 'lv_voltage'
+      Voltage issues in LV grids. Magnitude is the maximum voltage deviation
+      in p.u. (see :func:`lv_voltage_deviation`).
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+    combined_analysis : :obj:`Boolean`
+        If True allowed voltage deviations for combined analysis of MV and LV
+        grid are used. If False different allowed voltage deviations for MV
+        and LV are used. See parameter `combined_analysis` in
+        :func:`~.flex_opt.reinforce_grid.reinforce_grid`. Default: False.
+    kinds : :obj:`list` of :obj:`str`, optional
+        Kinds of violations to evaluate. If None all kinds are evaluated.
+        Default: None.
+    lv_grids : :obj:`list` of :class:`~.grid.grids.LVGrid`, optional
+        LV grids to evaluate MV/LV station load, line load and voltage
+        issues for. If None all LV grids are evaluated. Default: None.
+    mv_feeders : :obj:`list` of :class:`~.grid.components.Line`, optional
+        MV feeders (see :func:`~.grid.tools.assign_mv_feeder_to_nodes`) to
+        evaluate MV line load and voltage issues for. Lines and nodes without
+        an assigned MV feeder are always evaluated, as is the HV/MV station.
+        If None all MV feeders are evaluated. Default: None.
+
+    Notes
+    -----
+    Restricting the evaluation to some LV grids and MV feeders is meant for
+    rechecking only the parts of the grid changed in the last reinforcement
+    step. Violations in other parts of the grid are not detected then.
+
+    """
+
+    kinds = ('mv_station_load', 'lv_station_load', 'mv_line_load',
+             'lv_line_load', 'mv_voltage', 'lv_station_voltage', 'lv_voltage')
+
+    def __init__(self, network, combined_analysis=False, kinds=None,
+                 lv_grids=None, mv_feeders=None):
+        self.network = network
+        self._combined_analysis = combined_analysis
+        self._lv_grids = list(lv_grids) if lv_grids is not None else None
+        self._mv_feeders = set(mv_feeders) if mv_feeders is not None \
+            else None
+        if kinds is None:
+            kinds = self.kinds
+        invalid_kinds = [_ for _ in kinds if _ not in self.kinds]
+        if invalid_kinds:
+            raise ValueError(
+                '{} is/are not valid kind(s) of violations.'.format(
+                    invalid_kinds))
+        self._components = {}
+        self._grids = {}
+        self._violations = {}
+        self._evaluate(kinds)
+
+    def _evaluate(self, kinds):
+        """
+        Determines violations of all specified kinds.
+
+        """
+        network = self.network
+        results = network.results
+        case = network.timeseries.timesteps_load_feedin_case.case
+        if self._lv_grids is None:
+            lv_grids = list(network.mv_grid.lv_grids)
+        else:
+            lv_grids = self._lv_grids
+
+        # over-loading of stations
+        stations = []
+        if 'mv_station_load' in kinds:
+            stations.append(network.mv_grid.station)
+        if 'lv_station_load' in kinds:
+            stations.extend([_.station for _ in lv_grids])
+        if stations:
+            pfa_p = results.pfa_p
+            pfa_q = results.pfa_q
+            (stations, labels, labels_offset, s_station,
+             load_factor_feedin_case, load_factor_load_case) = \
+                _allowed_station_load(
+                    network, stations,
+                    set(pfa_p.columns) & set(pfa_q.columns))
+            if stations:
+                feedin_case = (case.loc[pfa_p.index] ==
+                               'feedin_case').values
+                s_station_pfa = _sum_apparent_power(
+                    pfa_p.loc[:, labels].values, pfa_q.loc[:, labels].values,
+                    labels_offset)
+                _, s_pfa, time_position = _critical_station_load(
+                    s_station_pfa, s_station, load_factor_feedin_case,
+                    load_factor_load_case, feedin_case)
+            else:
+                s_pfa = np.array([])
+                time_position = np.array([], dtype=int)
+            lv = np.array([isinstance(_, LVStation) for _ in stations],
+                          dtype=bool)
+            for kind, mask in [('mv_station_load', ~lv),
+                               ('lv_station_load', lv)]:
+                if kind in kinds:
+                    self._set_violations(
+                        kind, [s for s, m in zip(stations, mask) if m],
+                        s_pfa[mask], time_position[mask], pfa_p.index)
+
+        # over-loading of lines
+        grids = []
+        if 'mv_line_load' in kinds:
+            grids.append(network.mv_grid)
+        if 'lv_line_load' in kinds:
+            grids.extend(lv_grids)
+        if grids:
+            i_res = results.i_res
+            lines, i_line_allowed_feedin_case, i_line_allowed_load_case = \
+                _allowed_line_load(network, grids, i_res.columns,
+                                   self._mv_feeders)
+            feedin_case = (case.loc[i_res.index] == 'feedin_case').values
+            _, max_rel_overload, time_position = _critical_line_load(
+                i_res.loc[:, [repr(_) for _ in lines]].values,
+                i_line_allowed_feedin_case, i_line_allowed_load_case,
+                feedin_case)
+            lv = np.array([isinstance(_.grid, LVGrid) for _ in lines],
+                          dtype=bool)
+            for kind, mask in [('mv_line_load', ~lv), ('lv_line_load', lv)]:
+                if kind in kinds:
+                    self._set_violations(
+                        kind, [l for l, m in zip(lines, mask) if m],
+                        max_rel_overload[mask], time_position[mask],
+                        i_res.index)
+
+        # voltage issues
+        if not any([_ in kinds for _ in ['mv_voltage', 'lv_station_voltage',
+                                          'lv_voltage']]):
+            return
+        v_mag_pu = results.v_res()
+        if 'mv_voltage' in kinds:
+            v_dev_allowed_upper, v_dev_allowed_lower = _mv_voltage_limits(
+                network, 'mv_lv' if self._combined_analysis else 'mv')
+            mv_nodes = list(network.mv_grid.graph.nodes())
+            if self._mv_feeders is not None:
+                mv_nodes = [_ for _ in mv_nodes
+                            if _mv_feeder([_]) is None or
+                            _mv_feeder([_]) in self._mv_feeders]
+            self._set_voltage_violations(
+                'mv_voltage', v_mag_pu['mv'], {network.mv_grid: mv_nodes},
+                v_dev_allowed_upper, v_dev_allowed_lower)
+        voltage_levels = 'mv_lv' if self._combined_analysis else 'lv'
+        for kind, mode in [('lv_station_voltage', 'stations'),
+                           ('lv_voltage', None)]:
+            if kind in kinds:
+                grids, v_dev_allowed_upper, v_dev_allowed_lower = \
+                    _lv_voltage_limits(
+                        network, lv_grids, mode, voltage_levels,
+                        v_mag_pu['mv' if mode == 'stations' else 'lv'])
+                self._set_voltage_violations(
+                    kind, v_mag_pu['lv'], _lv_voltage_nodes(grids, mode),
+                    v_dev_allowed_upper, v_dev_allowed_lower)
+
+    def _set_violations(self, kind, components, magnitude, time_position,
+                        timeindex, grids=None):
+        """
+        Stores checked components and their violations.
+
+        """
+        self._components[kind] = components
+        self._grids[kind] = grids if grids is not None else [
+            _.grid for _ in components]
+        violating = np.flatnonzero(time_position >= 0)
+        self._violations[kind] = {
+            'index': violating,
+            'magnitude': magnitude[violating],
+            'time_index': timeindex[time_position[violating]]}
+
+    def _set_voltage_violations(self, kind, v_mag_pu_pfa, nodes,
+                                v_dev_allowed_upper, v_dev_allowed_lower):
+        """
+        Determines and stores voltage violations.
+
+        """
+        checked_nodes, checked_grids, v_dev, time_position = \
+            _voltage_deviation_from_pfa(v_mag_pu_pfa, nodes,
+                                        v_dev_allowed_upper,
+                                        v_dev_allowed_lower)
+        self._set_violations(kind, checked_nodes, v_dev, time_position,
+                             v_mag_pu_pfa.index, grids=checked_grids)
+
+    def _check_kind(self, kind):
+        if kind not in self._violations:
+            raise KeyError('Violations of kind {} were not '
+                           'evaluated.'.format(kind))
+
+    def components(self, kind):
+        """
+        Components checked for violations of the given kind.
+
+        Parameters
+        ----------
+        kind : :obj:`str`
+            Kind of violation. See class definition for possible options.
+
+        Returns
+        -------
+        :obj:`list`
+            Checked lines, stations or nodes. Positions in this list are
+            referred to by the 'index' array in :meth:`violations`.
+
+        """
+        self._check_kind(kind)
+        return self._components[kind]
+
+    def violations(self, kind):
+        """
+        Violations of the given kind.
+
+        Parameters
+        ----------
+        kind : :obj:`str`
+            Kind of violation. See class definition for possible options.
+
+        Returns
+        -------
+        :obj:`dict`
+            Dictionary with the following entries:
+
+            'index' : :numpy:`numpy.ndarray<ndarray>`
+                Position of each violating component in :meth:`components`.
+            'magnitude' : :numpy:`numpy.ndarray<ndarray>`
+                Magnitude of each violation. See class definition for
+                the meaning of the magnitude for each kind.
+            'time_index' : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+                Time step of each violation.
+
+        """
+        self._check_kind(kind)
+        return self._violations[kind]
+
+    def has_violations(self, kinds=None):
+        """
+        Checks if there are any violations.
+
+        Parameters
+        ----------
+        kinds : :obj:`str` or :obj:`list` of :obj:`str`, optional
+            Kind(s) of violations to check. If None all evaluated kinds are
+            checked. Default: None.
+
+        Returns
+        -------
+        :obj:`Boolean`
+            True if there is at least one violation.
+
+        """
+        if kinds is None:
+            kinds = list(self._violations.keys())
+        elif isinstance(kinds, str):
+            kinds = [kinds]
+        return any([len(self.violations(_)['index']) > 0 for _ in kinds])
+
+    def report(self):
+        """
+        Compact report of all violations.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>`
+            Dataframe with one row per violation. Columns are 'kind' with the
+            kind of violation, 'component' with the violating line, station or
+            node, 'grid' with the grid the component is in, 'magnitude' with
+            the magnitude of the violation and 'time_index' with the
+            corresponding time step.
+
+        """
+        report = []
+        for kind in self.kinds:
+            if kind not in self._violations:
+                continue
+            violations = self._violations[kind]
+            report.append(pd.DataFrame(
+                {'kind': kind,
+                 'component': [self._components[kind][_]
+                               for _ in violations['index']],
+                 'grid': [self._grids[kind][_]
+                          for _ in violations['index']],
+                 'magnitude': violations['magnitude'],
+                 'time_index': violations['time_index']},
+                columns=['kind', 'component', 'grid', 'magnitude',
+                         'time_index']))
+        if not report:
+            return pd.DataFrame(columns=['kind', 'component', 'grid',
+                                         'magnitude', 'time_index'])
+        return pd.concat(report, ignore_index=True)
+
+    def crit_lines(self, voltage_level):
+        """
+        Over-loaded lines as returned by :func:`mv_line_load` and
+        :func:`lv_line_load`.
+
+        Parameters
+        ----------
+        voltage_level : :obj:`str`
+            Either 'mv' or 'lv'.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>`
+            See :func:`mv_line_load`.
+
+        """
+        kind = '{}_line_load'.format(voltage_level)
+        violations = self.violations(kind)
+        if not len(violations['index']):
+            return pd.DataFrame()
+        return pd.DataFrame(
+            {'max_rel_overload': violations['magnitude'],
+             'time_index': violations['time_index']},
+            index=[self._components[kind][_] for _ in violations['index']])
+
+    def crit_stations(self, voltage_level):
+        """
+        Over-loaded stations as returned by :func:`hv_mv_station_load` and
+        :func:`mv_lv_station_load`.
+
+        Parameters
+        ----------
+        voltage_level : :obj:`str`
+            Either 'mv' for the HV/MV station or 'lv' for MV/LV stations.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>`
+            See :func:`hv_mv_station_load`.
+
+        """
+        kind = '{}_station_load'.format(voltage_level)
+        violations = self.violations(kind)
+        if not len(violations['index']):
+            return pd.DataFrame()
+        return pd.DataFrame(
+            {'s_pfa': violations['magnitude'],
+             'time_index': violations['time_index']},
+            index=[self._components[kind][_] for _ in violations['index']])
+
+    def crit_nodes(self, kind):
+        """
+        Nodes with voltage issues as returned by
+        :func:`mv_voltage_deviation` and :func:`lv_voltage_deviation`.
+
+        Parameters
+        ----------
+        kind : :obj:`str`
+            Either 'mv_voltage', 'lv_station_voltage' or 'lv_voltage'.
+
+        Returns
+        -------
+        :obj:`dict`
+            See :func:`mv_voltage_deviation`.
+
+        """
+        violations = self.violations(kind)
+        return _crit_nodes_by_grid(
+            [self._components[kind][_] for _ in violations['index']],
+            [self._grids[kind][_] for _ in violations['index']],
+            violations['magnitude'], violations['time_index'])
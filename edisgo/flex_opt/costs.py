@@ -5,7 +5,7 @@ import os
 if not 'READTHEDOCS' in os.environ:
     from shapely.ops import transform
 
-from edisgo.grid.components import Transformer, Line, LVStation
+from edisgo.grid.components import LVStation
 from edisgo.grid.grids import LVGrid, MVGrid
 from edisgo.grid.tools import get_mv_feeder_from_line
 
@@ -101,16 +101,16 @@ def grid_expansion_costs(network, without_generator_import=False):
 
     costs = pd.DataFrame()
 
+    equipment_changes = network.results.equipment_change_log
     if without_generator_import:
-        equipment_changes = network.results.equipment_changes.loc[
-            network.results.equipment_changes.iteration_step > 0]
+        min_iteration_step = 1
     else:
-        equipment_changes = network.results.equipment_changes
+        min_iteration_step = None
 
     # costs for transformers
-    if not equipment_changes.empty:
-        transformers = equipment_changes[equipment_changes['equipment'].apply(
-            isinstance, args=(Transformer,))]
+    transformers = equipment_changes.select(
+        kind='transformer', min_iteration_step=min_iteration_step)
+    if not transformers.empty:
         added_transformers = transformers[transformers['change'] == 'added']
         removed_transformers = transformers[
             transformers['change'] == 'removed']
@@ -132,11 +132,17 @@ def grid_expansion_costs(network, without_generator_import=False):
                      t.grid, LVGrid) else None},
                 index=[t]))
 
-        # costs for lines
-        # get changed lines
-        lines = equipment_changes.loc[equipment_changes.index[
-            equipment_changes.reset_index()['index'].apply(
-                isinstance, args=(Line,))]]
+    # costs for lines
+    # get changed lines
+    lines = equipment_changes.select(
+        kind='line', min_iteration_step=min_iteration_step)
+    if not lines.empty:
+        # number of added lines of the current line type of each line
+        lines_added = {}
+        for l, equipment, quantity in zip(lines.index, lines['equipment'],
+                                          lines['quantity']):
+            if equipment == l.type.name:
+                lines_added[l] = lines_added.get(l, 0) + quantity
         # calculate costs for each reinforced line
         for l in list(lines.index.unique()):
             # check if line connects aggregated units
@@ -145,10 +151,7 @@ def grid_expansion_costs(network, without_generator_import=False):
             for aggr_line in aggr_lines_generator:
                 aggr_lines.append(repr(aggr_line['line']))
             if not repr(l) in aggr_lines:
-                number_lines_added = equipment_changes[
-                    (equipment_changes.index == l) &
-                    (equipment_changes.equipment ==
-                     l.type.name)]['quantity'].sum()
+                number_lines_added = lines_added.get(l, 0)
                 costs = costs.append(pd.DataFrame(
                     {'type': l.type.name,
                      'total_costs': _get_line_costs(l, number_lines_added),
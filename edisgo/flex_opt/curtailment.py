@@ -407,7 +407,7 @@ def _assign_curtailment(curtailment, edisgo, generators, curtailment_key):
         edisgo.network.results._curtailment[curtailment_key] = \
             gen_object_list
     else:
-        edisgo.network.timeseries._curtailment = gen_object_list
+        edisgo.network.timeseries.curtailment = gen_object_list
         # list needs to be copied, otherwise it will be extended every time
         # a new key is added to results._curtailment
         edisgo.network.results._curtailment = \
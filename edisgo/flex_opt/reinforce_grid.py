@@ -1,18 +1,24 @@
 import pandas as pd
 import copy
 import datetime
+import time
 from edisgo.flex_opt import check_tech_constraints as checks
 from edisgo.flex_opt import reinforce_measures, exceptions
 from edisgo.flex_opt.costs import grid_expansion_costs
-from edisgo.tools import tools, pypsa_io
-from edisgo.grid.tools import assign_mv_feeder_to_nodes
+from edisgo.tools import tools
+from edisgo.grid.tools import assign_mv_feeder_to_nodes, \
+    get_mv_feeder_from_line
+from edisgo.grid.grids import LVGrid
+from edisgo.grid.components import Line, LVStation, MVStation
 import logging
 
 logger = logging.getLogger('edisgo')
 
 
 def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
-                   max_while_iterations=10, combined_analysis=False):
+                   max_while_iterations=10, combined_analysis=False,
+                   number_of_snapshots=10, timesteps_validation=None,
+                   pruning_margin=None, warm_start=True):
     """
     Evaluates grid reinforcement needs and performs measures.
 
@@ -42,6 +48,13 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
           time steps. If your time series already represents the worst-case
           keep the default value of None because finding the worst-case
           snapshots takes some time.
+        * 'representative_snapshots'
+          Reinforcement is conducted for representative time steps obtained
+          by clustering plus extreme time steps. See
+          :meth:`edisgo.tools.tools.select_representative_snapshots()` for
+          further explanation on how the time steps are chosen. The
+          reinforced grid is validated with a power flow analysis of all time
+          steps in timeseries.timeindex, see `timesteps_validation`.
         * :pandas:`pandas.DatetimeIndex<datetimeindex>` or :pandas:`pandas.Timestamp<timestamp>`
           Use this option to explicitly choose which time steps to consider.
 
@@ -55,6 +68,32 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
         grid are used. If False different allowed voltage deviations for MV
         and LV are used. See also config section
         `grid_expansion_allowed_voltage_deviations`. Default: False.
+    number_of_snapshots : :obj:`int`
+        Number of representative time steps besides the two time steps with
+        maximum and minimum residual load of the whole grid in case
+        `timesteps_pfa` is 'representative_snapshots'. Default: 10.
+    timesteps_validation : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps to validate the reinforced grid with. After reinforcement
+        for `timesteps_pfa` power flow analysis is conducted for these time
+        steps. If issues are found, reinforcement is repeated for
+        `timesteps_pfa` extended by the time steps with issues. Default: None,
+        in which case the reinforced grid is not validated unless
+        `timesteps_pfa` is 'representative_snapshots', in which case all time
+        steps in timeseries.timeindex are used.
+    pruning_margin : :obj:`float`
+        If given and `timesteps_pfa` is None, only time steps in which any
+        line, station or node is within this margin of its limits in the
+        initial power flow analysis of all time steps are considered in
+        reinforcement (see
+        :func:`~.flex_opt.check_tech_constraints.timesteps_near_limits`).
+        The reinforced grid is validated with all time steps in
+        timeseries.timeindex, see `timesteps_validation`. Default: None, in
+        which case time steps are not pruned.
+    warm_start : :obj:`bool`
+        If True, power flow analyses after each reinforcement step start from
+        the voltages of the previous power flow analysis instead of a flat
+        start. See parameter `warm_start` in
+        :meth:`~.grid.network.EDisGo.analyze`. Default: True.
 
     Returns
     -------
@@ -67,35 +106,121 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
     See :ref:`features-in-detail` for more information on how grid
     reinforcement is conducted.
 
+    After each reinforcement step only the LV grids and MV feeders changed in
+    that step are rechecked. All grids are only rechecked once no issues
+    remain in the changed ones, so that issues in other parts of the grid
+    are still detected before a reinforcement loop is left.
+
+    Pruning time steps by `pruning_margin` saves calculation time in case of
+    long time series with few critical time steps. Time steps that become
+    critical through reinforcement are detected in the validation with all
+    time steps, after which reinforcement is repeated including them.
+
     """
 
+    def _analyze():
+        # power flow analysis for the considered time steps
+        edisgo_reinforce.analyze(timesteps=timesteps_pfa,
+                                 warm_start=warm_start)
+        number_of_pfa['considered'] += 1
+
     def _add_lines_changes_to_equipment_changes():
-        equipment, index, quantity = [], [], []
-        for line, number_of_lines in lines_changes.items():
-            equipment.append(line.type.name)
-            index.append(line)
-            quantity.append(number_of_lines)
-        edisgo_reinforce.network.results.equipment_changes = \
-            edisgo_reinforce.network.results.equipment_changes.append(
-                pd.DataFrame(
-                    {'iteration_step': [iteration_step] * len(
-                        lines_changes),
-                     'change': ['changed'] * len(lines_changes),
-                     'equipment': equipment,
-                     'quantity': quantity},
-                    index=index))
+        edisgo_reinforce.network.results.equipment_change_log.extend(
+            list(lines_changes.keys()), iteration_step, 'changed',
+            [line.type.name for line in lines_changes.keys()],
+            list(lines_changes.values()))
 
     def _add_transformer_changes_to_equipment_changes(mode):
         for station, transformer_list in transformer_changes[mode].items():
-            edisgo_reinforce.network.results.equipment_changes = \
-                edisgo_reinforce.network.results.equipment_changes.append(
-                    pd.DataFrame(
-                        {'iteration_step': [iteration_step] * len(
-                            transformer_list),
-                         'change': [mode] * len(transformer_list),
-                         'equipment': transformer_list,
-                         'quantity': [1] * len(transformer_list)},
-                        index=[station] * len(transformer_list)))
+            edisgo_reinforce.network.results.equipment_change_log.extend(
+                [station] * len(transformer_list), iteration_step, mode,
+                transformer_list, [1] * len(transformer_list))
+
+    def _modified_grids():
+        # get LV grids and MV feeders changed in the current iteration step
+        equipment_changes = \
+            edisgo_reinforce.network.results.equipment_change_log.select(
+                iteration_step=iteration_step)
+        lv_grids = set()
+        mv_feeders = set()
+        all_mv_feeders = False
+        for component in set(equipment_changes.index):
+            if isinstance(component, LVStation):
+                lv_grids.add(component.grid)
+            elif isinstance(component, MVStation):
+                # changes at the HV/MV station affect all MV feeders
+                all_mv_feeders = True
+            elif isinstance(component, Line):
+                if isinstance(component.grid, LVGrid):
+                    lv_grids.add(component.grid)
+                else:
+                    mv_feeder = get_mv_feeder_from_line(component)
+                    if mv_feeder is None:
+                        all_mv_feeders = True
+                    else:
+                        mv_feeders.add(mv_feeder)
+        return list(lv_grids), None if all_mv_feeders else list(mv_feeders)
+
+    # kinds of violations checked in over-loading checks
+    load_kinds = ['mv_station_load', 'lv_station_load', 'mv_line_load',
+                  'lv_line_load']
+
+    def _recheck(check, issues_found, kinds):
+        # recheck LV grids and MV feeders changed in the current iteration
+        # step and only if no issues remain there all grids
+        lv_grids, mv_feeders = _modified_grids()
+        return _recheck_grids(edisgo_reinforce.network, check, issues_found,
+                              kinds, lv_grids, mv_feeders,
+                              combined_analysis=combined_analysis)
+
+    def _overloading_issues(result):
+        return any([not _.empty for _ in result])
+
+    def _voltage_issues(result):
+        return bool(result)
+
+    def _check_overloading(lv_grids=None, mv_feeders=None):
+        # evaluate station and line load from the same power flow results
+        evaluator = checks.ConstraintEvaluator(
+            edisgo_reinforce.network, kinds=load_kinds,
+            lv_grids=lv_grids, mv_feeders=mv_feeders)
+        overloaded_mv_station = evaluator.crit_stations('mv')
+        overloaded_lv_stations = evaluator.crit_stations('lv')
+        crit_lines = pd.concat([evaluator.crit_lines('lv'),
+                                evaluator.crit_lines('mv')])
+        logger.debug('==> {} station(s) and {} line(s) has/have load '
+                     'issues.'.format(overloaded_mv_station.shape[0] +
+                                      overloaded_lv_stations.shape[0],
+                                      crit_lines.shape[0]))
+        return overloaded_mv_station, overloaded_lv_stations, crit_lines
+
+    def _check_mv_voltage(lv_grids=None, mv_feeders=None):
+        evaluator = checks.ConstraintEvaluator(
+            edisgo_reinforce.network, combined_analysis=combined_analysis,
+            kinds=['mv_voltage'], mv_feeders=mv_feeders)
+        crit_nodes = evaluator.crit_nodes('mv_voltage')
+        logger.debug('==> {} node(s) in MV grid has/have voltage '
+                     'issues.'.format(sum([len(_)
+                                           for _ in crit_nodes.values()])))
+        return crit_nodes
+
+    def _check_lv_station_voltage(lv_grids=None, mv_feeders=None):
+        evaluator = checks.ConstraintEvaluator(
+            edisgo_reinforce.network, combined_analysis=combined_analysis,
+            kinds=['lv_station_voltage'], lv_grids=lv_grids)
+        crit_stations = evaluator.crit_nodes('lv_station_voltage')
+        logger.debug('==> {} LV station(s) has/have voltage issues.'.format(
+            len(crit_stations)))
+        return crit_stations
+
+    def _check_lv_voltage(lv_grids=None, mv_feeders=None):
+        evaluator = checks.ConstraintEvaluator(
+            edisgo_reinforce.network, combined_analysis=combined_analysis,
+            kinds=['lv_voltage'], lv_grids=lv_grids)
+        crit_nodes = evaluator.crit_nodes('lv_voltage')
+        logger.debug('==> {} LV grid(s) has/have voltage issues.'.format(
+            len(crit_nodes)))
+        return crit_nodes
 
     # assign MV feeder to every generator, LV station, load, and branch tee
     # to assign grid expansion costs to an MV feeder
@@ -104,8 +229,15 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
     # analyze for all time steps (advantage is that load and feed-in case can
     # be obtained more performant in case `timesteps_pfa` = 'snapshot_analysis'
     # plus edisgo and edisgo_reinforce will have pypsa representation in case
-    # reinforcement needs to be conducted on a copied graph)
-    edisgo.analyze()
+    # reinforcement needs to be conducted on a copied graph); otherwise the
+    # pypsa representation is set up for `timesteps_pfa` by the first power
+    # flow analysis below, so that e.g. reinforcement in time windows does
+    # not export all time steps
+    prune = pruning_margin is not None and timesteps_pfa is None
+    if copy_graph is True or isinstance(timesteps_pfa, str) or prune:
+        start = time.time()
+        edisgo.analyze(warm_start=warm_start)
+        time_pfa = time.time() - start
 
     # in case reinforcement needs to be conducted on a copied graph the
     # edisgo object is deep copied
@@ -114,6 +246,29 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
     else:
         edisgo_reinforce = edisgo
 
+    # only consider time steps close to the limits and validate
+    # reinforcement with all time steps
+    if prune:
+        timeindex = edisgo_reinforce.network.timeseries.timeindex
+        timesteps_pfa = checks.timesteps_near_limits(
+            edisgo_reinforce.network, margin=pruning_margin,
+            combined_analysis=combined_analysis)
+        if timesteps_validation is None:
+            timesteps_validation = timeindex
+        # power flow analysis time is assumed to be proportional to the
+        # number of time steps
+        time_saved_pfa = time_pfa * (1 - len(timesteps_pfa) / len(timeindex))
+        logger.info('==> {} of {} time step(s) were pruned as no line, '
+                    'station or node is within a margin of {} of its '
+                    'limits.'.format(len(timeindex) - len(timesteps_pfa),
+                                     len(timeindex), pruning_margin))
+        if timesteps_pfa.empty:
+            logger.info('==> No reinforcement needed.')
+            edisgo_reinforce.network.results.grid_expansion_costs = \
+                grid_expansion_costs(edisgo_reinforce.network)
+            return edisgo_reinforce.network.results
+    number_of_pfa = {'considered': 0}
+
     if timesteps_pfa is not None:
         # if timesteps_pfa = 'snapshot_analysis' get snapshots
         if (isinstance(timesteps_pfa, str) and
@@ -123,6 +278,19 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
             # drop None values in case any of the two snapshots does not exist
             timesteps_pfa = pd.DatetimeIndex(data=[
                 snapshots['load_case'], snapshots['feedin_case']]).dropna()
+        # if timesteps_pfa = 'representative_snapshots' get representative
+        # time steps and validate reinforcement with all time steps
+        elif (isinstance(timesteps_pfa, str) and
+                    timesteps_pfa == 'representative_snapshots'):
+            timesteps_pfa = tools.select_representative_snapshots(
+                edisgo_reinforce.network,
+                number_of_snapshots=number_of_snapshots)
+            logger.info('==> Reinforcement is conducted for {} '
+                        'representative time step(s).'.format(
+                            len(timesteps_pfa)))
+            if timesteps_validation is None:
+                timesteps_validation = \
+                    edisgo_reinforce.network.timeseries.timeindex
         # if timesteps_pfa is not of type datetime or does not contain
         # datetimes throw an error
         elif not isinstance(timesteps_pfa, datetime.datetime):
@@ -137,19 +305,18 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
                     'Input {} for timesteps_pfa is not valid.'.format(
                         timesteps_pfa))
 
-    iteration_step = 1
-    edisgo_reinforce.analyze(timesteps=timesteps_pfa)
+    # continue numbering of iteration steps of previous reinforcements so
+    # that changes of the current step can be selected from the equipment
+    # change log
+    iteration_step = edisgo_reinforce.network.results.\
+        equipment_change_log.last_iteration_step + 1
+    _analyze()
 
     # REINFORCE OVERLOADED TRANSFORMERS AND LINES
 
-    logger.debug('==> Check station load.')
-    overloaded_mv_station = checks.hv_mv_station_load(edisgo_reinforce.network)
-    overloaded_lv_stations = checks.mv_lv_station_load(
-        edisgo_reinforce.network)
-    logger.debug('==> Check line load.')
-    crit_lines_lv = checks.lv_line_load(edisgo_reinforce.network)
-    crit_lines_mv = checks.mv_line_load(edisgo_reinforce.network)
-    crit_lines = crit_lines_lv.append(crit_lines_mv)
+    logger.debug('==> Check station and line load.')
+    overloaded_mv_station, overloaded_lv_stations, crit_lines = \
+        _check_overloading()
 
     while_counter = 0
     while ((not overloaded_mv_station.empty or not overloaded_lv_stations.empty
@@ -181,24 +348,14 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
             # write changed lines to results.equipment_changes
             _add_lines_changes_to_equipment_changes()
 
-        # run power flow analysis again (after updating pypsa object) and check
+        # run power flow analysis again (changes of the grid are applied to
+        # the pypsa representation by its synchronizer) and check
         # if all over-loading problems were solved
         logger.debug('==> Run power flow analysis.')
-        pypsa_io.update_pypsa_grid_reinforcement(
-            edisgo_reinforce.network,
-            edisgo_reinforce.network.results.equipment_changes[
-                edisgo_reinforce.network.results.equipment_changes.
-                    iteration_step==iteration_step])
-        edisgo_reinforce.analyze(timesteps=timesteps_pfa)
-        logger.debug('==> Recheck station load.')
-        overloaded_mv_station = checks.hv_mv_station_load(
-            edisgo_reinforce.network)
-        overloaded_lv_stations = checks.mv_lv_station_load(
-            edisgo_reinforce.network)
-        logger.debug('==> Recheck line load.')
-        crit_lines_lv = checks.lv_line_load(edisgo_reinforce.network)
-        crit_lines_mv = checks.mv_line_load(edisgo_reinforce.network)
-        crit_lines = crit_lines_lv.append(crit_lines_mv)
+        _analyze()
+        logger.debug('==> Recheck station and line load.')
+        overloaded_mv_station, overloaded_lv_stations, crit_lines = \
+            _recheck(_check_overloading, _overloading_issues, load_kinds)
 
         iteration_step += 1
         while_counter += 1
@@ -225,12 +382,7 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
 
     # solve voltage problems in MV grid
     logger.debug('==> Check voltage in MV grid.')
-    if combined_analysis:
-        voltage_levels = 'mv_lv'
-    else:
-        voltage_levels = 'mv'
-    crit_nodes = checks.mv_voltage_deviation(edisgo_reinforce.network,
-                                             voltage_levels=voltage_levels)
+    crit_nodes = _check_mv_voltage()
 
     while_counter = 0
     while crit_nodes and while_counter < max_while_iterations:
@@ -242,18 +394,14 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
         # write changed lines to results.equipment_changes
         _add_lines_changes_to_equipment_changes()
 
-        # run power flow analysis again (after updating pypsa object) and check
+        # run power flow analysis again (changes of the grid are applied to
+        # the pypsa representation by its synchronizer) and check
         # if all over-voltage problems were solved
         logger.debug('==> Run power flow analysis.')
-        pypsa_io.update_pypsa_grid_reinforcement(
-            edisgo_reinforce.network,
-            edisgo_reinforce.network.results.equipment_changes[
-                edisgo_reinforce.network.results.equipment_changes.
-                    iteration_step == iteration_step])
-        edisgo_reinforce.analyze(timesteps=timesteps_pfa)
+        _analyze()
         logger.debug('==> Recheck voltage in MV grid.')
-        crit_nodes = checks.mv_voltage_deviation(edisgo_reinforce.network,
-                                                 voltage_levels=voltage_levels)
+        crit_nodes = _recheck(_check_mv_voltage, _voltage_issues,
+                              ['mv_voltage'])
 
         iteration_step += 1
         while_counter += 1
@@ -274,13 +422,7 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
 
     # solve voltage problems at secondary side of LV stations
     logger.debug('==> Check voltage at secondary side of LV stations.')
-    if combined_analysis:
-        voltage_levels = 'mv_lv'
-    else:
-        voltage_levels = 'lv'
-    crit_stations = checks.lv_voltage_deviation(edisgo_reinforce.network,
-                                                mode='stations',
-                                                voltage_levels=voltage_levels)
+    crit_stations = _check_lv_station_voltage()
 
     while_counter = 0
     while crit_stations and while_counter < max_while_iterations:
@@ -291,19 +433,14 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
         # write added transformers to results.equipment_changes
         _add_transformer_changes_to_equipment_changes('added')
 
-        # run power flow analysis again (after updating pypsa object) and check
+        # run power flow analysis again (changes of the grid are applied to
+        # the pypsa representation by its synchronizer) and check
         # if all over-voltage problems were solved
         logger.debug('==> Run power flow analysis.')
-        pypsa_io.update_pypsa_grid_reinforcement(
-            edisgo_reinforce.network,
-            edisgo_reinforce.network.results.equipment_changes[
-                edisgo_reinforce.network.results.equipment_changes.
-                    iteration_step == iteration_step])
-        edisgo_reinforce.analyze(timesteps=timesteps_pfa)
+        _analyze()
         logger.debug('==> Recheck voltage at secondary side of LV stations.')
-        crit_stations = checks.lv_voltage_deviation(
-            edisgo_reinforce.network, mode='stations',
-            voltage_levels=voltage_levels)
+        crit_stations = _recheck(_check_lv_station_voltage, _voltage_issues,
+                                 ['lv_station_voltage'])
 
         iteration_step += 1
         while_counter += 1
@@ -324,8 +461,7 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
 
     # solve voltage problems in LV grids
     logger.debug('==> Check voltage in LV grids.')
-    crit_nodes = checks.lv_voltage_deviation(edisgo_reinforce.network,
-                                             voltage_levels=voltage_levels)
+    crit_nodes = _check_lv_voltage()
 
     while_counter = 0
     while crit_nodes and while_counter < max_while_iterations:
@@ -337,18 +473,14 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
             # write changed lines to results.equipment_changes
             _add_lines_changes_to_equipment_changes()
 
-        # run power flow analysis again (after updating pypsa object) and check
+        # run power flow analysis again (changes of the grid are applied to
+        # the pypsa representation by its synchronizer) and check
         # if all over-voltage problems were solved
         logger.debug('==> Run power flow analysis.')
-        pypsa_io.update_pypsa_grid_reinforcement(
-            edisgo_reinforce.network,
-            edisgo_reinforce.network.results.equipment_changes[
-                edisgo_reinforce.network.results.equipment_changes.
-                    iteration_step == iteration_step])
-        edisgo_reinforce.analyze(timesteps=timesteps_pfa)
+        _analyze()
         logger.debug('==> Recheck voltage in LV grids.')
-        crit_nodes = checks.lv_voltage_deviation(edisgo_reinforce.network,
-                                                 voltage_levels=voltage_levels)
+        crit_nodes = _recheck(_check_lv_voltage, _voltage_issues,
+                              ['lv_voltage'])
 
         iteration_step += 1
         while_counter += 1
@@ -369,14 +501,9 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
             'in {} iteration step(s).'.format(while_counter))
 
     # RECHECK FOR OVERLOADED TRANSFORMERS AND LINES
-    logger.debug('==> Recheck station load.')
-    overloaded_mv_station = checks.hv_mv_station_load(edisgo_reinforce.network)
-    overloaded_lv_stations = checks.mv_lv_station_load(
-        edisgo_reinforce.network)
-    logger.debug('==> Recheck line load.')
-    crit_lines_lv = checks.lv_line_load(edisgo_reinforce.network)
-    crit_lines_mv = checks.mv_line_load(edisgo_reinforce.network)
-    crit_lines = crit_lines_lv.append(crit_lines_mv)
+    logger.debug('==> Recheck station and line load.')
+    overloaded_mv_station, overloaded_lv_stations, crit_lines = \
+        _check_overloading()
 
     while_counter = 0
     while ((not overloaded_mv_station.empty or not overloaded_lv_stations.empty
@@ -407,24 +534,14 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
             # write changed lines to results.equipment_changes
             _add_lines_changes_to_equipment_changes()
 
-        # run power flow analysis again (after updating pypsa object) and check
+        # run power flow analysis again (changes of the grid are applied to
+        # the pypsa representation by its synchronizer) and check
         # if all over-loading problems were solved
         logger.debug('==> Run power flow analysis.')
-        pypsa_io.update_pypsa_grid_reinforcement(
-            edisgo_reinforce.network,
-            edisgo_reinforce.network.results.equipment_changes[
-                edisgo_reinforce.network.results.equipment_changes.
-                    iteration_step == iteration_step])
-        edisgo_reinforce.analyze(timesteps=timesteps_pfa)
-        logger.debug('==> Recheck station load.')
-        overloaded_mv_station = checks.hv_mv_station_load(
-            edisgo_reinforce.network)
-        overloaded_lv_stations = checks.mv_lv_station_load(
-            edisgo_reinforce.network)
-        logger.debug('==> Recheck line load.')
-        crit_lines_lv = checks.lv_line_load(edisgo_reinforce.network)
-        crit_lines_mv = checks.mv_line_load(edisgo_reinforce.network)
-        crit_lines = crit_lines_lv.append(crit_lines_mv)
+        _analyze()
+        logger.debug('==> Recheck station and line load.')
+        overloaded_mv_station, overloaded_lv_stations, crit_lines = \
+            _recheck(_check_overloading, _overloading_issues, load_kinds)
 
         iteration_step += 1
         while_counter += 1
@@ -450,8 +567,99 @@ def reinforce_grid(edisgo, timesteps_pfa=None, copy_graph=False,
     # final check 10% criteria
     checks.check_ten_percent_voltage_deviation(edisgo_reinforce.network)
 
+    if prune:
+        logger.info('==> Pruning of time steps saved an estimated {:.1f} s '
+                    'in {} power flow analyses.'.format(
+                        time_saved_pfa * number_of_pfa['considered'],
+                        number_of_pfa['considered']))
+
+    # validate reinforced grid and repeat reinforcement including time steps
+    # with issues
+    if timesteps_validation is not None:
+        logger.debug('==> Validate reinforcement for {} time step(s).'.format(
+            len(timesteps_validation)))
+        edisgo_reinforce.analyze(timesteps=timesteps_validation,
+                                 warm_start=warm_start)
+        timesteps_issues = pd.DatetimeIndex(checks.ConstraintEvaluator(
+            edisgo_reinforce.network,
+            combined_analysis=combined_analysis).report()[
+            'time_index'].unique())
+        if timesteps_pfa is None:
+            timesteps_considered = \
+                edisgo_reinforce.network.timeseries.timeindex
+        elif not hasattr(timesteps_pfa, '__len__'):
+            timesteps_considered = pd.DatetimeIndex([timesteps_pfa])
+        else:
+            timesteps_considered = pd.DatetimeIndex(timesteps_pfa)
+        timesteps_new = timesteps_issues.difference(timesteps_considered)
+        if not timesteps_new.empty:
+            logger.info('==> Validation found issues in {} time step(s) not '
+                        'considered so far. Reinforcement is repeated '
+                        'including these time steps.'.format(
+                            len(timesteps_new)))
+            return reinforce_grid(
+                edisgo_reinforce,
+                timesteps_pfa=timesteps_considered.union(timesteps_new),
+                max_while_iterations=max_while_iterations,
+                combined_analysis=combined_analysis,
+                timesteps_validation=timesteps_validation,
+                warm_start=warm_start)
+        elif not timesteps_issues.empty:
+            logger.warning('==> Validation found issues in {} time step(s) '
+                           'already considered in reinforcement.'.format(
+                               len(timesteps_issues)))
+
     # calculate grid expansion costs
     edisgo_reinforce.network.results.grid_expansion_costs = \
         grid_expansion_costs(edisgo_reinforce.network)
 
     return edisgo_reinforce.network.results
+
+
+def _recheck_grids(network, check, issues_found, kinds, lv_grids, mv_feeders,
+                   combined_analysis=False):
+    """
+    Rechecks changed grids and, if they are free of issues, all grids.
+
+    The changed LV grids and MV feeders are checked first. If no issues
+    remain there, all grids are screened for violations by
+    :func:`~.flex_opt.check_tech_constraints.timesteps_near_limits` with a
+    margin of 0 and only checked completely if the screen finds any.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+    check : function
+        Check called with the keyword arguments `lv_grids` and `mv_feeders`
+        to check the changed grids and without arguments to check all grids.
+    issues_found : function
+        Function returning True if the result of `check` contains issues.
+    kinds : :obj:`list` of :obj:`str`
+        Kinds of violations checked by `check`. See
+        :class:`~.flex_opt.check_tech_constraints.ConstraintEvaluator`.
+    lv_grids : :obj:`list` of :class:`~.grid.grids.LVGrid`
+        Changed LV grids.
+    mv_feeders : :obj:`list` of :class:`~.grid.components.Line` or None
+        Changed MV feeders. None if all MV feeders are changed.
+    combined_analysis : :obj:`Boolean`
+        See parameter `combined_analysis` in :func:`reinforce_grid`.
+        Default: False.
+
+    Returns
+    -------
+    Result of `check`.
+
+    """
+    logger.debug('==> Recheck {} changed LV grid(s) and {} MV '
+                 'feeder(s).'.format(
+                    len(lv_grids),
+                    'all' if mv_feeders is None else len(mv_feeders)))
+    result = check(lv_grids=lv_grids, mv_feeders=mv_feeders)
+    if issues_found(result):
+        return result
+    if checks.timesteps_near_limits(
+            network, margin=0, combined_analysis=combined_analysis,
+            kinds=kinds).empty:
+        return result
+    logger.debug('==> Recheck all grids.')
+    return check()
@@ -22,6 +22,7 @@ class Component:
         self._id = kwargs.get('id', None)
         self._geom = kwargs.get('geom', None)
         self._grid = kwargs.get('grid', None)
+        self._version = 0
 
     @property
     def id(self):
@@ -73,6 +74,93 @@ class Component:
     @grid.setter
     def grid(self, grid):
         self._grid = grid
+        self._bump_version()
+
+    def _reset_timesteps_load_feedin_case(self):
+        """
+        Resets load and feed-in case cached in the network's time series
+
+        Needs to be called when the active power time series of the component
+        changes, as it affects the residual load. Components not (yet)
+        assigned to a grid with time series are skipped.
+
+        """
+        try:
+            self._grid.network.timeseries.reset_timesteps_load_feedin_case()
+        except AttributeError:
+            pass
+
+    def _bump_version(self):
+        """
+        Increases version of the component
+
+        Needs to be called when an attribute the time series of the component
+        are derived from changes, so that time series cached in the network's
+        time series are recalculated on next access.
+
+        """
+        self._version += 1
+
+    def _memoized_timeseries(self):
+        """
+        Time series of the component cached in the network's time series
+
+        Time series are calculated by :meth:`_calculate_timeseries` and
+        cached together with the versions of the component and of the
+        :class:`~.grid.network.TimeSeries` attributes listed in
+        :attr:`_timeseries_attributes` (see
+        :class:`~.grid.network.ComponentTimeSeriesCache`). Components not
+        (yet) assigned to a grid with time series are not cached. A copy of
+        the cached time series is returned, so that changing the returned
+        time series does not change the cache.
+
+        """
+        try:
+            timeseries = self._grid.network.timeseries
+            cache = timeseries.component_timeseries_cache
+        except AttributeError:
+            return self._calculate_timeseries()
+        key = (self, 'timeseries')
+        ts = cache.get(key, self._timeseries_stamp(timeseries))
+        if ts is None:
+            ts = self._calculate_timeseries()
+            # stamp is taken after calculation as the calculation itself may
+            # set the power factor and reactive power mode
+            if ts is None:
+                return None
+            cache.set(key, self._timeseries_stamp(timeseries), ts)
+        return ts.copy()
+
+    def _timeseries_stamp(self, timeseries):
+        return (self._version,) + timeseries.versions(
+            self._timeseries_attributes)
+
+    def _reset_limits(self):
+        """
+        Resets allowed load of the component cached in the network's limits
+
+        Needs to be called when line type or quantity or the transformers of a
+        station change. Components not (yet) assigned to a grid are skipped.
+
+        """
+        try:
+            self._grid.network.limits.reset(self)
+        except AttributeError:
+            pass
+
+    def _record_change(self, kind):
+        """
+        Records change of the component for the pypsa representation
+
+        Needs to be called when an attribute of the component translated to
+        pypsa changes, see :class:`~.tools.pypsa_io.PyPSASynchronizer`.
+        Components not (yet) assigned to a grid are skipped.
+
+        """
+        try:
+            self._grid.network.pypsa_synchronizer.record(kind, self)
+        except AttributeError:
+            pass
 
     def __repr__(self):
         return '_'.join([self.__class__.__name__, str(self._id)])
@@ -106,9 +194,13 @@ class Station(Component):
         transformer : :obj:`list` of :class:`Transformer`
         """
         self._transformers = transformer
+        self._reset_limits()
+        self._record_change('station')
 
     def add_transformer(self, transformer):
         self._transformers.append(transformer)
+        self._reset_limits()
+        self._record_change('station')
 
 
 class Transformer(Component):
@@ -165,6 +257,10 @@ class Load(Component):
 
     """
 
+    # time series attributes in TimeSeries the load time series are derived
+    # from
+    _timeseries_attributes = ['load', 'load_reactive_power', 'timeindex']
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._timeseries = kwargs.get('timeseries', None)
@@ -190,7 +286,15 @@ class Load(Component):
             DataFrame containing active power in kW in column 'p' and
             reactive power in kVA in column 'q'.
 
+        Notes
+        -----
+        Time series are cached until the load or the load time series in
+        :class:`~.grid.network.TimeSeries` change.
+
         """
+        return self._memoized_timeseries()
+
+    def _calculate_timeseries(self):
         if self._timeseries is None:
 
             if isinstance(self.grid, MVGrid):
@@ -290,6 +394,7 @@ class Load(Component):
             self._timeseries_reactive = timeseries_reactive
             self._power_factor = 'not_applicable'
             self._reactive_power_mode = 'not_applicable'
+            self._bump_version()
         else:
             raise ValueError(
                 "Reactive power time series of load {} needs to be a pandas "
@@ -328,6 +433,7 @@ class Load(Component):
     @consumption.setter
     def consumption(self, cons_dict):
         self._consumption = cons_dict
+        self._bump_version()
 
     @property
     def peak_load(self):
@@ -370,6 +476,7 @@ class Load(Component):
     @power_factor.setter
     def power_factor(self, power_factor):
         self._power_factor = power_factor
+        self._bump_version()
 
     @property
     def reactive_power_mode(self):
@@ -412,6 +519,7 @@ class Load(Component):
     @reactive_power_mode.setter
     def reactive_power_mode(self, reactive_power_mode):
         self._reactive_power_mode = reactive_power_mode
+        self._bump_version()
 
     @property
     def q_sign(self):
@@ -481,6 +589,11 @@ class Generator(Component):
 
     """
 
+    # time series attributes in TimeSeries the generator time series are
+    # derived from
+    _timeseries_attributes = ['generation_dispatchable',
+                              'generation_reactive_power', 'timeindex']
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -519,7 +632,15 @@ class Generator(Component):
             DataFrame containing active power in kW in column 'p' and
             reactive power in kvar in column 'q'.
 
+        Notes
+        -----
+        Time series are cached until the generator or the generation time
+        series in :class:`~.grid.network.TimeSeries` change.
+
         """
+        return self._memoized_timeseries()
+
+    def _calculate_timeseries(self):
         if self._timeseries is None:
             # calculate time series for active and reactive power
             try:
@@ -601,6 +722,7 @@ class Generator(Component):
             # check if the values in time series makes sense
             if timeseries_reactive.max() <= self._nominal_capacity:
                 self._timeseries_reactive = timeseries_reactive
+                self._bump_version()
             else:
                 message = "Maximum reactive power in timeseries at index " \
                           "{} ".format(timeseries_reactive.idxmax()) + \
@@ -643,6 +765,8 @@ class Generator(Component):
     @nominal_capacity.setter
     def nominal_capacity(self, nominal_capacity):
         self._nominal_capacity = nominal_capacity
+        self._bump_version()
+        self._record_change('node')
 
     @property
     def v_level(self):
@@ -679,6 +803,7 @@ class Generator(Component):
     @power_factor.setter
     def power_factor(self, power_factor):
         self._power_factor = power_factor
+        self._bump_version()
 
     @property
     def reactive_power_mode(self):
@@ -725,6 +850,7 @@ class Generator(Component):
     @reactive_power_mode.setter
     def reactive_power_mode(self, reactive_power_mode):
         self._reactive_power_mode = reactive_power_mode
+        self._bump_version()
 
     @property
     def q_sign(self):
@@ -762,6 +888,10 @@ class GeneratorFluctuating(Generator):
 
     """
 
+    _timeseries_attributes = ['generation_fluctuating',
+                              'generation_reactive_power', 'curtailment',
+                              'timeindex']
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -785,7 +915,16 @@ class GeneratorFluctuating(Generator):
             DataFrame containing active power in kW in column 'p' and
             reactive power in kVA in column 'q'.
 
+        Notes
+        -----
+        Time series are cached until the generator or the generation or
+        curtailment time series in :class:`~.grid.network.TimeSeries`
+        change.
+
         """
+        return self._memoized_timeseries()
+
+    def _calculate_timeseries(self):
         if self._timeseries is None:
 
             # get time series for active power depending on if they are
@@ -912,6 +1051,7 @@ class GeneratorFluctuating(Generator):
                 self._timeseries_reactive = timeseries_reactive
                 self._power_factor = 'not_applicable'
                 self._reactive_power_mode = 'not_applicable'
+                self._bump_version()
             else:
                 message = "Maximum reactive power in time series at " + \
                           "index {} ".format(timeseries_reactive.idxmax()) + \
@@ -970,6 +1110,8 @@ class GeneratorFluctuating(Generator):
     @curtailment.setter
     def curtailment(self, curtailment_ts):
         self._curtailment = curtailment_ts
+        self._bump_version()
+        self._reset_timesteps_load_feedin_case()
 
     @property
     def weather_cell_id(self):
@@ -987,6 +1129,7 @@ class GeneratorFluctuating(Generator):
     @weather_cell_id.setter
     def weather_cell_id(self, weather_cell):
         self._weather_cell_id = weather_cell
+        self._bump_version()
 
 
 class Storage(Component):
@@ -1048,6 +1191,7 @@ class Storage(Component):
     @timeseries.setter
     def timeseries(self, ts):
         self._timeseries = ts
+        self._reset_timesteps_load_feedin_case()
 
     def pypsa_timeseries(self, attr):
         """Return time series in PyPSA format
@@ -1191,6 +1335,7 @@ class Storage(Component):
     @power_factor.setter
     def power_factor(self, power_factor):
         self._power_factor = power_factor
+        self._bump_version()
 
     @property
     def reactive_power_mode(self):
@@ -1233,6 +1378,7 @@ class Storage(Component):
         Should be either 'inductive' or 'capacitive'
         """
         self._reactive_power_mode = reactive_power_mode
+        self._bump_version()
 
     @property
     def q_sign(self):
@@ -1457,6 +1603,8 @@ class Line(Component):
     @type.setter
     def type(self, new_type):
         self._type = new_type
+        self._reset_limits()
+        self._record_change('line')
 
     @property
     def length(self):
@@ -1465,6 +1613,7 @@ class Line(Component):
     @length.setter
     def length(self, new_length):
         self._length = new_length
+        self._record_change('line')
 
     @property
     def quantity(self):
@@ -1473,6 +1622,8 @@ class Line(Component):
     @quantity.setter
     def quantity(self, new_quantity):
         self._quantity = new_quantity
+        self._reset_limits()
+        self._record_change('line')
 
     @property
     def kind(self):
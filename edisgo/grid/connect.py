@@ -366,17 +366,9 @@ def _add_cable_to_equipment_changes(network, line):
     line : class:`~.grid.components.Line`
         Line instance which is to be added
     """
-    network.results.equipment_changes = \
-        network.results.equipment_changes.append(
-            pd.DataFrame(
-                {'iteration_step': [0],
-                 'change': ['added'],
-                 'equipment': [line.type.name],
-                 'quantity': [1]
-                 },
-                index=[line]
-            )
-        )
+    network.results.equipment_change_log.append(
+        line, iteration_step=0, change='added', equipment=line.type.name,
+        quantity=1)
 
 
 def _del_cable_from_equipment_changes(network, line):
@@ -393,9 +385,7 @@ def _del_cable_from_equipment_changes(network, line):
     line : class:`~.grid.components.Line`
         Line instance which is to be deleted
     """
-    if line in network.results.equipment_changes.index:
-        network.results.equipment_changes = \
-            network.results.equipment_changes.drop(line)
+    network.results.equipment_change_log.drop(line)
 
 
 def _find_nearest_conn_objects(network, node, branches):
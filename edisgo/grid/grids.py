@@ -43,7 +43,7 @@ class Grid:
         self._weather_cells = kwargs.get('weather_cells', None)
         self._generators = None
         self._loads = None
-        self._graph = Graph()
+        self._graph = Graph(grid=self)
 
     def connect_generators(self, generators):
         """Connects generators to grid
@@ -317,8 +317,166 @@ class Graph(nx.Graph):
 
     This graph is an object subclassed from `networkX.Graph` extended by extra
     functionality and specific methods.
+
+    Notes
+    -----
+    The graph keeps an index of the adjacent nodes of each line (the object
+    behind the key 'line' of the attribute dict attached to each edge) as
+    well as an index of nodes and lines by their attribute 'type'. Both are
+    updated when edges or nodes are added or removed. This makes
+    :meth:`nodes_from_line` independent of the number of lines in the graph
+    and :meth:`nodes_by_attribute` and :meth:`lines_by_attribute` with the
+    default attribute 'type' dependent only on the number of returned nodes
+    and lines. In case the index is not consistent with the graph, e.g.
+    because the attribute dict of an edge was changed directly, the adjacent
+    nodes are searched for in all edges. Attributes of nodes and edges should
+    therefore only be changed using :meth:`add_node` and :meth:`add_edge`.
+
+    Added and removed nodes and lines are recorded in the pypsa synchronizer
+    of the network of the grid the graph belongs to (see
+    :class:`~.tools.pypsa_io.PyPSASynchronizer`).
     """
 
+    def __init__(self, incoming_graph_data=None, grid=None, **attr):
+        self._grid = grid
+        self._line_nodes = {}
+        self._node_rank = {}
+        self._next_node_rank = 0
+        self._node_type = {}
+        self._nodes_by_type = {}
+        self._line_type = {}
+        self._lines_by_type = {}
+        self._lines_sorted = {}
+        super().__init__(incoming_graph_data, **attr)
+
+    def _is_view(self):
+        # views on the graph (e.g. subgraphs) do not maintain the index
+        return '_graph' in self.__dict__
+
+    def _index_nodes(self, nodes):
+        for node in nodes:
+            # keep order of nodes as in the graph, which determines the order
+            # of adjacent nodes of edges
+            if node not in self._node_rank:
+                self._node_rank[node] = self._next_node_rank
+                self._next_node_rank += 1
+            node_type = self._node[node].get('type', None)
+            if node in self._node_type:
+                if self._node_type[node] == node_type:
+                    continue
+                self._nodes_by_type[self._node_type[node]].pop(node, None)
+            self._node_type[node] = node_type
+            self._nodes_by_type.setdefault(node_type, {})[node] = None
+
+    def _unindex_node(self, node):
+        self._node_rank.pop(node, None)
+        if node in self._node_type:
+            self._nodes_by_type[self._node_type.pop(node)].pop(node, None)
+
+    def _index_edge(self, u, v):
+        line = self._adj[u][v].get('line', None)
+        if line is not None:
+            self._line_nodes[line] = (u, v)
+            line_type = self._adj[u][v].get('type', None)
+            self._line_type[line] = line_type
+            self._lines_by_type.setdefault(line_type, {})[line] = None
+            self._lines_sorted.pop(line_type, None)
+            self._lines_sorted.pop(None, None)
+
+    def _unindex_edge(self, u, v):
+        if u in self._adj and v in self._adj[u]:
+            line = self._adj[u][v].get('line', None)
+            if line is not None:
+                self._line_nodes.pop(line, None)
+                if line in self._line_type:
+                    line_type = self._line_type.pop(line)
+                    self._lines_by_type[line_type].pop(line, None)
+                    self._lines_sorted.pop(line_type, None)
+                    self._lines_sorted.pop(None, None)
+
+    def _record_change(self, kind, component):
+        # record change for the pypsa representation of the network
+        try:
+            self._grid.network.pypsa_synchronizer.record(kind, component)
+        except AttributeError:
+            pass
+
+    def _record_line_change(self, u, v):
+        if u in self._adj and v in self._adj[u]:
+            line = self._adj[u][v].get('line', None)
+            if line is not None:
+                self._record_change('line', line)
+
+    def add_node(self, node_for_adding, **attr):
+        super().add_node(node_for_adding, **attr)
+        self._index_nodes([node_for_adding])
+        self._record_change('node', node_for_adding)
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        nodes_for_adding = list(nodes_for_adding)
+        super().add_nodes_from(nodes_for_adding, **attr)
+        self._index_nodes(self._node)
+        for n in nodes_for_adding:
+            self._record_change('node', n[0] if isinstance(n, tuple) else n)
+
+    def remove_node(self, n):
+        if n in self._adj:
+            for neighbor in list(self._adj[n]):
+                self._record_line_change(n, neighbor)
+                self._unindex_edge(n, neighbor)
+        super().remove_node(n)
+        self._unindex_node(n)
+        self._record_change('node', n)
+
+    def remove_nodes_from(self, nodes):
+        for n in list(nodes):
+            try:
+                self.remove_node(n)
+            except nx.NetworkXError:
+                pass
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        self._record_line_change(u_of_edge, v_of_edge)
+        self._unindex_edge(u_of_edge, v_of_edge)
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+        self._index_nodes([u_of_edge, v_of_edge])
+        self._index_edge(u_of_edge, v_of_edge)
+        self._record_line_change(u_of_edge, v_of_edge)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        ebunch_to_add = list(ebunch_to_add)
+        for e in ebunch_to_add:
+            if len(e) in [2, 3]:
+                self._record_line_change(e[0], e[1])
+                self._unindex_edge(e[0], e[1])
+        super().add_edges_from(ebunch_to_add, **attr)
+        self._index_nodes(self._node)
+        for e in ebunch_to_add:
+            self._index_edge(e[0], e[1])
+            self._record_line_change(e[0], e[1])
+
+    def remove_edge(self, u, v):
+        self._record_line_change(u, v)
+        self._unindex_edge(u, v)
+        super().remove_edge(u, v)
+
+    def remove_edges_from(self, ebunch):
+        ebunch = list(ebunch)
+        for e in ebunch:
+            self._record_line_change(e[0], e[1])
+            self._unindex_edge(e[0], e[1])
+        super().remove_edges_from(ebunch)
+
+    def clear(self):
+        super().clear()
+        self._line_nodes = {}
+        self._node_rank = {}
+        self._node_type = {}
+        self._nodes_by_type = {}
+        self._line_type = {}
+        self._lines_by_type = {}
+        self._lines_sorted = {}
+
     def nodes_from_line(self, line):
         """
         Get nodes adjacent to line
@@ -336,6 +494,16 @@ class Graph(nx.Graph):
         tuple
             Nodes adjacent to this edge
         """
+        try:
+            u, v = self._line_nodes[line]
+            if self._adj[u][v].get('line', None) is line:
+                # same order of nodes as in edges of the graph
+                if self._node_rank[u] < self._node_rank[v]:
+                    return u, v
+                else:
+                    return v, u
+        except KeyError:
+            pass
 
         return dict([(v, k) for k, v in
                      nx.get_edge_attributes(self, name='line').items()])[line]
@@ -357,13 +525,10 @@ class Graph(nx.Graph):
             Line segment connecting ``u`` and ``v``.
         """
         try:
-            line = nx.get_edge_attributes(self, name='line')[(u, v)]
-        except:
-            try:
-                line = nx.get_edge_attributes(self, name='line')[(v, u)]
-            except:
-                raise nx.NetworkXError('Line between ``u`` and ``v`` not '
-                                       'included in the graph.')
+            line = self._adj[u][v]['line']
+        except KeyError:
+            raise nx.NetworkXError('Line between ``u`` and ``v`` not '
+                                   'included in the graph.')
 
         return line
 
@@ -398,6 +563,9 @@ class Graph(nx.Graph):
             value
         """
 
+        if attr == 'type' and not self._is_view():
+            return list(self._nodes_by_type.get(attr_val, {}))
+
         temp_nodes = getattr(self, 'node')
         nodes = list(filter(None, map(lambda x: x if temp_nodes[x][attr] == attr_val else None,
                                       temp_nodes.keys())))
@@ -458,6 +626,12 @@ class Graph(nx.Graph):
             __init__.py>`_.
         """
 
+        if attr == 'type' and not self._is_view():
+            for line in self._lines_sorted_by_type(
+                    attr_val if attr_val else None):
+                yield {'adj_nodes': self.nodes_from_line(line), 'line': line}
+            return
+
         # get all lines that have the attribute 'type' set
         lines_attributes = nx.get_edge_attributes(self, name=attr).items()
 
@@ -477,6 +651,22 @@ class Graph(nx.Graph):
         for line in lines_sorted:
             yield {'adj_nodes': line[0], 'line': line[1]}
 
+    def _lines_sorted_by_type(self, line_type=None):
+        """
+        Lines of given type from index sorted by their representative.
+
+        If `line_type` is None all lines with type set are returned.
+
+        """
+        if line_type not in self._lines_sorted:
+            if line_type is None:
+                lines = [line for t, lines_type in self._lines_by_type.items()
+                         if t is not None for line in lines_type]
+            else:
+                lines = list(self._lines_by_type.get(line_type, {}))
+            self._lines_sorted[line_type] = sorted(lines, key=repr)
+        return self._lines_sorted[line_type]
+
     def lines(self):
         """ Returns a generator for iterating over Graph's lines
 
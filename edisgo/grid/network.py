@@ -7,25 +7,43 @@ import datetime
 from pyomo.environ import Constraint
 import networkx as nx
 import csv
+from collections import OrderedDict
 from pypsa import Network as PyPSANetwork
 
 import edisgo
 from edisgo.tools import config, tools
-from edisgo.tools import pypsa_io_lopf, pypsa_io
+from edisgo.tools import pypsa_io_lopf, pypsa_io, powerflow
 from edisgo.data.import_data import import_from_ding0, import_generators, \
     import_feedin_timeseries, import_load_timeseries
 from edisgo.flex_opt.reinforce_grid import reinforce_grid
 from edisgo.flex_opt import storage_integration, storage_operation, \
     curtailment, storage_positioning
+from edisgo.flex_opt import check_tech_constraints as checks
 from edisgo.grid.components import Station, BranchTee, Generator, Load, \
-    GeneratorFluctuating
+    GeneratorFluctuating, LVStation, Line, Transformer
 from edisgo.grid.tools import get_gen_info, disconnect_storage
-from edisgo.grid.grids import MVGrid
+from edisgo.grid.grids import MVGrid, LVGrid
 from edisgo.tools import plots
 
 logger = logging.getLogger('edisgo')
 
 
+def _check_dtype(dtype):
+    """
+    Checks floating point type of time series and power flow results.
+
+    Only numpy.float64 and numpy.float32 are supported.
+
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in [np.float64, np.float32]:
+        message = "Floating point type {} is not supported. Choose " \
+                  "numpy.float64 or numpy.float32.".format(dtype)
+        logger.error(message)
+        raise ValueError(message)
+    return dtype
+
+
 class EDisGoReimport:
     """
     EDisGo class created from saved results.
@@ -461,6 +479,15 @@ class EDisGo(EDisGoReimport):
         that will be used in the power flow analysis. Also defines the year
         load time series are obtained for when choosing the 'demandlib' option
         to generate load time series.
+    timeseries_memmap_directory : None or :obj:`str`
+        If provided, the feed-in and load time series are stored in
+        memory-mapped files in this directory instead of being held in
+        memory. See :meth:`~.grid.network.TimeSeries.memory_map`.
+        Default: None.
+    dtype : :numpy:`numpy.dtype<dtype>`
+        Floating point type feed-in and load time series and power flow
+        results are stored in. See :py:attr:`~.grid.network.Network.dtype`.
+        Default: numpy.float64.
 
     Attributes
     ----------
@@ -494,7 +521,8 @@ class EDisGo(EDisGoReimport):
         self.network = Network(
             generator_scenario=kwargs.get('generator_scenario', None),
             config_path=kwargs.get('config_path', None),
-            scenario_description=kwargs.get('scenario_description', None))
+            scenario_description=kwargs.get('scenario_description', None),
+            dtype=kwargs.get('dtype', np.float64))
 
         # load grid
         # ToDo: should at some point work with only MV grid ID
@@ -520,6 +548,9 @@ class EDisGo(EDisGoReimport):
                 timeseries_load_reactive_power = kwargs.get(
                     'timeseries_load_reactive_power', None),
                 timeindex=kwargs.get('timeindex', None)).timeseries
+            if kwargs.get('timeseries_memmap_directory', None) is not None:
+                self.network.timeseries.memory_map(
+                    kwargs.get('timeseries_memmap_directory'))
 
         # import new generators
         if self.network.generator_scenario is not None:
@@ -559,8 +590,11 @@ class EDisGo(EDisGoReimport):
             self.network.generator_scenario = generator_scenario
         data_source = 'oedb'
         import_generators(network=self.network, data_source=data_source)
+        self.network.timeseries.reset_timesteps_load_feedin_case()
 
-    def analyze(self, mode=None, timesteps=None):
+    def analyze(self, mode=None, timesteps=None, window=None,
+                results_path=None, engine='pypsa', warm_start=True,
+                screening_margin=None, non_convergence='raise'):
         """Analyzes the grid by power flow analysis
 
         Analyze the grid for violations of hosting capacity. Means, perform a
@@ -591,12 +625,91 @@ class EDisGo(EDisGoReimport):
             analysis. It defaults to None in which case the time steps in
             timeseries.timeindex (see :class:`~.grid.network.TimeSeries`) are
             used.
+        window : None or :obj:`int`
+            If provided, power flow analysis is conducted successively for
+            windows of `window` time steps so that the time series of only
+            one window are exported to PyPSA at once. Default: None.
+        results_path : None or :obj:`str`
+            Only used if `window` is provided. If provided, power flow results
+            of each window are appended to the power flow results in this
+            directory (see :meth:`~.grid.network.Results.save`) and only
+            results of the last window are kept in
+            :class:`~.grid.network.Results`. Otherwise, results of all windows
+            are concatenated in :class:`~.grid.network.Results`.
+            Default: None.
+        engine : :obj:`str`
+            Power flow solver. Possible options are:
+
+            * 'pypsa'
+              Non-linear power flow analysis by Newton-Raphson in PyPSA.
+            * 'sweep'
+              Power flow analysis of the radial grid by backward/forward
+              sweep for all time steps at once (see
+              :func:`~.tools.powerflow.sweep_pf`). Raises ValueError if the
+              grid contains rings, e.g. because switch disconnectors are
+              closed.
+            * 'zbus'
+              Power flow analysis of all time steps at once with the
+              admittance matrix factorized once per state of the grid
+              topology (see :func:`~.tools.powerflow.zbus_pf`). Time steps
+              that do not converge are analyzed by Newton-Raphson in PyPSA.
+
+            Default: 'pypsa'.
+        warm_start : :obj:`bool`
+            If True, voltages of the last converged power flow analysis of
+            each time step (see :attr:`~.grid.network.Network.pf_seed`) are
+            used as initial guess instead of a flat start. This reduces the
+            number of iterations in repeated power flow analyses of the same
+            time steps, e.g. in grid reinforcement. Default: True.
+        screening_margin : None or :obj:`float`
+            If provided, an approximate power flow analysis of all time steps
+            by the linearized DistFlow equations (see
+            :func:`~.tools.powerflow.linear_pf`) is conducted first. Only
+            time steps in which any line, station or node is within this
+            margin of its limits (see
+            :func:`~.flex_opt.check_tech_constraints.timesteps_near_limits`)
+            are then analyzed by the power flow analysis chosen in `engine`,
+            as are time steps the approximation yields no voltages for
+            because of heavy load.
+            Results of the other time steps remain approximate, which is
+            recorded in :attr:`~.grid.network.Results.pfa_approximated`.
+            As the approximation neglects losses, the margin should cover
+            the resulting underestimation of voltage drops and currents.
+            If the grid is not radial, e.g. because switch disconnectors are
+            closed, all time steps are analyzed by `engine`.
+            Default: None, in which case all time steps are analyzed by
+            `engine`.
+        non_convergence : :obj:`str`
+            Handling of time steps the power flow analysis does not converge
+            for. These time steps are first analyzed again with a flat start,
+            in case `warm_start` is True. If time steps still do not
+            converge, possible options are:
+
+            * 'raise'
+              ValueError is raised.
+            * 'record'
+              Time steps are analyzed again by damped Z-bus iterations (see
+              :func:`~.tools.powerflow.zbus_pf`), in which case a warning
+              is logged as results of these time steps are not obtained by
+              `engine`. Results of the converged time steps are processed
+              and time steps that still did not converge are recorded in
+              :attr:`~.grid.network.Results.pfa_not_converged`. ValueError
+              is raised if no time step converges.
+            * 'bisect'
+              Same as 'record' but additionally the largest scaling of all
+              loads and generators for which each recorded time step
+              converges is determined (see
+              :func:`~.tools.powerflow.convergence_boundary`).
+
+            Default: 'raise'.
 
         Notes
         -----
         The current implementation always translates the grid topology
         representation to the PyPSA format and stores it to
-        :attr:`self.network.pypsa`.
+        :attr:`self.network.pypsa`. All power flow solvers write their
+        results to the PyPSA network which are then processed by
+        :func:`~.tools.pypsa_io.process_pfa_results`.
 
         ToDos
         ------
@@ -627,6 +740,25 @@ class EDisGo(EDisGoReimport):
         if not hasattr(timesteps, "__len__"):
             timesteps = [timesteps]
 
+        if engine not in ['pypsa', 'sweep', 'zbus']:
+            logger.error('Power flow engine {} is not valid.'.format(engine))
+            raise ValueError("Power flow engine must be 'pypsa', 'sweep' or "
+                             "'zbus'.")
+        if non_convergence not in ['raise', 'record', 'bisect']:
+            logger.error('Handling of non-convergence {} is not '
+                         'valid.'.format(non_convergence))
+            raise ValueError("Parameter 'non_convergence' must be 'raise', "
+                             "'record' or 'bisect'.")
+
+        if window is not None:
+            self._analyze_windows(mode, timesteps, window, results_path,
+                                  engine, warm_start, screening_margin,
+                                  non_convergence)
+            return
+
+        # apply changes of the grid topology since the last power flow
+        # analysis to the pypsa representation
+        self.network.pypsa_synchronizer.apply()
         if self.network.pypsa is None:
             # Translate eDisGo grid topology representation to PyPSA format
             self.network.pypsa = pypsa_io.to_pypsa(
@@ -642,14 +774,181 @@ class EDisGo(EDisGoReimport):
         if False in [True if _ in self.network.pypsa.snapshots else False
                      for _ in timesteps]:
             pypsa_io.update_pypsa_timeseries(self.network, timesteps=timesteps)
-        # run power flow analysis
-        pf_results = self.network.pypsa.pf(timesteps)
 
-        if all(pf_results['converged']['0'].tolist()):
+        # screen time steps by approximate power flow analysis and only
+        # analyze time steps close to limits by the chosen engine
+        if screening_margin is not None:
+            try:
+                pf_results = powerflow.linear_pf(self.network.pypsa,
+                                                 timesteps)
+            except ValueError as e:
+                # the approximation needs a radial grid, e.g. closed switch
+                # disconnectors make rings
+                logger.warning('Time steps are not screened as the '
+                               'approximate power flow analysis failed: {} '
+                               'All {} time step(s) are analyzed by '
+                               '{}.'.format(e, len(timesteps), engine))
+                screening_margin = None
+        if screening_margin is not None:
             pypsa_io.process_pfa_results(
                 self.network, self.network.pypsa, timesteps)
+            results_approximated = {
+                name: getattr(self.network.results, name)
+                for name in Results.power_flow_results}
+            results_approximated['pfa_approximated'][:] = True
+            # time steps in which the approximate squared voltage of any bus
+            # becomes negative have no approximate results and are among the
+            # most critical ones, wherefore they are analyzed exactly as well
+            converged = pf_results['converged']['0']
+            timesteps_exact = checks.timesteps_near_limits(
+                self.network, margin=screening_margin).union(
+                converged.index[~converged.values.astype(bool)])
+            logger.info('Screening by approximate power flow analysis: {} of '
+                        '{} time step(s) are close to limits and analyzed '
+                        'by {}.'.format(len(timesteps_exact), len(timesteps),
+                                        engine))
+            if timesteps_exact.empty:
+                self.network.results.pfa_not_converged = pd.DataFrame(
+                    columns=['load_scaling'], index=timesteps_exact,
+                    dtype=float)
+                return
+            timesteps = timesteps_exact
+
+        # set initial guess of voltages
+        if warm_start:
+            timesteps_seeded = self.network.pf_seed.apply(
+                self.network.pypsa, timesteps)
         else:
-            raise ValueError("Power flow analysis did not converge.")
+            timesteps_seeded = []
+        # run power flow analysis
+        pf_results = self._run_pf(engine, timesteps, use_seed=warm_start)
+        n_iter = pf_results['n_iter']['0']
+        logger.info('Power flow analysis of {} time step(s) ({} warm '
+                    'started) took {} iterations in total, {:.1f} per time '
+                    'step.'.format(len(n_iter), len(timesteps_seeded),
+                                   n_iter.sum(), n_iter.mean()))
+        converged = pf_results['converged']['0'].loc[timesteps].astype(bool)
+
+        # retry time steps that did not converge
+        if not converged.all() and warm_start:
+            timesteps_retry = converged.index[~converged.values]
+            logger.debug('Retrying power flow analysis of {} time step(s) '
+                         'with flat start.'.format(len(timesteps_retry)))
+            pf_results = self._run_pf(engine, timesteps_retry,
+                                      use_seed=False)
+            converged.loc[timesteps_retry] = pf_results['converged'][
+                '0'].loc[timesteps_retry].astype(bool).values
+        if not converged.all() and non_convergence != 'raise':
+            timesteps_retry = converged.index[~converged.values]
+            logger.debug('Retrying power flow analysis of {} time step(s) '
+                         'by damped Z-bus iterations.'.format(
+                             len(timesteps_retry)))
+            pf_results = powerflow.zbus_pf(
+                self.network.pypsa, timesteps_retry, max_iter=300,
+                fallback=False, damping=0.5)
+            converged.loc[timesteps_retry] = pf_results['converged'][
+                '0'].loc[timesteps_retry].astype(bool).values
+            timesteps_damped = timesteps_retry[
+                converged.loc[timesteps_retry].values]
+            if not timesteps_damped.empty:
+                logger.warning('Power flow analysis by {} did not converge '
+                               'for {} time step(s). Results of these time '
+                               'steps are taken from damped Z-bus '
+                               'iterations.'.format(engine,
+                                                    len(timesteps_damped)))
+
+        timesteps_not_converged = converged.index[~converged.values]
+        not_converged = pd.DataFrame(
+            {'load_scaling': np.nan}, index=timesteps_not_converged,
+            columns=['load_scaling'], dtype=float)
+        if not timesteps_not_converged.empty:
+            if non_convergence == 'raise':
+                logger.error('Power flow analysis did not converge for {} of '
+                             '{} time step(s).'.format(
+                                 len(timesteps_not_converged),
+                                 len(timesteps)))
+                raise ValueError("Power flow analysis did not converge.")
+            if not converged.any():
+                logger.error('Power flow analysis did not converge for any '
+                             'of {} time step(s).'.format(len(timesteps)))
+                raise ValueError("Power flow analysis did not converge for "
+                                 "any time step.")
+            if non_convergence == 'bisect':
+                not_converged['load_scaling'] = \
+                    powerflow.convergence_boundary(
+                        self.network.pypsa, timesteps_not_converged)
+            logger.warning('Power flow analysis did not converge for {} of '
+                           '{} time step(s). See results.pfa_not_converged '
+                           'for time steps without power flow '
+                           'results.'.format(len(timesteps_not_converged),
+                                             len(timesteps)))
+            timesteps = converged.index[converged.values]
+
+        pypsa_io.process_pfa_results(
+            self.network, self.network.pypsa, timesteps)
+        self.network.results.pfa_not_converged = not_converged
+        self.network.pf_seed.discard(timesteps_not_converged)
+        self.network.pf_seed.update(self.network.pypsa, timesteps)
+        if screening_margin is not None:
+            # merge results of the exact analysis into the approximate
+            # results
+            for name, values in results_approximated.items():
+                if name == 'pfa_not_converged':
+                    continue
+                values.loc[timesteps] = getattr(self.network.results, name)
+                setattr(self.network.results, name, values)
+
+    def _run_pf(self, engine, timesteps, use_seed):
+        """
+        Runs power flow analysis of the given time steps by the given engine.
+
+        See parameters `engine` and `warm_start` of :meth:`analyze`.
+
+        Returns
+        -------
+        :obj:`dict`
+            Number of iterations, error and convergence of each time step in
+            the format of the results of :meth:`pypsa.Network.pf`.
+
+        """
+        if engine == 'sweep':
+            return powerflow.sweep_pf(
+                self.network.pypsa, timesteps, use_seed=use_seed)
+        elif engine == 'zbus':
+            return powerflow.zbus_pf(
+                self.network.pypsa, timesteps, use_seed=use_seed)
+        else:
+            return self.network.pypsa.pf(timesteps, use_seed=use_seed)
+
+    def _analyze_windows(self, mode, timesteps, window, results_path,
+                         engine, warm_start, screening_margin,
+                         non_convergence):
+        """
+        Conducts power flow analysis successively for windows of time steps.
+
+        See parameters `window`, `results_path`, `engine`, `warm_start`,
+        `screening_margin` and `non_convergence` of :meth:`analyze`.
+
+        """
+        results = self.network.results
+        windows = tools.time_windows(pd.DatetimeIndex(timesteps), window)
+        results_windows = {_: [] for _ in Results.power_flow_results}
+        for count, timesteps_window in enumerate(windows):
+            logger.debug('Power flow analysis of time steps {} to {}.'.format(
+                timesteps_window[0], timesteps_window[-1]))
+            self.analyze(mode=mode, timesteps=timesteps_window,
+                         engine=engine, warm_start=warm_start,
+                         screening_margin=screening_margin,
+                         non_convergence=non_convergence)
+            if results_path is not None:
+                results.save(results_path, parameters='powerflow_results',
+                             append=count > 0)
+            else:
+                for name in results_windows.keys():
+                    results_windows[name].append(getattr(results, name))
+        if results_path is None and len(windows) > 1:
+            for name, results_window in results_windows.items():
+                setattr(results, name, pd.concat(results_window))
 
     def analyze_lopf(self, mode=None, timesteps=None,
                      etrago_max_storage_size=None):
@@ -796,14 +1095,68 @@ class EDisGo(EDisGoReimport):
         Reinforces the grid and calculates grid expansion costs.
 
         See :meth:`edisgo.flex_opt.reinforce_grid` for more information.
+        Additionally, the keyword argument `window` can be used to reinforce
+        the grid successively for windows of the given number of time steps
+        of `timesteps_pfa` (all time steps if not given), which limits the
+        time series exported to PyPSA at once. Power flow results are not
+        written to disk per window, so that after reinforcement in time
+        windows :class:`~.grid.network.Results` holds power flow results of
+        the last window only. Reinforcement in time windows can not be
+        combined with 'snapshot_analysis',
+        'representative_snapshots', `copy_graph`, `pruning_margin`,
+        `timesteps_validation` or `number_of_snapshots`.
 
         """
-        results = reinforce_grid(
-            self, max_while_iterations=kwargs.get(
-                'max_while_iterations', 10),
-            copy_graph=kwargs.get('copy_graph', False),
-            timesteps_pfa=kwargs.get('timesteps_pfa', None),
-            combined_analysis=kwargs.get('combined_analysis', False))
+        window = kwargs.get('window', None)
+        if window is None:
+            results = reinforce_grid(
+                self, max_while_iterations=kwargs.get(
+                    'max_while_iterations', 10),
+                copy_graph=kwargs.get('copy_graph', False),
+                timesteps_pfa=kwargs.get('timesteps_pfa', None),
+                combined_analysis=kwargs.get('combined_analysis', False),
+                number_of_snapshots=kwargs.get('number_of_snapshots', 10),
+                timesteps_validation=kwargs.get('timesteps_validation',
+                                                None),
+                pruning_margin=kwargs.get('pruning_margin', None),
+                warm_start=kwargs.get('warm_start', True))
+        else:
+            # reinforce grid successively for each window of time steps,
+            # starting from the grid reinforced for the previous windows
+            timesteps = kwargs.get('timesteps_pfa', None)
+            if timesteps is None:
+                timesteps = self.network.timeseries.timeindex
+            if isinstance(timesteps, str) or kwargs.get('copy_graph', False):
+                raise ValueError(
+                    "Reinforcement in time windows can neither be combined "
+                    "with 'snapshot_analysis' or 'representative_snapshots' "
+                    "nor with copy_graph.")
+            unsupported = [_ for _ in ['pruning_margin',
+                                       'timesteps_validation',
+                                       'number_of_snapshots']
+                           if kwargs.get(_, None) is not None]
+            if unsupported:
+                raise ValueError(
+                    "Reinforcement in time windows can not be combined with "
+                    "{}.".format(', '.join(unsupported)))
+            for timesteps_window in tools.time_windows(
+                    pd.DatetimeIndex(timesteps), window):
+                logger.debug('Grid reinforcement for time steps {} to '
+                             '{}.'.format(timesteps_window[0],
+                                          timesteps_window[-1]))
+                # only keep time series of the current window in the pypsa
+                # representation
+                if (self.network.pypsa is not None and not
+                        self.network.pypsa.snapshots.equals(
+                            timesteps_window)):
+                    pypsa_io.update_pypsa_timeseries(
+                        self.network, timesteps=timesteps_window)
+                results = reinforce_grid(
+                    self, max_while_iterations=kwargs.get(
+                        'max_while_iterations', 10),
+                    timesteps_pfa=timesteps_window,
+                    combined_analysis=kwargs.get('combined_analysis', False),
+                    warm_start=kwargs.get('warm_start', True))
 
         # add measure to Results object
         if not kwargs.get('copy_graph', False):
@@ -862,6 +1215,12 @@ class Network:
 
         self._mv_grid = kwargs.get('mv_grid', None)
         self._pypsa = None
+        self._pypsa_topology_cache = pypsa_io.TopologyCache()
+        self._pypsa_synchronizer = pypsa_io.PyPSASynchronizer(self)
+        self._pf_seed = powerflow.VoltageSeed()
+        self._timeseries = None
+        self._dtype = _check_dtype(kwargs.get('dtype', np.float64))
+        self._limits = Limits(self)
         self.results = Results(self)
 
         self._dingo_import_data = []
@@ -930,6 +1289,7 @@ class Network:
     @config.setter
     def config(self, config_path):
         self._config = Config(config_path=config_path)
+        self._limits.reset()
 
     @property
     def metadata(self):
@@ -1043,8 +1403,55 @@ class Network:
 
     @timeseries.setter
     def timeseries(self, timeseries):
+        if timeseries is not None:
+            timeseries.dtype = self._dtype
         self._timeseries = timeseries
 
+    @property
+    def dtype(self):
+        """
+        Floating point type of time series and power flow results.
+
+        Feed-in and load time series in :class:`~.grid.network.TimeSeries`
+        and power flow results in :class:`~.grid.network.Results` are stored
+        in this type. Choosing numpy.float32 halves the memory needed, which
+        is usually sufficient for screening studies. Power flow analysis in
+        PyPSA is always conducted with numpy.float64; time series are
+        converted when exported to PyPSA and results when processed.
+
+        Parameters
+        ----------
+        dtype : :numpy:`numpy.dtype<dtype>`
+            numpy.float64 or numpy.float32.
+
+        Returns
+        --------
+        :numpy:`numpy.dtype<dtype>`
+            Floating point type of time series and power flow results.
+
+        """
+        return self._dtype
+
+    @dtype.setter
+    def dtype(self, dtype):
+        self._dtype = _check_dtype(dtype)
+        if self._timeseries is not None:
+            self._timeseries.dtype = self._dtype
+
+    @property
+    def limits(self):
+        """
+        Allowed load of lines and stations and allowed voltage deviations.
+
+        Returns
+        --------
+        :class:`~.grid.network.Limits`
+            Cache of allowed load of lines and stations and allowed voltage
+            deviations.
+
+        """
+        return self._limits
+
     @property
     def data_sources(self):
         """
@@ -1115,6 +1522,61 @@ class Network:
     @pypsa.setter
     def pypsa(self, pypsa):
         self._pypsa = pypsa
+        # changes recorded for the former pypsa representation are obsolete
+        self._pypsa_synchronizer.clear()
+        # residual load is obtained from the pypsa representation if it
+        # exists, therefore the load and feed-in case needs to be reevaluated
+        if self._timeseries is not None:
+            self._timeseries.reset_timesteps_load_feedin_case()
+
+    @property
+    def pypsa_topology_cache(self):
+        """
+        Cache of the component tables of the pypsa representation.
+
+        Component tables are only set up again for parts of the grid topology
+        that changed since the last translation to pypsa, also when
+        :attr:`pypsa` was set to None. See
+        :class:`~.tools.pypsa_io.TopologyCache` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.pypsa_io.TopologyCache`
+
+        """
+        return self._pypsa_topology_cache
+
+    @property
+    def pypsa_synchronizer(self):
+        """
+        Synchronizer of the pypsa representation.
+
+        Records changes of the grid topology and applies them to
+        :attr:`pypsa` before the next power flow analysis. See
+        :class:`~.tools.pypsa_io.PyPSASynchronizer` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.pypsa_io.PyPSASynchronizer`
+
+        """
+        return self._pypsa_synchronizer
+
+    @property
+    def pf_seed(self):
+        """
+        Voltages of the last converged power flow analysis of each time step.
+
+        Used as initial guess of power flow analyses with `warm_start` (see
+        :meth:`~.grid.network.EDisGo.analyze`). See
+        :class:`~.tools.powerflow.VoltageSeed` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.powerflow.VoltageSeed`
+
+        """
+        return self._pf_seed
 
     def __repr__(self):
         return 'Network ' + str(self._id)
@@ -1366,7 +1828,7 @@ class TimeSeriesControl:
                 raise ValueError('{} is not a valid mode.'.format(mode))
 
             # set random timeindex
-            self.timeseries._timeindex = pd.date_range(
+            self.timeseries.timeindex = pd.date_range(
                 '1/1/1970', periods=len(modes), freq='H')
             self._worst_case_generation(config_data['worst_case_scale_factor'],
                                         modes)
@@ -1408,9 +1870,9 @@ class TimeSeriesControl:
                 self.timeseries.generation_reactive_power = ts
             # set time index
             if kwargs.get('timeindex', None) is not None:
-                self.timeseries._timeindex = kwargs.get('timeindex')
+                self.timeseries.timeindex = kwargs.get('timeindex')
             else:
-                self.timeseries._timeindex = \
+                self.timeseries.timeindex = \
                     self.timeseries._generation_fluctuating.index
 
             # load time series
@@ -2002,10 +2464,8 @@ class StorageControl:
                 index=storage.timeseries.index)
 
         # update pypsa representation
-        if self.edisgo.network.pypsa is not None:
-            pypsa_io.update_pypsa_storage(
-                self.edisgo.network.pypsa,
-                storages=[storage], storages_lines=[line])
+        self.edisgo.network.pypsa_synchronizer.apply()
+        self.edisgo.network.timeseries.reset_timesteps_load_feedin_case()
 
     def _check_nominal_power(self, storage_parameters, timeseries):
         """
@@ -2062,6 +2522,148 @@ class StorageControl:
             raise KeyError(message)
 
 
+class ComponentTimeSeriesCache:
+    """
+    Least recently used cache of component time series.
+
+    Time series of loads and generators are stored together with a version
+    stamp made up of the component's version and the versions of the
+    :class:`~.grid.network.TimeSeries` attributes they are derived from.
+    A cached time series is only returned as long as the stamp is unchanged.
+    When the memory used by the cached time series exceeds `max_memory`, the
+    least recently used time series are evicted.
+
+    Parameters
+    ----------
+    max_memory : :obj:`int`, optional
+        Maximum memory in bytes used by the cached time series. If None,
+        memory is not limited. Default: 512 MB.
+
+    """
+
+    DEFAULT_MAX_MEMORY = 512 * 1024 ** 2
+
+    def __init__(self, max_memory=DEFAULT_MAX_MEMORY):
+        self._max_memory = max_memory
+        self._cache = OrderedDict()
+        self._memory = 0
+        self._info = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def max_memory(self):
+        """
+        Maximum memory in bytes used by the cached time series.
+
+        Parameters
+        ----------
+        max_memory : :obj:`int` or None
+            Maximum memory in bytes. None means memory is not limited.
+
+        Returns
+        -------
+        :obj:`int` or None
+            Maximum memory in bytes.
+
+        """
+        return self._max_memory
+
+    @max_memory.setter
+    def max_memory(self, max_memory):
+        self._max_memory = max_memory
+        self._evict()
+
+    @property
+    def memory(self):
+        """:obj:`int` : Memory in bytes used by the cached time series"""
+        return self._memory
+
+    @property
+    def info(self):
+        """
+        Number of cache hits, misses and evictions.
+
+        Returns
+        -------
+        :obj:`dict`
+            Dictionary with keys 'hits', 'misses' and 'evictions'.
+
+        """
+        return dict(self._info)
+
+    def get(self, key, stamp):
+        """
+        Returns cached time series if its version stamp is unchanged.
+
+        Parameters
+        ----------
+        key : :obj:`tuple`
+            Component and name of the time series.
+        stamp : :obj:`tuple`
+            Current version stamp of the time series.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>` or :pandas:`pandas.Series<series>` or None
+            Cached time series or None if the time series is not cached or
+            outdated.
+
+        """
+        try:
+            cached_stamp, value, memory = self._cache[key]
+        except KeyError:
+            self._info['misses'] += 1
+            return None
+        if cached_stamp != stamp:
+            self._info['misses'] += 1
+            self._remove(key)
+            return None
+        self._cache.move_to_end(key)
+        self._info['hits'] += 1
+        return value
+
+    def set(self, key, stamp, value):
+        """
+        Caches time series with its version stamp.
+
+        Parameters
+        ----------
+        key : :obj:`tuple`
+            Component and name of the time series.
+        stamp : :obj:`tuple`
+            Version stamp of the time series.
+        value : :pandas:`pandas.DataFrame<dataframe>` or :pandas:`pandas.Series<series>`
+            Time series to cache.
+
+        """
+        if key in self._cache:
+            self._remove(key)
+        memory = int(np.sum(value.memory_usage(index=True)))
+        self._cache[key] = (stamp, value, memory)
+        self._memory += memory
+        self._evict()
+
+    def clear(self):
+        """
+        Removes all cached time series.
+
+        """
+        self._cache.clear()
+        self._memory = 0
+
+    def _remove(self, key):
+        self._memory -= self._cache.pop(key)[2]
+
+    def _evict(self):
+        if self._max_memory is None:
+            return
+        while self._cache and self._memory > self._max_memory:
+            self._memory -= self._cache.popitem(last=False)[1][2]
+            self._info['evictions'] += 1
+
+
 class TimeSeries:
     """
     Defines time series for all loads and generators in network (if set).
@@ -2142,6 +2744,14 @@ class TimeSeries:
     timeindex : :pandas:`pandas.DatetimeIndex<datetimeindex>`, optional
         Can be used to define a time range for which to obtain the provided
         time series and run power flow analysis. Default: None.
+    dtype : :numpy:`numpy.dtype<dtype>`, optional
+        Floating point type the time series are stored in. Default: type
+        set in `network` (see :py:attr:`~.grid.network.Network.dtype`) or
+        numpy.float64.
+    component_timeseries_cache_size : :obj:`int`, optional
+        Maximum memory in bytes used to cache time series of loads and
+        generators (see :class:`~.grid.network.ComponentTimeSeriesCache`).
+        None means memory is not limited. Default: 512 MB.
 
     See also
     --------
@@ -2153,17 +2763,29 @@ class TimeSeries:
 
     def __init__(self, network, **kwargs):
         self.network = network
-        self._generation_dispatchable = kwargs.get('generation_dispatchable',
-                                                   None)
-        self._generation_fluctuating = kwargs.get('generation_fluctuating',
-                                                  None)
-        self._generation_reactive_power = kwargs.get(
-            'generation_reactive_power', None)
-        self._load = kwargs.get('load', None)
-        self._load_reactive_power = kwargs.get('load_reacitve_power', None)
-        self._curtailment = kwargs.get('curtailment', None)
+        self._dtype = _check_dtype(
+            kwargs.get('dtype', getattr(network, 'dtype', np.float64)))
+        self._generation_dispatchable = self._astype(
+            kwargs.get('generation_dispatchable', None))
+        self._generation_fluctuating = self._astype(
+            kwargs.get('generation_fluctuating', None))
+        self._generation_reactive_power = self._astype(kwargs.get(
+            'generation_reactive_power', None))
+        self._load = self._astype(kwargs.get('load', None))
+        self._load_reactive_power = self._astype(
+            kwargs.get('load_reacitve_power', None))
+        self._curtailment = self._astype(kwargs.get('curtailment', None))
         self._timeindex = kwargs.get('timeindex', None)
         self._timesteps_load_feedin_case = None
+        self._timesteps_load_feedin_case_cache_info = {'hits': 0,
+                                                       'misses': 0}
+        self._versions = dict.fromkeys(
+            ['generation_dispatchable', 'generation_fluctuating',
+             'generation_reactive_power', 'load', 'load_reactive_power',
+             'curtailment', 'timeindex'], 0)
+        self._component_timeseries_cache = ComponentTimeSeriesCache(
+            max_memory=kwargs.get('component_timeseries_cache_size',
+                                  ComponentTimeSeriesCache.DEFAULT_MAX_MEMORY))
 
     @property
     def generation_dispatchable(self):
@@ -2184,7 +2806,9 @@ class TimeSeries:
 
     @generation_dispatchable.setter
     def generation_dispatchable(self, generation_dispatchable_timeseries):
-        self._generation_dispatchable = generation_dispatchable_timeseries
+        self._generation_dispatchable = self._astype(generation_dispatchable_timeseries)
+        self._bump_version('generation_dispatchable')
+        self.reset_timesteps_load_feedin_case()
 
     @property
     def generation_fluctuating(self):
@@ -2205,7 +2829,9 @@ class TimeSeries:
 
     @generation_fluctuating.setter
     def generation_fluctuating(self, generation_fluc_timeseries):
-        self._generation_fluctuating = generation_fluc_timeseries
+        self._generation_fluctuating = self._astype(generation_fluc_timeseries)
+        self._bump_version('generation_fluctuating')
+        self.reset_timesteps_load_feedin_case()
 
     @property
     def generation_reactive_power(self):
@@ -2226,7 +2852,9 @@ class TimeSeries:
 
     @generation_reactive_power.setter
     def generation_reactive_power(self, generation_reactive_power_timeseries):
-        self._generation_reactive_power = generation_reactive_power_timeseries
+        self._generation_reactive_power = self._astype(generation_reactive_power_timeseries)
+        self._bump_version('generation_reactive_power')
+        self.reset_timesteps_load_feedin_case()
 
     @property
     def load(self):
@@ -2246,7 +2874,9 @@ class TimeSeries:
 
     @load.setter
     def load(self, load_timeseries):
-        self._load = load_timeseries
+        self._load = self._astype(load_timeseries)
+        self._bump_version('load')
+        self.reset_timesteps_load_feedin_case()
 
     @property
     def load_reactive_power(self):
@@ -2267,7 +2897,9 @@ class TimeSeries:
 
     @load_reactive_power.setter
     def load_reactive_power(self, load_reactive_power_timeseries):
-        self._load_reactive_power = load_reactive_power_timeseries
+        self._load_reactive_power = self._astype(load_reactive_power_timeseries)
+        self._bump_version('load_reactive_power')
+        self.reset_timesteps_load_feedin_case()
 
     @property
     def timeindex(self):
@@ -2285,6 +2917,12 @@ class TimeSeries:
         """
         return self._timeindex
 
+    @timeindex.setter
+    def timeindex(self, time_range):
+        self._timeindex = time_range
+        self._bump_version('timeindex')
+        self.reset_timesteps_load_feedin_case()
+
     @property
     def curtailment(self):
         """
@@ -2330,7 +2968,9 @@ class TimeSeries:
 
     @curtailment.setter
     def curtailment(self, curtailment):
-        self._curtailment = curtailment
+        self._curtailment = self._astype(curtailment)
+        self._bump_version('curtailment')
+        self.reset_timesteps_load_feedin_case()
 
     @property
     def timesteps_load_feedin_case(self):
@@ -2367,8 +3007,855 @@ class TimeSeries:
             HV/MV substation and 'case' with 'load_case' for positive residual
             load and 'feedin_case' for negative residual load.
 
+        Notes
+        -----
+        The dataframe is only calculated on first access and then cached
+        until it is reset by :meth:`reset_timesteps_load_feedin_case`, which
+        happens whenever load, generation, storage or curtailment time series
+        are changed.
+
+        """
+        if self._timesteps_load_feedin_case is None:
+            self._timesteps_load_feedin_case_cache_info['misses'] += 1
+            self._timesteps_load_feedin_case = \
+                tools.assign_load_feedin_case(self.network)
+        else:
+            self._timesteps_load_feedin_case_cache_info['hits'] += 1
+        return self._timesteps_load_feedin_case
+
+    @property
+    def timesteps_load_feedin_case_cache_info(self):
+        """
+        Number of cache hits and misses of
+        :py:attr:`~timesteps_load_feedin_case`.
+
+        Returns
+        -------
+        :obj:`dict`
+            Dictionary with keys 'hits' and 'misses'. A miss means the load
+            and feed-in case had to be (re)calculated.
+
+        """
+        return dict(self._timesteps_load_feedin_case_cache_info)
+
+    def reset_timesteps_load_feedin_case(self):
+        """
+        Resets cached :py:attr:`~timesteps_load_feedin_case`.
+
+        Needs to be called whenever load, generation, storage or curtailment
+        time series change so that the load and feed-in case is recalculated
+        on next access.
+
+        """
+        self._timesteps_load_feedin_case = None
+
+    @property
+    def dtype(self):
+        """
+        Floating point type the time series are stored in.
+
+        Usually set through :py:attr:`~.grid.network.Network.dtype`. Setting
+        it converts all time series given as dataframes.
+
+        Parameters
+        ----------
+        dtype : :numpy:`numpy.dtype<dtype>`
+            numpy.float64 or numpy.float32.
+
+        Returns
+        -------
+        :numpy:`numpy.dtype<dtype>`
+            Floating point type of the time series.
+
+        """
+        return self._dtype
+
+    @dtype.setter
+    def dtype(self, dtype):
+        dtype = _check_dtype(dtype)
+        if dtype == self._dtype:
+            return
+        self._dtype = dtype
+        for name in ['generation_dispatchable', 'generation_fluctuating',
+                     'generation_reactive_power', 'load',
+                     'load_reactive_power', 'curtailment']:
+            setattr(self, name, getattr(self, '_{}'.format(name)))
+
+    def _astype(self, ts):
+        """
+        Converts time series given as dataframe to :py:attr:`~dtype`.
+
+        """
+        if isinstance(ts, pd.DataFrame) and \
+                (ts.dtypes != self._dtype).any():
+            return ts.astype(self._dtype)
+        return ts
+
+    def _bump_version(self, name):
+        """
+        Increases version of the given time series attribute.
+
+        Component time series derived from the attribute are recalculated
+        on next access.
+
+        """
+        self._versions[name] += 1
+
+    def versions(self, names):
+        """
+        Versions of the given time series attributes.
+
+        The version of an attribute is increased every time the attribute is
+        set. Component time series cached in
+        :py:attr:`~component_timeseries_cache` are stamped with the versions
+        of the attributes they are derived from.
+
+        Parameters
+        ----------
+        names : :obj:`list` of :obj:`str`
+            Names of time series attributes, e.g. 'load' or 'curtailment'.
+
+        Returns
+        -------
+        :obj:`tuple`
+            Versions of the time series attributes.
+
+        """
+        return tuple(self._versions[_] for _ in names)
+
+    def memory_map(self, directory):
+        """
+        Stores normalized time series in memory-mapped files.
+
+        Values of the generation, load, reactive power and curtailment time
+        series given as dataframes are written to files in `directory` and
+        only read from there for the requested time steps instead of being
+        held in memory for the whole time index. This is meant for long
+        time series in combination with the analysis of time windows (see
+        `window` parameter of :meth:`~.grid.network.EDisGo.analyze` and
+        :meth:`~.grid.network.EDisGo.reinforce`).
+
+        Parameters
+        ----------
+        directory : :obj:`str`
+            Directory to store the memory-mapped files in. It is created if
+            it does not exist. Existing files are overwritten.
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in ['generation_dispatchable', 'generation_fluctuating',
+                     'generation_reactive_power', 'load',
+                     'load_reactive_power', 'curtailment']:
+            ts = getattr(self, '_{}'.format(name))
+            if isinstance(ts, pd.DataFrame):
+                setattr(self, name, tools.memmap_dataframe(
+                    ts, os.path.join(directory, '{}.dat'.format(name)),
+                    dtype=self._dtype))
+
+    @property
+    def component_timeseries_cache(self):
+        """
+        Cache of time series of loads and generators.
+
+        Returns
+        -------
+        :class:`~.grid.network.ComponentTimeSeriesCache`
+            Least recently used cache of component time series. Use its
+            `max_memory` attribute to change the memory cap.
+
+        """
+        return self._component_timeseries_cache
+
+    def components_timeseries(self, components, timesteps=None, dtype=None):
+        """
+        Active and reactive power time series of several components.
+
+        Instead of building the time series component by component through
+        the `timeseries` getters, time series of loads and generators whose
+        time series are derived from the normalized time series in this
+        object are calculated in one step as matrix of all components and
+        time steps. Therefore, annual consumption, nominal capacity, type,
+        weather cell ID, power factor and sign of the reactive power of all
+        components are gathered first and the normalized time series are
+        scaled with them at once.
+        Components with own time series (e.g. storages or components with
+        time series set explicitly) or with reactive power time series are
+        retrieved from their `timeseries` getter.
+
+        Parameters
+        ----------
+        components : :obj:`list`
+            List of loads, generators and storages
+            (:class:`~.grid.components.Load`,
+            :class:`~.grid.components.Generator`,
+            :class:`~.grid.components.GeneratorFluctuating`,
+            :class:`~.grid.components.Storage`).
+        timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>` or :pandas:`pandas.Timestamp<timestamp>`
+            Time steps to return time series for. Default: None, in which
+            case :py:attr:`~timeindex` is used.
+        dtype : :numpy:`numpy.dtype<dtype>`
+            Floating point type of the returned time series. Default: None,
+            in which case :py:attr:`~dtype` is used.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>`
+            Active power time series in kW. Index of the dataframe are the
+            time steps, columns are the representatives of the components.
+        :pandas:`pandas.DataFrame<dataframe>`
+            Reactive power time series in kvar. Index and columns are the same
+            as for the active power.
+
+        """
+        if timesteps is None:
+            timesteps = self.timeindex
+        if not hasattr(timesteps, '__len__'):
+            timesteps = [timesteps]
+        timesteps = pd.DatetimeIndex(timesteps)
+
+        if dtype is None:
+            dtype = self._dtype
+        p = np.zeros((len(timesteps), len(components)), dtype=dtype)
+        q_factor = np.zeros(len(components), dtype=dtype)
+        loads = []
+        generators_dispatchable = []
+        generators_fluctuating = []
+        others = []
+        for position, comp in enumerate(components):
+            if getattr(comp, '_timeseries', None) is not None:
+                others.append(position)
+            elif isinstance(comp, Load):
+                if comp._timeseries_reactive is None and \
+                        self.load_reactive_power is None:
+                    loads.append(position)
+                else:
+                    others.append(position)
+            elif isinstance(comp, Generator):
+                if comp._timeseries_reactive is None and \
+                        self.generation_reactive_power is None:
+                    if isinstance(comp, GeneratorFluctuating):
+                        generators_fluctuating.append(position)
+                    else:
+                        generators_dispatchable.append(position)
+                else:
+                    others.append(position)
+            else:
+                others.append(position)
+
+        if loads:
+            p[:, loads] = self._loads_active_power(
+                [components[_] for _ in loads], timesteps)
+        if generators_dispatchable:
+            p[:, generators_dispatchable] = \
+                self._generators_dispatchable_active_power(
+                    [components[_] for _ in generators_dispatchable],
+                    timesteps)
+        if generators_fluctuating:
+            p[:, generators_fluctuating] = \
+                self._generators_fluctuating_active_power(
+                    [components[_] for _ in generators_fluctuating],
+                    timesteps)
+        for position in loads + generators_dispatchable + \
+                generators_fluctuating:
+            comp = components[position]
+            q_factor[position] = comp.q_sign * np.tan(
+                np.arccos(comp.power_factor))
+        q = p * q_factor
+
+        for position in others:
+            ts = components[position].timeseries.loc[timesteps, :]
+            p[:, position] = ts['p'].values
+            q[:, position] = ts['q'].values
+
+        columns = [repr(_) for _ in components]
+        return (pd.DataFrame(p, index=timesteps, columns=columns),
+                pd.DataFrame(q, index=timesteps, columns=columns))
+
+    @staticmethod
+    def _column_positions(columns):
+        """
+        Mapping of column labels to their position.
+
+        """
+        return {col: position for position, col in enumerate(columns)}
+
+    def _loads_active_power(self, loads, timesteps):
+        """
+        Active power of loads in kW as array of time steps x loads.
+
+        The normalized load time series of all sectors are multiplied with a
+        matrix of annual consumption per sector and load.
+
+        """
+        load = self._load.loc[timesteps, :]
+        col_positions = self._column_positions(load.columns)
+        consumption = np.zeros((len(load.columns), len(loads)))
+        for position, comp in enumerate(loads):
+            if isinstance(comp.grid, MVGrid):
+                voltage_level = 'mv'
+            elif isinstance(comp.grid, LVGrid):
+                voltage_level = 'lv'
+            else:
+                voltage_level = None
+            for sector, annual_consumption in comp.consumption.items():
+                # check if load time series for MV and LV are differentiated
+                col = col_positions.get((sector, voltage_level),
+                                        col_positions.get(sector, None))
+                if col is None:
+                    message = "No timeseries for load of type {} " \
+                              "given.".format(sector)
+                    logger.error(message)
+                    raise KeyError(message)
+                consumption[col, position] += annual_consumption
+        return load.values.dot(consumption)
+
+    def _generators_dispatchable_active_power(self, generators, timesteps):
+        """
+        Active power of dispatchable generators in kW as array of time
+        steps x generators.
+
+        """
+        generation = self._generation_dispatchable.loc[timesteps, :]
+        col_positions = self._column_positions(generation.columns)
+        cols = []
+        for comp in generators:
+            col = col_positions.get(comp.type, col_positions.get('other'))
+            if col is None:
+                message = "No time series for type {} given.".format(
+                    comp.type)
+                logger.error(message)
+                raise KeyError(message)
+            cols.append(col)
+        capacity = np.array([_.nominal_capacity for _ in generators],
+                            dtype=float)
+        return generation.values[:, cols] * capacity
+
+    def _generators_fluctuating_active_power(self, generators, timesteps):
+        """
+        Active power of fluctuating generators in kW as array of time
+        steps x generators.
+
+        Curtailment given for single generators or in :py:attr:`curtailment`
+        per type (and weather cell) is subtracted.
+
+        """
+        generation = self._generation_fluctuating.loc[timesteps, :]
+        weather_cells = isinstance(generation.columns, pd.MultiIndex)
+        col_positions = self._column_positions(generation.columns)
+        cols = []
+        for comp in generators:
+            if weather_cells:
+                if not comp.weather_cell_id:
+                    message = "No weather cell ID provided for fluctuating " \
+                              "generator {}.".format(repr(comp))
+                    logger.error(message)
+                    raise KeyError(message)
+                col = col_positions.get((comp.type, comp.weather_cell_id))
+            else:
+                col = col_positions.get(comp.type)
+            if col is None:
+                message = "No time series for type {} and weather cell ID " \
+                          "{} given.".format(comp.type, comp.weather_cell_id)
+                logger.error(message)
+                raise KeyError(message)
+            cols.append(col)
+        capacity = np.array([_.nominal_capacity for _ in generators],
+                            dtype=float)
+        p = generation.values[:, cols] * capacity
+
+        # subtract curtailment
+        if isinstance(self._curtailment, pd.DataFrame):
+            curtailment = self._curtailment.reindex(timesteps).fillna(0)
+            curtailment_positions = self._column_positions(
+                curtailment.columns)
+        else:
+            curtailment = None
+        for position, comp in enumerate(generators):
+            if comp._curtailment is not None:
+                p[:, position] -= comp._curtailment.reindex(
+                    timesteps).fillna(0).values
+            elif curtailment is not None:
+                if isinstance(curtailment.columns, pd.MultiIndex):
+                    key = (comp.type, comp.weather_cell_id)
+                else:
+                    key = comp.type
+                if key not in curtailment_positions:
+                    message = "No curtailment time series for type {} and " \
+                              "weather cell ID {} given.".format(
+                        comp.type, comp.weather_cell_id)
+                    logger.error(message)
+                    raise KeyError(message)
+                p[:, position] -= \
+                    curtailment.values[:, curtailment_positions[key]]
+        return p
+
+
+class Limits:
+    """
+    Cache of allowed load of lines and stations and allowed voltage deviations
+
+    Allowed values are determined from the config sections
+    'grid_expansion_load_factors' and
+    'grid_expansion_allowed_voltage_deviations', line types and transformers
+    on first request and kept until they are reset. Entries of single lines
+    and stations are reset when type or quantity of a line or the
+    transformers of a station change. Use :meth:`reset` without a component
+    to reset all entries, e.g. after changing the configs.
+
+    Allowed voltages are the same for all nodes of a voltage level and only
+    depend on the load and feed-in case of each time step, so that they are
+    cached per voltage level instead of per node and are not affected by
+    changes of the grid topology. If MV and LV grids are not analyzed
+    combined, allowed voltages in LV grids depend on the voltage at the LV
+    station from the power flow results (see
+    :func:`~.flex_opt.check_tech_constraints.lv_voltage_deviation`) and are
+    therefore not cached.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+
+    """
+
+    def __init__(self, network):
+        self.network = network
+        self._lines = {}
+        self._stations = {}
+        self._voltage_bands = {}
+        self._voltage_limits = {}
+        self._voltage_limits_case = None
+
+    def reset(self, component=None):
+        """
+        Resets cached allowed values.
+
+        Parameters
+        ----------
+        component : :class:`~.grid.components.Line` or :class:`~.grid.components.Station`, optional
+            Line or station to reset allowed load for. If None all cached
+            values are reset. Default: None.
+
         """
-        return tools.assign_load_feedin_case(self.network)
+        if component is None:
+            self._lines = {}
+            self._stations = {}
+            self._voltage_bands = {}
+            self._voltage_limits = {}
+            self._voltage_limits_case = None
+        else:
+            self._lines.pop(component, None)
+            self._stations.pop(component, None)
+
+    def allowed_line_load(self, line):
+        """
+        Maximum allowed current of line in feed-in and load case.
+
+        Parameters
+        ----------
+        line : :class:`~.grid.components.Line`
+
+        Returns
+        -------
+        :obj:`tuple`
+            Maximum allowed current in A in feed-in case and in load case.
+
+        """
+        try:
+            return self._lines[line]
+        except KeyError:
+            load_factors = self.network.config['grid_expansion_load_factors']
+            if isinstance(line.grid, LVGrid):
+                grid_level = 'lv'
+            else:
+                grid_level = 'mv'
+            i_line_max = line.type['I_max_th'] * line.quantity
+            self._lines[line] = (
+                i_line_max * load_factors[
+                    '{}_feedin_case_line'.format(grid_level)],
+                i_line_max * load_factors[
+                    '{}_load_case_line'.format(grid_level)])
+            return self._lines[line]
+
+    def allowed_station_load(self, station):
+        """
+        Nominal apparent power and load factors of station.
+
+        Maximum allowed apparent power of the station is the nominal apparent
+        power times the load factor of the respective case.
+
+        Parameters
+        ----------
+        station : :class:`~.grid.components.LVStation` or :class:`~.grid.components.MVStation`
+
+        Returns
+        -------
+        :obj:`tuple`
+            Nominal apparent power of all transformers of the station in kVA,
+            load factor in feed-in case and load factor in load case.
+
+        """
+        try:
+            return self._stations[station]
+        except KeyError:
+            load_factors = self.network.config['grid_expansion_load_factors']
+            if isinstance(station, LVStation):
+                grid_level = 'lv'
+            else:
+                grid_level = 'mv'
+            self._stations[station] = (
+                sum([_.type.S_nom for _ in station.transformers]),
+                load_factors['{}_feedin_case_transformer'.format(grid_level)],
+                load_factors['{}_load_case_transformer'.format(grid_level)])
+            return self._stations[station]
+
+    def voltage_band(self, voltage_levels):
+        """
+        Allowed upper and lower voltage in feed-in and load case.
+
+        Parameters
+        ----------
+        voltage_levels : :obj:`str`
+            Specifies which allowed voltage deviations to use. Possible
+            options are 'mv_lv' for combined analysis of MV and LV grid and
+            'mv' for the MV grid. See
+            :func:`~.flex_opt.check_tech_constraints.mv_voltage_deviation`
+            for more information.
+
+        Returns
+        -------
+        :obj:`dict`
+            Dictionary with allowed voltage in p.u. with keys
+            'feedin_case_upper', 'feedin_case_lower', 'load_case_upper' and
+            'load_case_lower'.
+
+        """
+        try:
+            return self._voltage_bands[voltage_levels]
+        except KeyError:
+            config = self.network.config[
+                'grid_expansion_allowed_voltage_deviations']
+            if voltage_levels not in ['mv_lv', 'mv']:
+                raise ValueError(
+                    'Specified mode {} is not a valid option.'.format(
+                        voltage_levels))
+            offset = config['hv_mv_trafo_offset']
+            control_deviation = config['hv_mv_trafo_control_deviation']
+            self._voltage_bands[voltage_levels] = {
+                'feedin_case_lower': 0.9,
+                'load_case_upper': 1.1,
+                'feedin_case_upper':
+                    1 + offset + control_deviation + config[
+                        '{}_feedin_case_max_v_deviation'.format(
+                            voltage_levels)],
+                'load_case_lower':
+                    1 + offset - control_deviation - config[
+                        '{}_load_case_max_v_deviation'.format(
+                            voltage_levels)]}
+            return self._voltage_bands[voltage_levels]
+
+    def voltage_deviation_from_station(self, mode=None):
+        """
+        Allowed voltage deviation in LV grids from voltage at LV station.
+
+        Parameters
+        ----------
+        mode : None or :obj:`str`
+            If None allowed deviation of nodes in LV grid from voltage at
+            secondary side of LV station is returned. If mode is set to
+            'stations' allowed deviation of secondary side of LV station from
+            primary side is returned. Default: None.
+
+        Returns
+        -------
+        :obj:`tuple`
+            Allowed voltage rise in p.u. in feed-in case and allowed voltage
+            drop in p.u. in load case.
+
+        """
+        config = self.network.config[
+            'grid_expansion_allowed_voltage_deviations']
+        if mode == 'stations':
+            return (config['mv_lv_station_feedin_case_max_v_deviation'],
+                    config['mv_lv_station_load_case_max_v_deviation'])
+        else:
+            return (config['lv_feedin_case_max_v_deviation'],
+                    config['lv_load_case_max_v_deviation'])
+
+    def voltage_limits(self, voltage_levels):
+        """
+        Allowed upper and lower voltage in each time step.
+
+        Limits are cached until the load and feed-in case of the time steps
+        (see :attr:`~.grid.network.TimeSeries.timesteps_load_feedin_case`)
+        changes.
+
+        Parameters
+        ----------
+        voltage_levels : :obj:`str`
+            See :meth:`voltage_band`.
+
+        Returns
+        -------
+        :pandas:`pandas.Series<series>`
+            Allowed upper voltage in p.u. in each time step.
+        :pandas:`pandas.Series<series>`
+            Allowed lower voltage in p.u. in each time step.
+
+        """
+        case = self.network.timeseries.timesteps_load_feedin_case.case
+        if case is not self._voltage_limits_case:
+            self._voltage_limits = {}
+            self._voltage_limits_case = case
+        try:
+            return self._voltage_limits[voltage_levels]
+        except KeyError:
+            band = self.voltage_band(voltage_levels)
+            feedin_case = (case == 'feedin_case').values
+            self._voltage_limits[voltage_levels] = (
+                pd.Series(np.where(feedin_case, band['feedin_case_upper'],
+                                   band['load_case_upper']),
+                          index=case.index),
+                pd.Series(np.where(feedin_case, band['feedin_case_lower'],
+                                   band['load_case_lower']),
+                          index=case.index))
+            return self._voltage_limits[voltage_levels]
+
+
+class EquipmentChanges:
+    """
+    Append-only log of equipment changes
+
+    Changes are stored column-wise in lists together with the positions of
+    the changes of each iteration step and of each kind of equipment, so
+    that the changes of one iteration step or kind of equipment can be
+    obtained without scanning all changes. The dataframe described in
+    :attr:`~.grid.network.Results.equipment_changes` is only set up on
+    request and kept until the next change.
+
+    Kinds of equipment are 'line' for changes of lines, 'transformer' for
+    added or removed transformers and 'other' for all other changes.
+
+    """
+
+    columns = ['iteration_step', 'change', 'equipment', 'quantity']
+
+    def __init__(self):
+        self._component = []
+        self._iteration_step = []
+        self._change = []
+        self._equipment = []
+        self._quantity = []
+        self._kind = []
+        self._dropped = []
+        self._positions_iteration_step = {}
+        self._positions_kind = {}
+        self._dataframe = None
+
+    def __len__(self):
+        return len(self._component) - sum(self._dropped)
+
+    @staticmethod
+    def _get_kind(component, equipment):
+        if isinstance(equipment, Transformer):
+            return 'transformer'
+        elif isinstance(component, Line):
+            return 'line'
+        else:
+            return 'other'
+
+    def append(self, component, iteration_step, change, equipment,
+               quantity=1):
+        """
+        Adds a change.
+
+        Parameters
+        ----------
+        component : :class:`~.grid.components.Component`
+            Changed component, e.g. the line or station.
+        iteration_step : :obj:`int`
+            Iteration step of grid reinforcement the change was made in. 0
+            for changes made outside of grid reinforcement, e.g. when new
+            generators are connected.
+        change : :obj:`str`
+            Specifies if something was 'added', 'removed' or 'changed'.
+        equipment : :obj:`str` or :class:`~.grid.components.Transformer`
+            Added or removed equipment, e.g. the transformer or the name of
+            the line type.
+        quantity : :obj:`int`
+            Number of components added or removed. Default: 1.
+
+        """
+        position = len(self._component)
+        kind = self._get_kind(component, equipment)
+        self._component.append(component)
+        self._iteration_step.append(iteration_step)
+        self._change.append(change)
+        self._equipment.append(equipment)
+        self._quantity.append(quantity)
+        self._kind.append(kind)
+        self._dropped.append(False)
+        self._positions_iteration_step.setdefault(
+            iteration_step, []).append(position)
+        self._positions_kind.setdefault(kind, []).append(position)
+        self._dataframe = None
+
+    def extend(self, components, iteration_step, change, equipment,
+               quantity):
+        """
+        Adds several changes of the same iteration step and kind of change.
+
+        Parameters
+        ----------
+        components : :obj:`list`
+            Changed components.
+        iteration_step : :obj:`int`
+            See :meth:`append`.
+        change : :obj:`str`
+            See :meth:`append`.
+        equipment : :obj:`list`
+            Added or removed equipment of each change. See :meth:`append`.
+        quantity : :obj:`list`
+            Number of components added or removed in each change.
+
+        """
+        for component, e, q in zip(components, equipment, quantity):
+            self.append(component, iteration_step, change, e, q)
+
+    def drop(self, component):
+        """
+        Removes all changes of a component.
+
+        Parameters
+        ----------
+        component : :class:`~.grid.components.Component`
+
+        """
+        for position, c in enumerate(self._component):
+            if c is component and not self._dropped[position]:
+                self._dropped[position] = True
+                self._dataframe = None
+
+    @property
+    def last_iteration_step(self):
+        """
+        Latest iteration step changes were made in.
+
+        Returns
+        -------
+        :obj:`int`
+            Latest iteration step or 0 if no changes were made in grid
+            reinforcement.
+
+        """
+        return max(self._positions_iteration_step.keys(), default=0)
+
+    def __contains__(self, component):
+        return any([c is component and not d
+                    for c, d in zip(self._component, self._dropped)])
+
+    def _positions(self, iteration_step=None, kind=None,
+                   min_iteration_step=None):
+        if iteration_step is not None:
+            positions = self._positions_iteration_step.get(iteration_step, [])
+        elif min_iteration_step is not None:
+            positions = sorted(
+                [p for step, positions_step in
+                 self._positions_iteration_step.items()
+                 if step >= min_iteration_step for p in positions_step])
+        else:
+            positions = None
+        if kind is not None:
+            positions_kind = self._positions_kind.get(kind, [])
+            if positions is None:
+                positions = positions_kind
+            else:
+                positions_kind = set(positions_kind)
+                positions = [p for p in positions if p in positions_kind]
+        if positions is None:
+            positions = range(len(self._component))
+        return [p for p in positions if not self._dropped[p]]
+
+    def _to_dataframe(self, positions):
+        if not positions:
+            return pd.DataFrame(columns=self.columns)
+        return pd.DataFrame(
+            {'iteration_step': [self._iteration_step[_] for _ in positions],
+             'change': [self._change[_] for _ in positions],
+             'equipment': [self._equipment[_] for _ in positions],
+             'quantity': [self._quantity[_] for _ in positions]},
+            index=[self._component[_] for _ in positions],
+            columns=self.columns)
+
+    def select(self, iteration_step=None, kind=None, min_iteration_step=None):
+        """
+        Dataframe with selected changes.
+
+        Parameters
+        ----------
+        iteration_step : :obj:`int`, optional
+            Only return changes of this iteration step. Default: None.
+        kind : :obj:`str`, optional
+            Only return changes of this kind of equipment ('line',
+            'transformer' or 'other'). Default: None.
+        min_iteration_step : :obj:`int`, optional
+            Only return changes of this and later iteration steps. Not
+            considered if `iteration_step` is given. Default: None.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>`
+            Selected changes in the format described in
+            :attr:`~.grid.network.Results.equipment_changes`.
+
+        """
+        return self._to_dataframe(self._positions(
+            iteration_step=iteration_step, kind=kind,
+            min_iteration_step=min_iteration_step))
+
+    def to_dataframe(self):
+        """
+        Dataframe with all changes.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>`
+            All changes in the format described in
+            :attr:`~.grid.network.Results.equipment_changes`. Empty dataframe
+            without columns if there are no changes.
+
+        """
+        if self._dataframe is None:
+            if not len(self):
+                self._dataframe = pd.DataFrame()
+            else:
+                self._dataframe = self._to_dataframe(self._positions())
+        return self._dataframe
+
+    @classmethod
+    def from_dataframe(cls, changes):
+        """
+        Sets up log from dataframe with equipment changes.
+
+        Parameters
+        ----------
+        changes : :pandas:`pandas.DataFrame<dataframe>`
+            Equipment changes in the format described in
+            :attr:`~.grid.network.Results.equipment_changes`.
+
+        Returns
+        -------
+        :class:`~.grid.network.EquipmentChanges`
+
+        """
+        equipment_changes = cls()
+        if changes is None or changes.empty:
+            return equipment_changes
+        for component, iteration_step, change, equipment, quantity in zip(
+                changes.index, changes['iteration_step'], changes['change'],
+                changes['equipment'], changes['quantity']):
+            equipment_changes.append(component, iteration_step, change,
+                                     equipment, quantity)
+        return equipment_changes
 
 
 class Results:
@@ -2385,6 +3872,12 @@ class Results:
 
     """
 
+    # results of power flow analysis set in
+    # :func:`~.tools.pypsa_io.process_pfa_results`
+    power_flow_results = ['pfa_p', 'pfa_q', 'pfa_v_mag_pu', 'i_res',
+                          'grid_losses', 'hv_mv_exchanges',
+                          'pfa_approximated', 'pfa_not_converged']
+
     def __init__(self, network):
         self.network = network
         self._measures = ['original']
@@ -2392,10 +3885,12 @@ class Results:
         self._pfa_q = None
         self._pfa_v_mag_pu = None
         self._i_res = None
-        self._equipment_changes = pd.DataFrame()
+        self._equipment_changes = EquipmentChanges()
         self._grid_expansion_costs = None
         self._grid_losses = None
         self._hv_mv_exchanges = None
+        self._pfa_approximated = None
+        self._pfa_not_converged = None
         self._curtailment = None
         self._storage_integration = None
         self._unresolved_issues = {}
@@ -2575,8 +4070,11 @@ class Results:
             Specifies if something was added or removed.
 
         iteration_step : :obj:`int`
-            Used for the update of the pypsa network to only consider changes
-            since the last power flow analysis.
+            Iteration step of grid reinforcement the change was made in, 0
+            for changes made outside of grid reinforcement. Iteration steps
+            are numbered on across several calls of grid reinforcement, i.e.
+            a call of grid reinforcement starts with the iteration step
+            following the last iteration step in this dataframe.
 
         quantity : :obj:`int`
             Number of components added or removed. Only relevant for
@@ -2594,12 +4092,32 @@ class Results:
         :pandas:`pandas.DataFrame<dataframe>`
             Equipment changes
 
+        Notes
+        -----
+        Changes are stored in :attr:`equipment_change_log` and the dataframe
+        is set up from it on request. Add changes to the log instead of
+        setting a new dataframe.
+
         """
-        return self._equipment_changes
+        return self._equipment_changes.to_dataframe()
 
     @equipment_changes.setter
     def equipment_changes(self, changes):
-        self._equipment_changes = changes
+        self._equipment_changes = EquipmentChanges.from_dataframe(changes)
+
+    @property
+    def equipment_change_log(self):
+        """
+        Append-only log of changes in the equipment
+
+        Returns
+        -------
+        :class:`~.grid.network.EquipmentChanges`
+            Log of equipment changes. See :attr:`equipment_changes` for the
+            tracked information.
+
+        """
+        return self._equipment_changes
 
     @property
     def grid_expansion_costs(self):
@@ -2732,6 +4250,64 @@ class Results:
     def hv_mv_exchanges(self, hv_mv_exchanges):
         self._hv_mv_exchanges = hv_mv_exchanges
 
+    @property
+    def pfa_approximated(self):
+        """
+        Time steps with approximate power flow results.
+
+        Power flow results of time steps not close to any limit remain
+        approximate if :meth:`~.grid.network.EDisGo.analyze` is called with
+        `screening_margin`.
+
+        Parameters
+        ----------
+        pfa_approximated : :pandas:`pandas.Series<series>`
+            Series with time steps of the power flow analysis as index and
+            True for time steps with approximate results.
+
+        Returns
+        -------
+        :pandas:`pandas.Series<series>`
+            True for time steps with approximate results, False for time steps
+            with results of a non-linear power flow analysis.
+
+        """
+        return self._pfa_approximated
+
+    @pfa_approximated.setter
+    def pfa_approximated(self, pfa_approximated):
+        self._pfa_approximated = pfa_approximated
+
+    @property
+    def pfa_not_converged(self):
+        """
+        Time steps the power flow analysis did not converge for.
+
+        Time steps are only recorded if
+        :meth:`~.grid.network.EDisGo.analyze` is called with
+        `non_convergence` 'record' or 'bisect'. Power flow results of these
+        time steps are not contained in the other power flow results.
+
+        Parameters
+        ----------
+        pfa_not_converged : :pandas:`pandas.DataFrame<dataframe>`
+            DataFrame with time steps that did not converge as index and
+            column 'load_scaling' holding the largest scaling of all loads
+            and generators the time step converges with, if determined.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>`
+            Time steps that did not converge. Column 'load_scaling' is NaN
+            unless `non_convergence` is 'bisect'.
+
+        """
+        return self._pfa_not_converged
+
+    @pfa_not_converged.setter
+    def pfa_not_converged(self, pfa_not_converged):
+        self._pfa_not_converged = pfa_not_converged
+
     @property
     def curtailment(self):
         """
@@ -3001,7 +4577,7 @@ class Results:
                 nodes=not_included))
             return self.pfa_v_mag_pu[level][labels_included]
 
-    def save(self, directory, parameters='all'):
+    def save(self, directory, parameters='all', append=False):
         """
         Saves results to disk.
 
@@ -3075,40 +4651,61 @@ class Results:
             * 'curtailment_results'
             * 'storage_integration_results'
 
+        append : :obj:`bool`
+            If True, power flow results are appended to existing power flow
+            results in `directory`, e.g. to save results of successive time
+            windows. Other results are overwritten. Default: False.
+
         """
+        def _to_csv(df, filename):
+            if append and os.path.isfile(filename):
+                df.to_csv(filename, mode='a', header=False)
+            else:
+                df.to_csv(filename)
+
         def _save_power_flow_results(target_dir):
             if self.pfa_v_mag_pu is not None:
                 # create directory
                 os.makedirs(target_dir, exist_ok=True)
 
                 # voltage
-                self.pfa_v_mag_pu.to_csv(
-                    os.path.join(target_dir, 'voltages_pu.csv'))
+                _to_csv(self.pfa_v_mag_pu,
+                        os.path.join(target_dir, 'voltages_pu.csv'))
 
                 # current
-                self.i_res.to_csv(
-                    os.path.join(target_dir, 'currents.csv'))
+                _to_csv(self.i_res,
+                        os.path.join(target_dir, 'currents.csv'))
 
                 # active power
-                self.pfa_p.to_csv(
-                    os.path.join(target_dir, 'active_powers.csv'))
+                _to_csv(self.pfa_p,
+                        os.path.join(target_dir, 'active_powers.csv'))
 
                 # reactive power
-                self.pfa_q.to_csv(
-                    os.path.join(target_dir, 'reactive_powers.csv'))
+                _to_csv(self.pfa_q,
+                        os.path.join(target_dir, 'reactive_powers.csv'))
 
                 # apparent power
-                self.s_res().to_csv(
-                    os.path.join(target_dir, 'apparent_powers.csv'))
+                _to_csv(self.s_res(),
+                        os.path.join(target_dir, 'apparent_powers.csv'))
 
                 # grid losses
-                self.grid_losses.to_csv(
-                    os.path.join(target_dir, 'grid_losses.csv'))
+                _to_csv(self.grid_losses,
+                        os.path.join(target_dir, 'grid_losses.csv'))
 
                 # grid exchanges
-                self.hv_mv_exchanges.to_csv(os.path.join(
+                _to_csv(self.hv_mv_exchanges, os.path.join(
                     target_dir, 'hv_mv_exchanges.csv'))
 
+                # time steps with approximate results
+                if self.pfa_approximated is not None:
+                    _to_csv(self.pfa_approximated.to_frame('approximated'),
+                            os.path.join(target_dir, 'approximated.csv'))
+
+                # time steps the power flow analysis did not converge for
+                if self.pfa_not_converged is not None:
+                    _to_csv(self.pfa_not_converged,
+                            os.path.join(target_dir, 'not_converged.csv'))
+
         def _save_pypsa_network(target_dir):
             if self.network.pypsa:
                 # create directory
@@ -3307,6 +4904,24 @@ class ResultsReimport:
                 os.path.join(
                     results_path, 'powerflow_results', 'hv_mv_exchanges.csv'),
                 index_col=0, parse_dates=True)
+            # time steps with approximate results
+            if os.path.isfile(os.path.join(
+                    results_path, 'powerflow_results', 'approximated.csv')):
+                self.pfa_approximated = pd.read_csv(
+                    os.path.join(results_path, 'powerflow_results',
+                                 'approximated.csv'),
+                    index_col=0, parse_dates=True)['approximated']
+            else:
+                self.pfa_approximated = None
+            # time steps the power flow analysis did not converge for
+            if os.path.isfile(os.path.join(
+                    results_path, 'powerflow_results', 'not_converged.csv')):
+                self.pfa_not_converged = pd.read_csv(
+                    os.path.join(results_path, 'powerflow_results',
+                                 'not_converged.csv'),
+                    index_col=0, parse_dates=True)
+            else:
+                self.pfa_not_converged = None
         else:
             self.i_res = None
             self.pfa_v_mag_pu = None
@@ -3315,6 +4930,8 @@ class ResultsReimport:
             self.apparent_power = None
             self.grid_losses = None
             self.hv_mv_exchanges = None
+            self.pfa_approximated = None
+            self.pfa_not_converged = None
 
         # import grid expansion results
         if 'grid_expansion_results' in parameters and os.path.isdir(
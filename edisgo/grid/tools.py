@@ -564,4 +564,5 @@ def disconnect_storage(network, storage):
     neighbor = list(storage.grid.graph.neighbors(storage))[0]
     storage.grid.graph.remove_edge(storage, neighbor)
     # delete storage
-    storage.grid.graph.remove_node(storage)
\ No newline at end of file
+    storage.grid.graph.remove_node(storage)
+    network.timeseries.reset_timesteps_load_feedin_case()
\ No newline at end of file
@@ -0,0 +1,1020 @@
+"""
+This module provides power flow solvers working on the PyPSA representation
+of the grid as alternatives to the Newton-Raphson power flow of PyPSA. Call
+:func:`sweep_pf` to conduct a power flow analysis of the radial grid by
+backward/forward sweep and :func:`zbus_pf` to conduct a power flow analysis
+of all time steps at once with the factorized admittance matrix.
+
+Solvers write their results to the same attributes of the PyPSA network as
+:meth:`pypsa.Network.pf` does, so that results are processed by
+:func:`~.tools.pypsa_io.process_pfa_results` regardless of the solver.
+"""
+
+import numpy as np
+import pandas as pd
+from collections import deque
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import splu
+import logging
+
+logger = logging.getLogger('edisgo')
+
+
+class PowerFlowGrid:
+    """
+    Buses and branches of the PyPSA representation of the grid.
+
+    Lines and transformers are modelled by their series impedance.
+    Impedances are given in per unit with a base apparent power of 1 MVA and
+    the nominal voltage of the buses as base voltage.
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+        PyPSA representation of the grid topology.
+
+    Attributes
+    ----------
+    buses : :pandas:`pandas.Index<index>`
+        Names of all buses.
+    slack : :obj:`int`
+        Position of the slack bus in `buses`.
+    branches : :pandas:`pandas.DataFrame<dataframe>`
+        Lines and transformers with their component type and names as index
+        and columns 'bus0', 'bus1' (positions of the buses) and 'z'
+        (impedance in p.u.).
+
+    """
+
+    def __init__(self, pypsa):
+        self.buses = pypsa.buses.index
+        bus_position = pd.Series(np.arange(len(self.buses)),
+                                 index=self.buses)
+
+        slack_buses = pypsa.generators.loc[
+            pypsa.generators['control'] == 'Slack', 'bus']
+        if len(slack_buses) != 1:
+            logger.error('Power flow analysis needs exactly one slack bus but '
+                         'found {}.'.format(len(slack_buses)))
+            raise ValueError('Power flow analysis needs exactly one slack '
+                             'bus.')
+        self.slack = bus_position[slack_buses.iloc[0]]
+
+        lines = pypsa.lines
+        transformers = pypsa.transformers
+        v_nom = pypsa.buses['v_nom'].loc[lines['bus0']].values
+        self.branches = pd.DataFrame(
+            {'bus0': np.concatenate(
+                [bus_position.loc[lines['bus0']].values,
+                 bus_position.loc[transformers['bus0']].values]).astype(int),
+             'bus1': np.concatenate(
+                 [bus_position.loc[lines['bus1']].values,
+                  bus_position.loc[transformers['bus1']].values]).astype(int),
+             'z': np.concatenate(
+                 [(lines['r'].values + 1j * lines['x'].values) / v_nom ** 2,
+                  (transformers['r'].values + 1j * transformers['x'].values) /
+                  transformers['s_nom'].values])},
+            index=pd.MultiIndex.from_arrays(
+                [['Line'] * len(lines) + ['Transformer'] * len(transformers),
+                 lines.index.tolist() + transformers.index.tolist()]),
+            columns=['bus0', 'bus1', 'z'])
+
+    def has_topology_of(self, other):
+        """
+        Checks if buses, slack bus and branches equal the ones of `other`.
+
+        Parameters
+        ----------
+        other : :class:`PowerFlowGrid`
+
+        Returns
+        -------
+        :obj:`bool`
+
+        """
+        return (self.slack == other.slack and
+                self.buses.equals(other.buses) and
+                self.branches.index.equals(other.branches.index) and
+                all(np.array_equal(self.branches[_].values,
+                                   other.branches[_].values)
+                    for _ in ['bus0', 'bus1', 'z']))
+
+    def branch_flows(self, v):
+        """
+        Complex power flowing into each branch at bus0 and bus1.
+
+        Parameters
+        ----------
+        v : :numpy:`numpy.ndarray<ndarray>`
+            Complex voltage at each bus (rows) in each time step (columns) in
+            p.u.
+
+        Returns
+        -------
+        :numpy:`numpy.ndarray<ndarray>`, :numpy:`numpy.ndarray<ndarray>`
+            Complex power in p.u. flowing into each branch (rows) in each time
+            step (columns) at bus0 and at bus1.
+
+        """
+        v0 = v[self.branches['bus0'].values]
+        v1 = v[self.branches['bus1'].values]
+        i = np.conj((v0 - v1) / self.branches['z'].values[:, np.newaxis])
+        return v0 * i, -v1 * i
+
+
+class RadialGrid(PowerFlowGrid):
+    """
+    Tree structure of a radial grid in the PyPSA representation.
+
+    Buses are ordered breadth-first starting at the slack bus and grouped
+    by their distance to the slack bus, so that currents are summed up from
+    the end of the feeders to the slack bus and voltages are calculated from
+    the slack bus to the end of the feeders level by level for all buses of
+    one level and all time steps at once. Parallel branches between the same
+    buses, e.g. several transformers of one station, are merged into one
+    branch with their parallel impedance.
+
+    See :class:`PowerFlowGrid` for further parameters and attributes.
+
+    Attributes
+    ----------
+    parent : :numpy:`numpy.ndarray<ndarray>`
+        Position of the bus each bus is fed from. The slack bus is its own
+        parent.
+    z : :numpy:`numpy.ndarray<ndarray>`
+        Impedance in p.u. of the branch each bus is fed by. Zero for the
+        slack bus.
+    branch_node : :numpy:`numpy.ndarray<ndarray>`
+        Position of the bus each branch (in the order of `branches`) feeds.
+    branch_share : :numpy:`numpy.ndarray<ndarray>`
+        Share of the current flowing into the fed bus each branch (in the
+        order of `branches`) carries. One unless the branch has parallel
+        branches.
+    levels : :obj:`list`
+        Buses of each level (except for the slack bus) as tuples of
+        positions of the buses sorted by their parent bus, positions of the
+        parent buses, positions of the distinct parent buses and positions of
+        the first bus of each distinct parent bus.
+
+    """
+
+    def __init__(self, pypsa):
+        super().__init__(pypsa)
+        self._set_up_tree()
+
+    def _set_up_tree(self):
+        """
+        Orders buses breadth-first starting at the slack bus.
+
+        Raises ValueError if the grid contains a ring or isolated buses.
+
+        """
+        number_of_buses = len(self.buses)
+        # merge parallel branches between the same buses
+        bus_pairs = np.sort(
+            self.branches[['bus0', 'bus1']].values.astype(int), axis=1)
+        bus_pairs, group = np.unique(bus_pairs, axis=0, return_inverse=True)
+        group = group.ravel()
+        y = 1 / self.branches['z'].values
+        y_group = (
+            np.bincount(group, weights=y.real, minlength=len(bus_pairs)) +
+            1j * np.bincount(group, weights=y.imag, minlength=len(bus_pairs)))
+        adjacent = [[] for _ in range(number_of_buses)]
+        for branch, (u, v) in enumerate(bus_pairs):
+            adjacent[u].append((v, branch))
+            adjacent[v].append((u, branch))
+
+        parent = np.full(number_of_buses, -1, dtype=int)
+        feeding_branch = np.full(number_of_buses, -1, dtype=int)
+        depth = np.zeros(number_of_buses, dtype=int)
+        parent[self.slack] = self.slack
+        queue = deque([self.slack])
+        while queue:
+            bus = queue.popleft()
+            for neighbor, branch in adjacent[bus]:
+                if branch == feeding_branch[bus]:
+                    continue
+                if parent[neighbor] >= 0:
+                    logger.error('Grid is not radial. Bus {} is part of a '
+                                 'ring.'.format(self.buses[neighbor]))
+                    raise ValueError('Sweep power flow can only be conducted '
+                                     'for radial grids.')
+                parent[neighbor] = bus
+                feeding_branch[neighbor] = branch
+                depth[neighbor] = depth[bus] + 1
+                queue.append(neighbor)
+
+        if (parent < 0).any():
+            logger.error('Buses {} are not connected to the slack '
+                         'bus.'.format(self.buses[parent < 0].tolist()))
+            raise ValueError('Sweep power flow can only be conducted for '
+                             'grids without isolated buses.')
+
+        self.parent = parent
+        fed = feeding_branch >= 0
+        self.z = np.zeros(number_of_buses, dtype=complex)
+        self.z[fed] = 1 / y_group[feeding_branch[fed]]
+        group_node = np.empty(len(bus_pairs), dtype=int)
+        group_node[feeding_branch[fed]] = np.flatnonzero(fed)
+        self.branch_node = group_node[group]
+        self.branch_share = y / y_group[group]
+
+        self.levels = []
+        for level in range(1, depth.max() + 1):
+            nodes = np.flatnonzero(depth == level)
+            nodes = nodes[np.argsort(parent[nodes], kind='stable')]
+            parents, first = np.unique(parent[nodes], return_index=True)
+            self.levels.append((nodes, parent[nodes], parents, first))
+
+    def branch_currents(self, s, v):
+        """
+        Currents in p.u. of the branches feeding each bus.
+
+        Parameters
+        ----------
+        s : :numpy:`numpy.ndarray<ndarray>`
+            Complex power injected at each bus (rows) in each time step
+            (columns) in p.u.
+        v : :numpy:`numpy.ndarray<ndarray>`
+            Complex voltage at each bus (rows) in each time step (columns) in
+            p.u.
+
+        Returns
+        -------
+        :numpy:`numpy.ndarray<ndarray>`
+            Complex current flowing from the parent bus into each bus (rows)
+            in each time step (columns). The row of the slack bus holds the
+            current drawn from the slack bus.
+
+        """
+        j = -np.conj(s / v)
+        for nodes, _, parents, first in reversed(self.levels):
+            j[parents] += np.add.reduceat(j[nodes], first, axis=0)
+        return j
+
+    def voltages(self, j, v_slack):
+        """
+        Complex voltages in p.u. from the slack bus voltage and the branch
+        currents.
+
+        Parameters
+        ----------
+        j : :numpy:`numpy.ndarray<ndarray>`
+            Currents as returned by :meth:`branch_currents`.
+        v_slack : :numpy:`numpy.ndarray<ndarray>`
+            Complex voltage at the slack bus in each time step.
+
+        Returns
+        -------
+        :numpy:`numpy.ndarray<ndarray>`
+            Complex voltage at each bus (rows) in each time step (columns).
+
+        """
+        v = np.empty(j.shape, dtype=complex)
+        v[self.slack] = v_slack
+        for nodes, parent, _, _ in self.levels:
+            v[nodes] = v[parent] - self.z[nodes, np.newaxis] * j[nodes]
+        return v
+
+
+def bus_injections(pypsa, buses, timesteps):
+    """
+    Complex power injected at each bus by loads, generators (except for the
+    slack generator) and storage units.
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+        PyPSA representation of the grid topology.
+    buses : :pandas:`pandas.Index<index>`
+        Names of the buses, defining the order of the rows.
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps, defining the order of the columns.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`
+        Complex power in MVA (p.u. with a base apparent power of 1 MVA)
+        injected at each bus (rows) in each time step (columns).
+
+    """
+    bus_position = pd.Series(np.arange(len(buses)), index=buses)
+    s = np.zeros((len(buses), len(timesteps)), dtype=complex)
+    generators = pypsa.generators[pypsa.generators['control'] != 'Slack']
+    for components, components_t, sign in [
+            (generators, pypsa.generators_t, 1),
+            (pypsa.loads, pypsa.loads_t, -1),
+            (pypsa.storage_units, pypsa.storage_units_t, 1)]:
+        if components.empty:
+            continue
+        p = _set_points(components, components_t, 'p_set', timesteps)
+        q = _set_points(components, components_t, 'q_set', timesteps)
+        np.add.at(s, bus_position.loc[components['bus']].values,
+                  sign * (p + 1j * q).T)
+    return s
+
+
+def _set_points(components, components_t, attr, timesteps):
+    """
+    Time series of set points of all components as array with components as
+    columns. Components without time series keep their static set point.
+
+    """
+    if attr in components_t:
+        set_points = components_t[attr].reindex(
+            index=timesteps, columns=components.index)
+    else:
+        set_points = pd.DataFrame(index=timesteps, columns=components.index)
+    if attr in components:
+        set_points = set_points.fillna(components[attr])
+    return set_points.fillna(0).values.astype(float)
+
+
+def slack_voltage(pypsa, bus, timesteps):
+    """
+    Voltage magnitude set point of the slack bus in each time step.
+
+    """
+    v_mag_pu_set = pypsa.buses_t['v_mag_pu_set']
+    if bus in v_mag_pu_set.columns:
+        return v_mag_pu_set.loc[timesteps, bus].fillna(1).values.astype(
+            float)
+    return np.ones(len(timesteps))
+
+
+def sweep_pf(pypsa, timesteps, tol=1e-8, max_iter=100, use_seed=False):
+    """
+    Power flow analysis of a radial grid by backward/forward sweep.
+
+    Currents drawn by all buses are summed up from the end of the feeders to
+    the slack bus (backward sweep) and voltage drops over all branches are
+    subtracted from the slack bus voltage towards the end of the feeders
+    (forward sweep) until the voltages of two subsequent iterations differ by
+    less than `tol`. All time steps are handled as one matrix; time steps
+    that converged are not iterated any further.
+
+    LV grids are radial and MV grids are operated as open rings (see
+    :func:`~.flex_opt.reinforce_measures.position_switch_disconnectors`),
+    so that the sweep applies to the whole grid topology as translated by
+    :func:`~.tools.pypsa_io.to_pypsa`.
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+        PyPSA representation of the grid topology including time series of
+        all components for the given time steps. Power flow results are
+        written to it like by :meth:`pypsa.Network.pf`.
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps to conduct the power flow analysis for.
+    tol : :obj:`float`
+        Convergence tolerance for the change of the complex voltage at any
+        bus in p.u. between two iterations. Default: 1e-8.
+    max_iter : :obj:`int`
+        Maximum number of iterations. Default: 100.
+    use_seed : :obj:`bool`
+        If True, voltages in `buses_t` of the PyPSA network are used as
+        initial guess (see :class:`VoltageSeed`). Otherwise, iterations start
+        from the slack bus voltage at all buses. Default: False.
+
+    Returns
+    -------
+    :obj:`dict`
+        Dictionary with keys 'n_iter', 'error' and 'converged' holding
+        :pandas:`pandas.DataFrame<dataframe>` with time steps as index and
+        column '0' like the results of :meth:`pypsa.Network.pf`.
+
+    """
+    timesteps = pd.DatetimeIndex(timesteps)
+    grid = RadialGrid(pypsa)
+    s = bus_injections(pypsa, grid.buses, timesteps)
+    v_slack = slack_voltage(pypsa, grid.buses[grid.slack], timesteps)
+
+    def _sweep(v, active):
+        return grid.voltages(grid.branch_currents(s[:, active], v),
+                             v_slack[active])
+
+    v, n_iter, error = _fixed_point_iteration(
+        _sweep, initial_voltages(pypsa, grid, timesteps, v_slack, use_seed),
+        tol, max_iter)
+    converged = error < tol
+    if not converged.all():
+        logger.warning('Sweep power flow did not converge for {} of {} time '
+                       'steps.'.format((~converged).sum(), len(timesteps)))
+
+    write_pf_results(pypsa, grid, timesteps, s, v)
+
+    return _pf_info(timesteps, n_iter, error, converged)
+
+
+def linear_pf(pypsa, timesteps):
+    """
+    Approximate power flow analysis of a radial grid by the linearized
+    DistFlow equations.
+
+    Power flows over all branches are the sums of the power drawn by the buses
+    fed by the branch, neglecting losses, and the squared voltage magnitude
+    drops over each branch by
+
+    .. math::
+        |V_{j}|^2 = |V_{i}|^2 - 2 (r P_{ij} + x Q_{ij})
+
+    with voltage angles approximated accordingly. All time steps are handled
+    as one matrix without iterations, so that the analysis is much faster than
+    a non-linear power flow analysis. Voltage drops and currents are
+    slightly underestimated, wherefore results are meant to screen time steps
+    for those close to limits (see parameter `screening_margin` in
+    :meth:`~.grid.network.EDisGo.analyze`).
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+        PyPSA representation of the grid topology including time series of
+        all components for the given time steps. Results are written to it
+        like by :meth:`pypsa.Network.pf`.
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps to conduct the power flow analysis for.
+
+    Returns
+    -------
+    :obj:`dict`
+        Dictionary with keys 'n_iter', 'error' and 'converged' holding
+        :pandas:`pandas.DataFrame<dataframe>` with time steps as index and
+        column '0' like the results of :meth:`pypsa.Network.pf`.
+
+    """
+    timesteps = pd.DatetimeIndex(timesteps)
+    grid = RadialGrid(pypsa)
+    s = bus_injections(pypsa, grid.buses, timesteps)
+    v_slack = slack_voltage(pypsa, grid.buses[grid.slack], timesteps)
+
+    # power flowing from the parent bus into each bus
+    flow = -s
+    for nodes, _, parents, first in reversed(grid.levels):
+        flow[parents] += np.add.reduceat(flow[nodes], first, axis=0)
+
+    v_square = np.empty(s.shape)
+    v_ang = np.zeros(s.shape)
+    v_square[grid.slack] = v_slack ** 2
+    for nodes, parent, _, _ in grid.levels:
+        drop = grid.z[nodes, np.newaxis] * np.conj(flow[nodes])
+        v_square[nodes] = v_square[parent] - 2 * drop.real
+        v_ang[nodes] = v_ang[parent] - drop.imag
+    with np.errstate(invalid='ignore'):
+        v = np.sqrt(v_square) * np.exp(1j * v_ang)
+
+    # lossless power flows at both ends of each branch
+    bus0_is_parent = (grid.branches['bus0'].values ==
+                      grid.parent[grid.branch_node])[:, np.newaxis]
+    s_parent = flow[grid.branch_node] * grid.branch_share[:, np.newaxis]
+    s0 = np.where(bus0_is_parent, s_parent, -s_parent)
+    write_pf_results(pypsa, grid, timesteps, s, v, branch_flows=(s0, -s0))
+
+    converged = np.isfinite(v).all(axis=0)
+    return _pf_info(timesteps, np.ones(len(timesteps), dtype=int),
+                    np.zeros(len(timesteps)), converged)
+
+
+class ZBusGrid(PowerFlowGrid):
+    """
+    Factorized admittance matrix of the PyPSA representation of the grid.
+
+    The admittance matrix of all buses except for the slack bus is set up
+    and LU factorized once, so that voltages of all time steps are
+    calculated with one forward and backward substitution per iteration
+    (see :meth:`voltages`).
+
+    See :class:`PowerFlowGrid` for parameters and further attributes.
+
+    Attributes
+    ----------
+    y_slack : :numpy:`numpy.ndarray<ndarray>`
+        Admittance between the slack bus and all other buses.
+
+    """
+
+    def __init__(self, pypsa):
+        super().__init__(pypsa)
+        number_of_buses = len(self.buses)
+        bus0 = self.branches['bus0'].values
+        bus1 = self.branches['bus1'].values
+        y = 1 / self.branches['z'].values
+        admittance = coo_matrix(
+            (np.concatenate([y, y, -y, -y]),
+             (np.concatenate([bus0, bus1, bus0, bus1]),
+              np.concatenate([bus0, bus1, bus1, bus0]))),
+            shape=(number_of_buses, number_of_buses)).tocsc()
+        self._others = np.flatnonzero(
+            np.arange(number_of_buses) != self.slack)
+        self.y_slack = admittance[:, self.slack].toarray()[self._others, 0]
+        self._lu = splu(admittance[self._others][:, self._others].tocsc())
+
+    def voltages(self, s, v, v_slack):
+        """
+        Complex voltages in p.u. after one Z-bus iteration.
+
+        Parameters
+        ----------
+        s : :numpy:`numpy.ndarray<ndarray>`
+            Complex power injected at each bus (rows) in each time step
+            (columns) in p.u.
+        v : :numpy:`numpy.ndarray<ndarray>`
+            Complex voltage at each bus (rows) in each time step (columns) in
+            p.u. of the previous iteration.
+        v_slack : :numpy:`numpy.ndarray<ndarray>`
+            Complex voltage at the slack bus in each time step.
+
+        Returns
+        -------
+        :numpy:`numpy.ndarray<ndarray>`
+            Complex voltage at each bus (rows) in each time step (columns).
+
+        """
+        others = self._others
+        v_new = np.empty(v.shape, dtype=complex)
+        v_new[self.slack] = v_slack
+        v_new[others] = self._lu.solve(
+            np.conj(s[others] / v[others]) -
+            self.y_slack[:, np.newaxis] * v_slack[np.newaxis, :])
+        return v_new
+
+
+def zbus_pf(pypsa, timesteps, tol=1e-8, max_iter=30, fallback=True,
+            use_seed=False, damping=1.):
+    """
+    Power flow analysis of all time steps at once with the factorized
+    admittance matrix.
+
+    The admittance matrix is set up and factorized once per state of the grid
+    topology and kept at the PyPSA network (see :class:`ZBusGrid`), so that
+    power flow analyses of subsequent calls, e.g. in the same step of the
+    grid reinforcement, reuse it. Voltages of all time steps are calculated
+    as one matrix by Z-bus iterations
+
+    .. math::
+        V^{k+1} = Y^{-1} \\left(\\frac{S}{V^k}\\right)^* - Y^{-1} y_{slack}
+        V_{slack}
+
+    until the voltages of two subsequent iterations differ by less than
+    `tol`. Contrary to :func:`sweep_pf`, grids with rings are supported.
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+        PyPSA representation of the grid topology including time series of
+        all components for the given time steps. Power flow results are
+        written to it like by :meth:`pypsa.Network.pf`.
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps to conduct the power flow analysis for.
+    tol : :obj:`float`
+        Convergence tolerance for the change of the complex voltage at any
+        bus in p.u. between two iterations. Default: 1e-8.
+    max_iter : :obj:`int`
+        Maximum number of Z-bus iterations. Default: 30.
+    fallback : :obj:`bool`
+        If True, power flow analysis of time steps that did not converge
+        within `max_iter` iterations is conducted by the Newton-Raphson power
+        flow of PyPSA. Default: True.
+    use_seed : :obj:`bool`
+        If True, voltages in `buses_t` of the PyPSA network are used as
+        initial guess of the Z-bus iterations and of the Newton-Raphson
+        power flow (see :class:`VoltageSeed`). Default: False.
+    damping : :obj:`float`
+        Factor between 0 and 1 the change of the voltages in each iteration
+        is multiplied with. Damping slows down convergence but may help time
+        steps to converge that otherwise oscillate. Default: 1, in which case
+        iterations are not damped.
+
+    Returns
+    -------
+    :obj:`dict`
+        Dictionary with keys 'n_iter', 'error' and 'converged' holding
+        :pandas:`pandas.DataFrame<dataframe>` with time steps as index and
+        column '0' like the results of :meth:`pypsa.Network.pf`.
+
+    """
+    timesteps = pd.DatetimeIndex(timesteps)
+    grid = _zbus_grid(pypsa)
+    s = bus_injections(pypsa, grid.buses, timesteps)
+    v_slack = slack_voltage(pypsa, grid.buses[grid.slack], timesteps)
+
+    def _zbus(v, active):
+        return grid.voltages(s[:, active], v, v_slack[active])
+
+    v, n_iter, error = _fixed_point_iteration(
+        _zbus, initial_voltages(pypsa, grid, timesteps, v_slack, use_seed),
+        tol, max_iter, damping)
+    converged = error < tol
+    if converged.all() or not fallback:
+        write_pf_results(pypsa, grid, timesteps, s, v)
+        if not converged.all():
+            logger.warning('Z-bus power flow did not converge for {} of {} '
+                           'time steps.'.format((~converged).sum(),
+                                                len(timesteps)))
+        return _pf_info(timesteps, n_iter, error, converged)
+
+    write_pf_results(pypsa, grid, timesteps[converged], s[:, converged],
+                     v[:, converged])
+    timesteps_newton = timesteps[~converged]
+    logger.debug('Z-bus power flow did not converge for {} of {} time '
+                 'steps. Falling back to Newton-Raphson power '
+                 'flow.'.format(len(timesteps_newton), len(timesteps)))
+    pf_results = pypsa.pf(timesteps_newton, use_seed=use_seed)
+    n_iter[~converged] = pf_results['n_iter']['0'].loc[timesteps_newton]
+    error[~converged] = pf_results['error']['0'].loc[timesteps_newton]
+    converged[~converged] = pf_results['converged']['0'].loc[
+        timesteps_newton]
+    return _pf_info(timesteps, n_iter, error, converged)
+
+
+def convergence_boundary(pypsa, timesteps, steps=10, tol=1e-8,
+                         max_iter=100):
+    """
+    Largest scaling of all loads, generators and storage units for which the
+    power flow analysis of each time step converges.
+
+    The scaling is bisected between 0 and 1 in `steps` steps for all time
+    steps at once, analyzing the scaled set points by Z-bus iterations (see
+    :class:`ZBusGrid`). Results are not written to the PyPSA network.
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+        PyPSA representation of the grid topology including time series of
+        all components for the given time steps.
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps to find the convergence boundary for, usually time steps
+        the power flow analysis did not converge for.
+    steps : :obj:`int`
+        Number of bisection steps. The boundary is found with a precision of
+        :math:`2^{-steps}`. Default: 10.
+    tol : :obj:`float`
+        Convergence tolerance, see :func:`zbus_pf`. Default: 1e-8.
+    max_iter : :obj:`int`
+        Maximum number of Z-bus iterations in each bisection step.
+        Default: 100.
+
+    Returns
+    -------
+    :pandas:`pandas.Series<series>`
+        Largest scaling factor found to converge for each time step.
+
+    """
+    timesteps = pd.DatetimeIndex(timesteps)
+    grid = _zbus_grid(pypsa)
+    s = bus_injections(pypsa, grid.buses, timesteps)
+    v_slack = slack_voltage(pypsa, grid.buses[grid.slack], timesteps)
+
+    lower = np.zeros(len(timesteps))
+    upper = np.ones(len(timesteps))
+    for step in range(steps):
+        scaling = (lower + upper) / 2
+        s_scaled = s * scaling[np.newaxis, :]
+
+        def _zbus(v, active):
+            return grid.voltages(s_scaled[:, active], v, v_slack[active])
+
+        _, _, error = _fixed_point_iteration(
+            _zbus, initial_voltages(pypsa, grid, timesteps, v_slack),
+            tol, max_iter)
+        converged = error < tol
+        lower = np.where(converged, scaling, lower)
+        upper = np.where(converged, upper, scaling)
+    return pd.Series(lower, index=timesteps)
+
+
+def _zbus_grid(pypsa):
+    """
+    Factorized admittance matrix of the PyPSA network.
+
+    The factorization kept at the PyPSA network is reused if buses and
+    branches did not change since it was set up.
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+
+    Returns
+    -------
+    :class:`ZBusGrid`
+
+    """
+    grid = PowerFlowGrid(pypsa)
+    zbus_grid = getattr(pypsa, 'edisgo_zbus_grid', None)
+    if zbus_grid is None or not zbus_grid.has_topology_of(grid):
+        logger.debug('Factorize admittance matrix of {} buses.'.format(
+            len(grid.buses)))
+        zbus_grid = ZBusGrid(pypsa)
+        pypsa.edisgo_zbus_grid = zbus_grid
+    return zbus_grid
+
+
+def initial_voltages(pypsa, grid, timesteps, v_slack, use_seed=False):
+    """
+    Initial guess of the complex voltages of all buses.
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+        PyPSA representation of the grid topology.
+    grid : :class:`PowerFlowGrid`
+        Buses and branches of the grid.
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps of the columns.
+    v_slack : :numpy:`numpy.ndarray<ndarray>`
+        Voltage of the slack bus in each time step.
+    use_seed : :obj:`bool`
+        If True, voltages in `buses_t` of the PyPSA network are used where
+        available. Default: False.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`
+        Complex voltage at each bus (rows) in each time step (columns). Buses
+        without initial guess get the voltage of the slack bus.
+
+    """
+    v = np.tile(v_slack.astype(complex), (len(grid.buses), 1))
+    if use_seed and 'v_mag_pu' in pypsa.buses_t and \
+            'v_ang' in pypsa.buses_t:
+        seed = (pypsa.buses_t['v_mag_pu'].reindex(
+            index=timesteps, columns=grid.buses).values.T *
+                np.exp(1j * pypsa.buses_t['v_ang'].reindex(
+                    index=timesteps, columns=grid.buses).values.T))
+        v = np.where(np.isfinite(seed), seed, v)
+        v[grid.slack] = v_slack
+    return v
+
+
+class VoltageSeed:
+    """
+    Voltages of the last converged power flow analysis of each time step.
+
+    Voltages are used as initial guess of subsequent power flow analyses of
+    the same time steps, e.g. in the next iteration of the grid
+    reinforcement in which only few lines changed. Voltage time series of
+    the PyPSA network are referenced, not copied, so that they are kept
+    also if the PyPSA network is set up again. Only voltages of time steps
+    of the PyPSA network are kept, so that e.g. voltages of previous windows
+    are dropped in power flow analyses in time windows.
+
+    """
+
+    def __init__(self):
+        self._v_mag_pu = None
+        self._v_ang = None
+        self._timesteps = pd.DatetimeIndex([])
+
+    def __len__(self):
+        return len(self._timesteps)
+
+    @property
+    def timesteps(self):
+        """
+        Time steps with voltages of a converged power flow analysis.
+
+        Returns
+        -------
+        :pandas:`pandas.DatetimeIndex<datetimeindex>`
+
+        """
+        return self._timesteps
+
+    def update(self, pypsa, timesteps):
+        """
+        Keeps voltages of the PyPSA network after a converged power flow
+        analysis of the given time steps.
+
+        Parameters
+        ----------
+        pypsa : :pypsa:`pypsa.Network<network>`
+            PyPSA network holding power flow results.
+        timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+            Time steps the power flow analysis converged for.
+
+        """
+        timesteps = pd.DatetimeIndex(timesteps)
+        v_mag_pu = pypsa.buses_t['v_mag_pu']
+        v_ang = pypsa.buses_t['v_ang']
+        # keep voltages of other time steps of the PyPSA network in case the
+        # voltage time series of the PyPSA network are not the ones kept so
+        # far
+        kept = self._timesteps.intersection(
+            pd.DatetimeIndex(pypsa.snapshots)).difference(timesteps)
+        if len(kept) and v_mag_pu is not self._v_mag_pu:
+            v_mag_pu = pd.concat(
+                [v_mag_pu.loc[timesteps], self._v_mag_pu.loc[kept]])
+            v_ang = pd.concat([v_ang.loc[timesteps], self._v_ang.loc[kept]])
+        self._v_mag_pu = v_mag_pu
+        self._v_ang = v_ang
+        self._timesteps = kept.union(timesteps)
+
+    def apply(self, pypsa, timesteps):
+        """
+        Writes the initial guess of the voltages of all buses to the PyPSA
+        network.
+
+        Time steps without kept voltages and buses added since get a flat
+        start (1 p.u. and 0 rad).
+
+        Parameters
+        ----------
+        pypsa : :pypsa:`pypsa.Network<network>`
+            PyPSA network to conduct the power flow analysis with.
+        timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+            Time steps of the power flow analysis.
+
+        Returns
+        -------
+        :pandas:`pandas.DatetimeIndex<datetimeindex>`
+            Time steps with kept voltages.
+
+        """
+        timesteps = pd.DatetimeIndex(timesteps)
+        buses = pypsa.buses.index
+        seeded = timesteps[timesteps.isin(self._timesteps)]
+        v_mag_pu = np.ones((len(timesteps), len(buses)))
+        v_ang = np.zeros((len(timesteps), len(buses)))
+        if len(seeded):
+            rows = timesteps.isin(seeded)
+            v_mag_pu[rows] = self._v_mag_pu.reindex(
+                index=seeded, columns=buses).fillna(1).values
+            v_ang[rows] = self._v_ang.reindex(
+                index=seeded, columns=buses).fillna(0).values
+        _write_timeseries(pypsa.buses_t, 'v_mag_pu', v_mag_pu, timesteps,
+                          buses)
+        _write_timeseries(pypsa.buses_t, 'v_ang', v_ang, timesteps, buses)
+        return seeded
+
+    def discard(self, timesteps):
+        """
+        Removes kept voltages of the given time steps, e.g. because the power
+        flow analysis of these time steps did not converge.
+
+        Parameters
+        ----------
+        timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+            Time steps to remove kept voltages of.
+
+        """
+        self._timesteps = self._timesteps.difference(
+            pd.DatetimeIndex(timesteps))
+
+    def clear(self):
+        """
+        Removes all kept voltages.
+
+        """
+        self._v_mag_pu = None
+        self._v_ang = None
+        self._timesteps = pd.DatetimeIndex([])
+
+
+def _fixed_point_iteration(update, v, tol, max_iter, damping=1.):
+    """
+    Iterates the voltages of all time steps until they converged.
+
+    Parameters
+    ----------
+    update : callable
+        Function returning the voltages of the next iteration from the
+        voltages of the time steps (columns) that did not converge yet and
+        the positions of these time steps.
+    v : :numpy:`numpy.ndarray<ndarray>`
+        Initial complex voltage at each bus (rows) in each time step
+        (columns).
+    tol : :obj:`float`
+        Convergence tolerance for the change of the voltage at any bus.
+    max_iter : :obj:`int`
+        Maximum number of iterations.
+    damping : :obj:`float`
+        Factor the change of the voltages in each iteration is multiplied
+        with. Default: 1.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`, :numpy:`numpy.ndarray<ndarray>`, :numpy:`numpy.ndarray<ndarray>`
+        Voltages, number of iterations and change of the voltages in the last
+        undamped iteration of each time step.
+
+    """
+    number_of_timesteps = v.shape[1]
+    n_iter = np.zeros(number_of_timesteps, dtype=int)
+    error = np.full(number_of_timesteps, np.inf)
+    active = np.arange(number_of_timesteps)
+    with np.errstate(all='ignore'):
+        for iteration in range(1, max_iter + 1):
+            v_active = v[:, active]
+            v_new = update(v_active, active)
+            error[active] = np.abs(v_new - v_active).max(axis=0)
+            if damping != 1:
+                v_new = v_active + damping * (v_new - v_active)
+            v[:, active] = v_new
+            n_iter[active] = iteration
+            # stop iterating converged and diverged time steps
+            active = active[(error[active] >= tol) &
+                            np.isfinite(error[active])]
+            if not len(active):
+                break
+    return v, n_iter, error
+
+
+def _pf_info(timesteps, n_iter, error, converged):
+    """
+    Number of iterations, error and convergence of each time step in the
+    format of the results of :meth:`pypsa.Network.pf`.
+
+    """
+    return {name: pd.DataFrame({'0': values}, index=timesteps)
+            for name, values in [('n_iter', n_iter), ('error', error),
+                                 ('converged', converged)]}
+
+
+def write_pf_results(pypsa, grid, timesteps, s, v, branch_flows=None):
+    """
+    Writes voltages and power flows to the PyPSA network.
+
+    Voltages are written to `buses_t`, power flows at both ends of lines and
+    transformers to `lines_t` and `transformers_t` and power of generators,
+    loads and storage units to the respective time series like done by
+    :meth:`pypsa.Network.pf`.
+
+    Parameters
+    ----------
+    pypsa : :pypsa:`pypsa.Network<network>`
+        PyPSA representation of the grid topology.
+    grid : :class:`PowerFlowGrid`
+        Buses and branches of the grid.
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps of the columns of `s` and `v`.
+    s : :numpy:`numpy.ndarray<ndarray>`
+        Complex power injected at each bus in each time step as returned by
+        :func:`bus_injections`.
+    v : :numpy:`numpy.ndarray<ndarray>`
+        Complex voltage at each bus in each time step in p.u.
+    branch_flows : :obj:`tuple`
+        Complex power flowing into each branch at bus0 and bus1 as returned
+        by :meth:`PowerFlowGrid.branch_flows`. Default: None, in which case
+        power flows are calculated from the voltages.
+
+    """
+    buses = grid.buses
+    _write_timeseries(pypsa.buses_t, 'v_mag_pu', np.abs(v).T, timesteps,
+                      buses)
+    _write_timeseries(pypsa.buses_t, 'v_ang', np.angle(v).T, timesteps,
+                      buses)
+
+    if branch_flows is None:
+        with np.errstate(all='ignore'):
+            branch_flows = grid.branch_flows(v)
+    s0, s1 = branch_flows
+    for component, pnl in [('Line', pypsa.lines_t),
+                           ('Transformer', pypsa.transformers_t)]:
+        positions = np.flatnonzero(
+            grid.branches.index.get_level_values(0) == component)
+        names = grid.branches.index.get_level_values(1)[positions]
+        for attr, values in [('p0', s0.real), ('q0', s0.imag),
+                             ('p1', s1.real), ('q1', s1.imag)]:
+            _write_timeseries(pnl, attr, values[positions].T, timesteps,
+                              names)
+    pypsa.lines['v_nom'] = pypsa.buses['v_nom'].loc[
+        pypsa.lines['bus0']].values
+
+    # power of loads, generators and storage units equals their set points,
+    # the slack generator supplies the power flowing into the branches at
+    # the slack bus not supplied by other components at the slack bus
+    s_slack = s0[grid.branches['bus0'].values == grid.slack].sum(axis=0) + \
+        s1[grid.branches['bus1'].values == grid.slack].sum(axis=0) - \
+        s[grid.slack]
+    for components, components_t in [
+            (pypsa.generators, pypsa.generators_t),
+            (pypsa.loads, pypsa.loads_t),
+            (pypsa.storage_units, pypsa.storage_units_t)]:
+        if components.empty:
+            continue
+        p = _set_points(components, components_t, 'p_set', timesteps)
+        q = _set_points(components, components_t, 'q_set', timesteps)
+        if components is pypsa.generators:
+            slack = np.flatnonzero(components['control'] == 'Slack')
+            p[:, slack] = s_slack.real[:, np.newaxis]
+            q[:, slack] = s_slack.imag[:, np.newaxis]
+        _write_timeseries(components_t, 'p', p, timesteps, components.index)
+        _write_timeseries(components_t, 'q', q, timesteps, components.index)
+
+
+def _write_timeseries(pnl, attr, values, timesteps, columns):
+    """
+    Writes values to the given time steps and columns of time series `attr`
+    of a PyPSA component, keeping values of other time steps.
+
+    """
+    values = pd.DataFrame(values, index=timesteps, columns=columns)
+    if attr in pnl:
+        timeseries = pnl[attr]
+        timeseries = timeseries.reindex(
+            index=timeseries.index.union(timesteps),
+            columns=timeseries.columns.append(
+                columns[~columns.isin(timeseries.columns)])).astype(float)
+        timeseries.loc[timesteps, columns] = values
+        pnl[attr] = timeseries
+    else:
+        pnl[attr] = values
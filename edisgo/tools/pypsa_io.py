@@ -12,10 +12,14 @@ from pypsa import Network as PyPSANetwork
 from pypsa.io import import_series_from_dataframe
 from networkx import connected_components
 import collections
+import logging
 
-from edisgo.grid.components import Transformer, Line, LVStation, MVStation
+from edisgo.grid.components import Transformer, Line, LVStation, \
+    Station, Generator, Load, Storage
 from edisgo.grid.grids import LVGrid
 
+logger = logging.getLogger('edisgo')
+
 
 def to_pypsa(network, mode, timesteps):
     """
@@ -240,6 +244,7 @@ def mv_to_pypsa(network):
         `#54 <https://github.com/openego/eDisGo/issues/54>`_ for discussion.
     """
 
+    cache = network.pypsa_topology_cache
     generators = network.mv_grid.generators
     loads = network.mv_grid.graph.nodes_by_attribute('load')
     branch_tees = network.mv_grid.graph.nodes_by_attribute('branch_tee')
@@ -251,188 +256,73 @@ def mv_to_pypsa(network):
     storages = network.mv_grid.graph.nodes_by_attribute(
         'storage')
 
-    omega = 2 * pi * 50
-
-    # define required dataframe columns for components
-    generator = {'name': [],
-                 'bus': [],
-                 'control': [],
-                 'p_nom': [],
-                 'type': []}
-
-    bus = {'name': [], 'v_nom': [], 'x': [], 'y': []}
-
-    load = {'name': [], 'bus': []}
-
-    line = {'name': [],
-            'bus0': [],
-            'bus1': [],
-            'type': [],
-            'x': [],
-            'r': [],
-            's_nom': [],
-            'length': []}
-
-    transformer = {'name': [],
-                   'bus0': [],
-                   'bus1': [],
-                   'type': [],
-                   'model': [],
-                   'x': [],
-                   'r': [],
-                   's_nom': [],
-                   'tap_ratio': []}
-
-    storage = {
-        'name': [],
-        'bus': [],
-        'p_nom': [],
-        'state_of_charge_initial': [],
-        'efficiency_store': [],
-        'efficiency_dispatch': [],
-        'standing_loss': []}
-
-    # create dataframe representing generators and associated buses
-    for gen in generators:
-        bus_name = '_'.join(['Bus', repr(gen)])
-        generator['name'].append(repr(gen))
-        generator['bus'].append(bus_name)
-        generator['control'].append('PQ')
-        generator['p_nom'].append(gen.nominal_capacity / 1e3)
-        generator['type'].append('_'.join([gen.type, gen.subtype]))
-
-        bus['name'].append(bus_name)
-        bus['v_nom'].append(gen.grid.voltage_nom)
-        bus['x'].append(gen.geom.x)
-        bus['y'].append(gen.geom.y)
-
-    # create dataframe representing branch tees
-    for bt in branch_tees:
-        bus['name'].append('_'.join(['Bus', repr(bt)]))
-        bus['v_nom'].append(bt.grid.voltage_nom)
-        bus['x'].append(bt.geom.x)
-        bus['y'].append(bt.geom.y)
-
-    # create dataframes representing loads and associated buses
-    for lo in loads:
-        bus_name = '_'.join(['Bus', repr(lo)])
-        load['name'].append(repr(lo))
-        load['bus'].append(bus_name)
-
-        bus['name'].append(bus_name)
-        bus['v_nom'].append(lo.grid.voltage_nom)
-        bus['x'].append(lo.geom.x)
-        bus['y'].append(lo.geom.y)
-
-    # create dataframe for lines
-    for l in lines:
-        line['name'].append(repr(l['line']))
-
-        if l['adj_nodes'][0] in lv_stations:
-            line['bus0'].append(
-                '_'.join(['Bus', l['adj_nodes'][0].__repr__(side='mv')]))
-        else:
-            line['bus0'].append('_'.join(['Bus', repr(l['adj_nodes'][0])]))
-
-        if l['adj_nodes'][1] in lv_stations:
-            line['bus1'].append(
-                '_'.join(['Bus', l['adj_nodes'][1].__repr__(side='mv')]))
-        else:
-            line['bus1'].append('_'.join(['Bus', repr(l['adj_nodes'][1])]))
-
-        line['type'].append("")
-        line['x'].append(
-            l['line'].type['L_per_km'] / l['line'].quantity * omega / 1e3 *
-            l['line'].length)
-        line['r'].append(l['line'].type['R_per_km'] / l['line'].quantity *
-                         l['line'].length)
-        line['s_nom'].append(
-            sqrt(3) * l['line'].type['I_max_th'] * l['line'].type['U_n'] *
-            l['line'].quantity / 1e3)
-        line['length'].append(l['line'].length)
-
-    # create dataframe for LV stations incl. primary/secondary side bus
-    for lv_st in lv_stations:
-        transformer_count = 1
-        # add primary side bus (bus0)
-        bus0_name = '_'.join(['Bus', lv_st.__repr__(side='mv')])
-        bus['name'].append(bus0_name)
-        bus['v_nom'].append(lv_st.mv_grid.voltage_nom)
-        bus['x'].append(lv_st.geom.x)
-        bus['y'].append(lv_st.geom.y)
-
-        # add secondary side bus (bus1)
-        bus1_name = '_'.join(['Bus', lv_st.__repr__(side='lv')])
-        bus['name'].append(bus1_name)
-        bus['v_nom'].append(lv_st.transformers[0].voltage_op)
-        bus['x'].append(None)
-        bus['y'].append(None)
-
-        # we choose voltage of transformers' primary side
-        v_base = lv_st.mv_grid.voltage_nom
-
-        for tr in lv_st.transformers:
-            transformer['name'].append(
-                '_'.join([repr(lv_st), 'transformer', str(transformer_count)]))
-            transformer['bus0'].append(bus0_name)
-            transformer['bus1'].append(bus1_name)
-            transformer['type'].append("")
-            transformer['model'].append('pi')
-            # hier evtl. anpassen wenn spaltenname in equipment geändert wird (auch in lv_to_pypsa
-            transformer['r'].append(tr.type.r_pu)
-            transformer['x'].append(tr.type.x_pu)
-            transformer['s_nom'].append(tr.type.S_nom / 1e3)
-            transformer['tap_ratio'].append(1)
-
-            transformer_count += 1
-
-    # create dataframe for MV stations (only secondary side bus)
-    for mv_st in mv_stations:
-        # add secondary side bus (bus1)
-        bus1_name = '_'.join(['Bus', mv_st.__repr__(side='mv')])
-        bus['name'].append(bus1_name)
-        bus['v_nom'].append(mv_st.transformers[0].voltage_op)
-        bus['x'].append(mv_st.geom.x)
-        bus['y'].append(mv_st.geom.y)
-
-    # create dataframe representing disconnecting points
-    for dp in disconnecting_points:
-        bus['name'].append('_'.join(['Bus', repr(dp)]))
-        bus['v_nom'].append(dp.grid.voltage_nom)
-        bus['x'].append(dp.geom.x)
-        bus['y'].append(dp.geom.y)
-
-    # create dataframe representing storages
-    for sto in storages:
-        bus_name = '_'.join(['Bus', repr(sto)])
-
-        storage['name'].append(repr(sto))
-        storage['bus'].append(bus_name)
-        storage['p_nom'].append(sto.nominal_power / 1e3)
-        storage['state_of_charge_initial'].append(sto.soc_initial)
-        storage['efficiency_store'].append(sto.efficiency_in)
-        storage['efficiency_dispatch'].append(sto.efficiency_out)
-        storage['standing_loss'].append(sto.standing_loss)
-
-        bus['name'].append(bus_name)
-        bus['v_nom'].append(sto.grid.voltage_nom)
-        bus['x'].append(sto.geom.x)
-        bus['y'].append(sto.geom.y)
-
-    # Add separate slack generator at MV station secondary side bus bar
-    generator['name'].append("Generator_slack")
-    generator['bus'].append(bus1_name)
-    generator['control'].append('Slack')
-    generator['p_nom'].append(0)
-    generator['type'].append('Slack generator')
+    def _node_buses(nodes):
+        return _pypsa_buses(
+            [repr(_) for _ in nodes], [_.grid.voltage_nom for _ in nodes],
+            [_.geom.x for _ in nodes], [_.geom.y for _ in nodes])
+
+    def _lv_station_buses():
+        buses = _pypsa_buses(
+            [_.__repr__(side='mv') for _ in lv_stations] +
+            [_.__repr__(side='lv') for _ in lv_stations],
+            [_.mv_grid.voltage_nom for _ in lv_stations] +
+            [_.transformers[0].voltage_op for _ in lv_stations],
+            [_.geom.x for _ in lv_stations] + [None] * len(lv_stations),
+            [_.geom.y for _ in lv_stations] + [None] * len(lv_stations))
+        # order primary and secondary side bus of each LV station one after
+        # another
+        return buses.iloc[np.arange(
+            2 * len(lv_stations)).reshape(2, -1).T.ravel()]
+
+    def _mv_station_buses():
+        return _pypsa_buses(
+            [_.__repr__(side='mv') for _ in mv_stations],
+            [_.transformers[0].voltage_op for _ in mv_stations],
+            [_.geom.x for _ in mv_stations], [_.geom.y for _ in mv_stations])
+
+    # buses of generators, branch tees and loads, LV stations (primary and
+    # secondary side), MV stations (secondary side), disconnecting points
+    # and storages
+    nodes = branch_tees + loads
+    other_nodes = disconnecting_points + storages
+    buses = [
+        cache.get(('mv', 'Bus', 'generator'),
+                  _node_content(generators, geom=True),
+                  lambda: _node_buses(generators)),
+        cache.get(('mv', 'Bus', 'node'), _node_content(nodes, geom=True),
+                  lambda: _node_buses(nodes)),
+        cache.get(('mv', 'Bus', 'lv_station'),
+                  _station_content(lv_stations), _lv_station_buses),
+        cache.get(('mv', 'Bus', 'mv_station'),
+                  _station_content(mv_stations), _mv_station_buses),
+        cache.get(('mv', 'Bus', 'other'),
+                  _node_content(other_nodes, geom=True),
+                  lambda: _node_buses(other_nodes))]
+
+    # add separate slack generator at MV station secondary side bus bar
+    slack = pd.DataFrame(
+        {'bus': [buses[3].index[-1]], 'control': ['Slack'], 'p_nom': [0],
+         'type': ['Slack generator']},
+        index=pd.Index(['Generator_slack'], name='name'))
 
     components = {
-        'Generator': pd.DataFrame(generator).set_index('name'),
-        'Bus': pd.DataFrame(bus).set_index('name'),
-        'Load': pd.DataFrame(load).set_index('name'),
-        'Line': pd.DataFrame(line).set_index('name'),
-        'Transformer': pd.DataFrame(transformer).set_index('name'),
-        'StorageUnit': pd.DataFrame(storage).set_index('name')}
+        'Generator': pd.concat([
+            cache.get(('mv', 'Generator'), _generator_content(generators),
+                      lambda: _pypsa_generators(generators)),
+            slack]),
+        'Bus': pd.concat(buses),
+        'Load': cache.get(('mv', 'Load'), _load_content(loads),
+                          lambda: _pypsa_loads(loads)),
+        'Line': cache.get(
+            ('mv', 'Line'), _line_content(lines),
+            lambda: _pypsa_lines(
+                lines, {_: _.__repr__(side='mv') for _ in lv_stations})),
+        'Transformer': cache.get(
+            ('mv', 'Transformer'), _station_content(lv_stations),
+            lambda: _pypsa_transformers(lv_stations)),
+        'StorageUnit': cache.get(('mv', 'StorageUnit'),
+                                 _storage_content(storages),
+                                 lambda: _pypsa_storages(storages))}
 
     return components
 
@@ -461,6 +351,7 @@ def lv_to_pypsa(network):
         * 'StorageUnit'
     """
 
+    cache = network.pypsa_topology_cache
     generators = []
     loads = []
     branch_tees = []
@@ -476,118 +367,401 @@ def lv_to_pypsa(network):
         lv_stations.extend(lv_grid.graph.nodes_by_attribute('lv_station'))
         storages.extend(lv_grid.graph.nodes_by_attribute('storage'))
 
-    omega = 2 * pi * 50
+    def _node_buses(nodes):
+        return _pypsa_buses([repr(_) for _ in nodes],
+                            [_.grid.voltage_nom for _ in nodes],
+                            [None] * len(nodes), [None] * len(nodes))
 
-    generator = {'name': [],
-                 'bus': [],
-                 'control': [],
-                 'p_nom': [],
-                 'type': []}
+    # buses of generators and of branch tees, loads and storages
+    nodes = branch_tees + loads + storages
+    buses = [
+        cache.get(('lv', 'Bus', 'generator'), _node_content(generators),
+                  lambda: _node_buses(generators)),
+        cache.get(('lv', 'Bus', 'node'), _node_content(nodes),
+                  lambda: _node_buses(nodes))]
 
-    bus = {'name': [], 'v_nom': [], 'x': [], 'y': []}
+    lv_components = {
+        'Generator': cache.get(('lv', 'Generator'),
+                               _generator_content(generators),
+                               lambda: _pypsa_generators(generators)),
+        'Bus': pd.concat(buses),
+        'Load': cache.get(('lv', 'Load'), _load_content(loads),
+                          lambda: _pypsa_loads(loads)),
+        'Line': cache.get(
+            ('lv', 'Line'), _line_content(lines),
+            lambda: _pypsa_lines(
+                lines, {_: _.__repr__(side='lv') for _ in lv_stations})),
+        'StorageUnit': cache.get(
+            ('lv', 'StorageUnit'), _storage_content(storages),
+            lambda: _pypsa_storages(storages, p_nom_factor=1))}
 
-    load = {'name': [], 'bus': []}
+    return lv_components
 
-    line = {'name': [],
-            'bus0': [],
-            'bus1': [],
-            'type': [],
-            'x': [],
-            'r': [],
-            's_nom': [],
-            'length': []}
-
-    storage = {
-        'name': [],
-        'bus': [],
-        'p_nom': [],
-        'state_of_charge_initial': [],
-        'efficiency_store': [],
-        'efficiency_dispatch': [],
-        'standing_loss': []}
-
-    # create dictionary representing generators and associated buses
-    for gen in generators:
-        bus_name = '_'.join(['Bus', repr(gen)])
-        generator['name'].append(repr(gen))
-        generator['bus'].append(bus_name)
-        generator['control'].append('PQ')
-        generator['p_nom'].append(gen.nominal_capacity / 1e3)
-        generator['type'].append('_'.join([gen.type, gen.subtype]))
-
-        bus['name'].append(bus_name)
-        bus['v_nom'].append(gen.grid.voltage_nom)
-        bus['x'].append(None)
-        bus['y'].append(None)
-
-    # create dictionary representing branch tees
-    for bt in branch_tees:
-        bus['name'].append('_'.join(['Bus', repr(bt)]))
-        bus['v_nom'].append(bt.grid.voltage_nom)
-        bus['x'].append(None)
-        bus['y'].append(None)
-
-    # create dataframes representing loads and associated buses
-    for lo in loads:
-        bus_name = '_'.join(['Bus', repr(lo)])
-        load['name'].append(repr(lo))
-        load['bus'].append(bus_name)
-
-        bus['name'].append(bus_name)
-        bus['v_nom'].append(lo.grid.voltage_nom)
-        bus['x'].append(None)
-        bus['y'].append(None)
-
-    # create dataframe for lines
-    for l in lines:
-        line['name'].append(repr(l['line']))
-
-        if l['adj_nodes'][0] in lv_stations:
-            line['bus0'].append(
-                '_'.join(['Bus', l['adj_nodes'][0].__repr__(side='lv')]))
-        else:
-            line['bus0'].append('_'.join(['Bus', repr(l['adj_nodes'][0])]))
-
-        if l['adj_nodes'][1] in lv_stations:
-            line['bus1'].append(
-                '_'.join(['Bus', l['adj_nodes'][1].__repr__(side='lv')]))
-        else:
-            line['bus1'].append('_'.join(['Bus', repr(l['adj_nodes'][1])]))
-
-        line['type'].append("")
-        line['x'].append(
-            l['line'].type['L_per_km'] * omega / 1e3 * l['line'].length/ l['line'].quantity)
-        line['r'].append(l['line'].type['R_per_km'] * l['line'].length/ l['line'].quantity)
-        line['s_nom'].append(
-            sqrt(3) * l['line'].type['I_max_th'] * l['line'].type['U_n'] *
-            l['line'].quantity / 1e3)
-        line['length'].append(l['line'].length)
-
-    # create dataframe representing storages
-    for sto in storages:
-        bus_name = '_'.join(['Bus', repr(sto)])
-
-        storage['name'].append(repr(sto))
-        storage['bus'].append(bus_name)
-        storage['p_nom'].append(sto.nominal_power)
-        storage['state_of_charge_initial'].append(sto.soc_initial)
-        storage['efficiency_store'].append(sto.efficiency_in)
-        storage['efficiency_dispatch'].append(sto.efficiency_out)
-        storage['standing_loss'].append(sto.standing_loss)
-
-        bus['name'].append(bus_name)
-        bus['v_nom'].append(sto.grid.voltage_nom)
-        bus['x'].append(None)
-        bus['y'].append(None)
 
-    lv_components = {
-        'Generator': pd.DataFrame(generator).set_index('name'),
-        'Bus': pd.DataFrame(bus).set_index('name'),
-        'Load': pd.DataFrame(load).set_index('name'),
-        'Line': pd.DataFrame(line).set_index('name'),
-        'StorageUnit': pd.DataFrame(storage).set_index('name')}
+class TopologyCache:
+    """
+    Cache of the static component tables of the pypsa representation.
 
-    return lv_components
+    Component tables of the grid topology (e.g. lines of the MV grid or
+    generators of one LV grid) are stored together with a hash over the
+    content they are set up from, i.e. the components and their attributes
+    that are translated to pypsa. A cached table is only returned as long as
+    the content is unchanged. When the pypsa representation is set up again,
+    e.g. after new generators were imported, only the tables with changed
+    content are set up again.
+
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._info = {'hits': 0, 'misses': 0}
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def info(self):
+        """
+        Number of cache hits and misses.
+
+        Returns
+        -------
+        :obj:`dict`
+            Dictionary with keys 'hits' and 'misses'.
+
+        """
+        return dict(self._info)
+
+    def get(self, key, content, build):
+        """
+        Returns cached table or sets it up in case its content changed.
+
+        Parameters
+        ----------
+        key : :obj:`tuple`
+            Key of the table, e.g. grid level and kind of component.
+        content : :obj:`tuple`
+            Content the table is set up from. It is hashed and compared to
+            the content of the cached table. As it holds references to the
+            components, their identity can be used in the content.
+        build : :obj:`function`
+            Function setting up the table in case it is not cached or
+            outdated.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<dataframe>`
+            Component table. It must not be changed in place.
+
+        """
+        content_hash = hash(content)
+        cached = self._cache.get(key)
+        if (cached is not None and cached[0] == content_hash and
+                cached[1] == content):
+            self._info['hits'] += 1
+            return cached[2]
+        self._info['misses'] += 1
+        table = build()
+        self._cache[key] = (content_hash, content, table)
+        return table
+
+    def clear(self):
+        """
+        Removes all cached tables.
+
+        """
+        self._cache.clear()
+
+
+def _node_content(nodes, geom=False):
+    """
+    Content buses of nodes are set up from. See :class:`TopologyCache`.
+
+    """
+    if geom:
+        return tuple((_, _.grid, _.geom) for _ in nodes)
+    return tuple((_, _.grid) for _ in nodes)
+
+
+def _station_content(stations):
+    """
+    Content buses and transformers of stations are set up from. See
+    :class:`TopologyCache`.
+
+    """
+    return tuple((_, _.geom, tuple((tr, tr.voltage_op, id(tr.type))
+                                   for tr in _.transformers))
+                 for _ in stations)
+
+
+def _generator_content(generators):
+    """
+    Content generators are set up from. See :class:`TopologyCache`.
+
+    """
+    return tuple((_, _.nominal_capacity, _.type, _.subtype)
+                 for _ in generators)
+
+
+def _load_content(loads):
+    """
+    Content loads are set up from. See :class:`TopologyCache`.
+
+    """
+    # the version of loads changes with their consumption and grid which
+    # their representative is derived from
+    return tuple((_, _._version) for _ in loads)
+
+
+def _storage_content(storages):
+    """
+    Content storages are set up from. See :class:`TopologyCache`.
+
+    """
+    return tuple((_, _.grid, _.nominal_power, _.soc_initial,
+                  _.efficiency_in, _.efficiency_out, _.standing_loss)
+                 for _ in storages)
+
+
+def _line_content(lines):
+    """
+    Content lines are set up from. See :class:`TopologyCache`.
+
+    """
+    # line types are identified by their name and the identity of the series
+    # holding their parameters
+    return tuple((_['line'], _['adj_nodes'][0], _['adj_nodes'][1],
+                  id(_['line'].type), _['line'].type.name,
+                  _['line'].quantity, _['line'].length) for _ in lines)
+
+
+def _pypsa_transformers(lv_stations):
+    """
+    Transformers of LV stations in pypsa format.
+
+    We choose voltage of transformers' primary side as base voltage.
+
+    Parameters
+    ----------
+    lv_stations : :obj:`list`
+        LV stations (of type :class:`~.grid.components.LVStation`).
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Transformers with their names as index.
+
+    """
+    transformers = [(lv_st, count + 1, tr) for lv_st in lv_stations
+                    for count, tr in enumerate(lv_st.transformers)]
+    return pd.DataFrame(
+        {'bus0': _bus_names([_[0].__repr__(side='mv')
+                             for _ in transformers]),
+         'bus1': _bus_names([_[0].__repr__(side='lv')
+                             for _ in transformers]),
+         'type': '',
+         'model': 'pi',
+         'x': np.array([_[2].type.x_pu for _ in transformers], dtype=float),
+         'r': np.array([_[2].type.r_pu for _ in transformers], dtype=float),
+         's_nom': np.array([_[2].type.S_nom for _ in transformers],
+                           dtype=float) / 1e3,
+         'tap_ratio': 1},
+        index=pd.Index(['_'.join([repr(_[0]), 'transformer', str(_[1])])
+                        for _ in transformers], name='name'),
+        columns=['bus0', 'bus1', 'type', 'model', 'x', 'r', 's_nom',
+                 'tap_ratio'])
+
+
+def _bus_names(labels):
+    """
+    Names of buses in pypsa representation from representatives of nodes.
+
+    Parameters
+    ----------
+    labels : :obj:`list` of :obj:`str`
+        Representatives of nodes.
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray<ndarray>`
+        Bus names.
+
+    """
+    return ('Bus_' + pd.Series(labels, dtype=object)).values
+
+
+def _pypsa_buses(labels, v_nom, x, y):
+    """
+    Buses in pypsa format.
+
+    Parameters
+    ----------
+    labels : :obj:`list` of :obj:`str`
+        Representatives of the nodes the buses are created for.
+    v_nom : :obj:`list`
+        Nominal voltage of each bus in kV.
+    x : :obj:`list`
+        x-coordinate of each bus.
+    y : :obj:`list`
+        y-coordinate of each bus.
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Buses with bus names as index.
+
+    """
+    return pd.DataFrame({'v_nom': v_nom, 'x': x, 'y': y},
+                        index=pd.Index(_bus_names(labels), name='name'),
+                        columns=['v_nom', 'x', 'y'])
+
+
+def _pypsa_generators(generators):
+    """
+    Generators in pypsa format.
+
+    Parameters
+    ----------
+    generators : :obj:`list`
+        Generators (of type :class:`~.grid.components.Generator`).
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Generators with their representatives as index.
+
+    """
+    labels = [repr(_) for _ in generators]
+    return pd.DataFrame(
+        {'bus': _bus_names(labels),
+         'control': 'PQ',
+         'p_nom': np.array([_.nominal_capacity for _ in generators],
+                           dtype=float) / 1e3,
+         'type': ['_'.join([_.type, _.subtype]) for _ in generators]},
+        index=pd.Index(labels, name='name'),
+        columns=['bus', 'control', 'p_nom', 'type'])
+
+
+def _pypsa_loads(loads):
+    """
+    Loads in pypsa format.
+
+    Parameters
+    ----------
+    loads : :obj:`list`
+        Loads (of type :class:`~.grid.components.Load`).
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Loads with their representatives as index.
+
+    """
+    labels = [repr(_) for _ in loads]
+    return pd.DataFrame({'bus': _bus_names(labels)},
+                        index=pd.Index(labels, name='name'))
+
+
+def _pypsa_storages(storages, p_nom_factor=1e-3):
+    """
+    Storages in pypsa format.
+
+    Parameters
+    ----------
+    storages : :obj:`list`
+        Storages (of type :class:`~.grid.components.Storage`).
+    p_nom_factor : :obj:`float`
+        Factor nominal power of storages is multiplied with. Default: 1e-3.
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Storages with their representatives as index.
+
+    """
+    labels = [repr(_) for _ in storages]
+    return pd.DataFrame(
+        {'bus': _bus_names(labels),
+         'p_nom': np.array([_.nominal_power for _ in storages],
+                           dtype=float) * p_nom_factor,
+         'state_of_charge_initial': [_.soc_initial for _ in storages],
+         'efficiency_store': [_.efficiency_in for _ in storages],
+         'efficiency_dispatch': [_.efficiency_out for _ in storages],
+         'standing_loss': [_.standing_loss for _ in storages]},
+        index=pd.Index(labels, name='name'),
+        columns=['bus', 'p_nom', 'state_of_charge_initial',
+                 'efficiency_store', 'efficiency_dispatch', 'standing_loss'])
+
+
+def _pypsa_lines(lines, station_labels):
+    """
+    Lines in pypsa format.
+
+    Parameters of line types are read once per line type and resistance,
+    reactance and nominal apparent power are calculated for all lines at
+    once.
+
+    Parameters
+    ----------
+    lines : :obj:`list` of :obj:`dict`
+        Lines as returned by :meth:`~.grid.grids.Graph.lines`.
+    station_labels : :obj:`dict`
+        Representative of the side of LV stations the lines are connected to
+        with LV stations as keys. Other nodes are represented by
+        :func:`repr`.
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Lines with their representatives as index.
+
+    """
+    node_labels = dict(station_labels)
+
+    def _node_label(node):
+        label = node_labels.get(node)
+        if label is None:
+            label = node_labels[node] = repr(node)
+        return label
+
+    number_of_lines = len(lines)
+    bus0 = []
+    bus1 = []
+    quantity = np.empty(number_of_lines, dtype=float)
+    length = np.empty(number_of_lines, dtype=float)
+    # position of the line type of each line in the list of line types
+    type_position = np.empty(number_of_lines, dtype=int)
+    line_types = {}
+    type_parameters = []
+    for i, l in enumerate(lines):
+        bus0.append(_node_label(l['adj_nodes'][0]))
+        bus1.append(_node_label(l['adj_nodes'][1]))
+        line = l['line']
+        quantity[i] = line.quantity
+        length[i] = line.length
+        line_type = line.type
+        position = line_types.get(id(line_type))
+        if position is None:
+            position = line_types[id(line_type)] = len(type_parameters)
+            type_parameters.append(
+                (line_type, [line_type['R_per_km'], line_type['L_per_km'],
+                             line_type['I_max_th'], line_type['U_n']]))
+        type_position[i] = position
+    r_per_km, l_per_km, i_max_th, u_n = np.array(
+        [_[1] for _ in type_parameters], dtype=float).reshape(
+        -1, 4)[type_position].T
+
+    omega = 2 * pi * 50
+    return pd.DataFrame(
+        {'bus0': _bus_names(bus0),
+         'bus1': _bus_names(bus1),
+         'type': '',
+         'x': l_per_km * omega / 1e3 * length / quantity,
+         'r': r_per_km * length / quantity,
+         's_nom': sqrt(3) * i_max_th * u_n * quantity / 1e3,
+         'length': length},
+        index=pd.Index([repr(_['line']) for _ in lines], name='name'),
+        columns=['bus0', 'bus1', 'type', 'x', 'r', 's_nom', 'length'])
 
 
 def combine_mv_and_lv(mv, lv):
@@ -709,18 +883,13 @@ def _pypsa_load_timeseries(network, timesteps, mode=None):
     :pandas:`pandas.DataFrame<dataframe>`
         Time series table in PyPSA format
     """
-    mv_load_timeseries_p = []
-    mv_load_timeseries_q = []
+    loads = []
     lv_load_timeseries_p = []
     lv_load_timeseries_q = []
 
     # add MV grid loads
     if mode is 'mv' or mode is None:
-        for load in network.mv_grid.graph.nodes_by_attribute('load'):
-            mv_load_timeseries_q.append(load.pypsa_timeseries('q').rename(
-                repr(load)).to_frame().loc[timesteps])
-            mv_load_timeseries_p.append(load.pypsa_timeseries('p').rename(
-                repr(load)).to_frame().loc[timesteps])
+        loads.extend(network.mv_grid.graph.nodes_by_attribute('load'))
         if mode is 'mv':
             lv_load_timeseries_p, lv_load_timeseries_q = \
                 _pypsa_load_timeseries_aggregated_at_lv_station(
@@ -729,14 +898,14 @@ def _pypsa_load_timeseries(network, timesteps, mode=None):
     # add LV grid's loads
     if mode is 'lv' or mode is None:
         for lv_grid in network.mv_grid.lv_grids:
-            for load in lv_grid.graph.nodes_by_attribute('load'):
-                lv_load_timeseries_q.append(load.pypsa_timeseries('q').rename(
-                    repr(load)).to_frame().loc[timesteps])
-                lv_load_timeseries_p.append(load.pypsa_timeseries('p').rename(
-                    repr(load)).to_frame().loc[timesteps])
+            loads.extend(lv_grid.graph.nodes_by_attribute('load'))
 
-    load_df_p = pd.concat(mv_load_timeseries_p + lv_load_timeseries_p, axis=1)
-    load_df_q = pd.concat(mv_load_timeseries_q + lv_load_timeseries_q, axis=1)
+    # time series of all loads are calculated at once and converted to MW
+    # and Mvar
+    load_df_p, load_df_q = network.timeseries.components_timeseries(
+        loads, timesteps, dtype=np.float64)
+    load_df_p = pd.concat([load_df_p / 1e3] + lv_load_timeseries_p, axis=1)
+    load_df_q = pd.concat([load_df_q / 1e3] + lv_load_timeseries_q, axis=1)
 
     return load_df_p, load_df_q
 
@@ -764,18 +933,13 @@ def _pypsa_generator_timeseries(network, timesteps, mode=None):
         Time series table in PyPSA format
     """
 
-    mv_gen_timeseries_q = []
-    mv_gen_timeseries_p = []
+    generators = []
     lv_gen_timeseries_q = []
     lv_gen_timeseries_p = []
 
     # MV generator timeseries
     if mode is 'mv' or mode is None:
-        for gen in network.mv_grid.generators:
-            mv_gen_timeseries_q.append(gen.pypsa_timeseries('q').rename(
-                repr(gen)).to_frame().loc[timesteps])
-            mv_gen_timeseries_p.append(gen.pypsa_timeseries('p').rename(
-                repr(gen)).to_frame().loc[timesteps])
+        generators.extend(network.mv_grid.generators)
         if mode is 'mv':
             lv_gen_timeseries_p, lv_gen_timeseries_q = \
                 _pypsa_generator_timeseries_aggregated_at_lv_station(
@@ -784,14 +948,14 @@ def _pypsa_generator_timeseries(network, timesteps, mode=None):
     # LV generator timeseries
     if mode is 'lv' or mode is None:
         for lv_grid in network.mv_grid.lv_grids:
-            for gen in lv_grid.generators:
-                lv_gen_timeseries_q.append(gen.pypsa_timeseries('q').rename(
-                    repr(gen)).to_frame().loc[timesteps])
-                lv_gen_timeseries_p.append(gen.pypsa_timeseries('p').rename(
-                    repr(gen)).to_frame().loc[timesteps])
+            generators.extend(lv_grid.generators)
 
-    gen_df_p = pd.concat(mv_gen_timeseries_p + lv_gen_timeseries_p, axis=1)
-    gen_df_q = pd.concat(mv_gen_timeseries_q + lv_gen_timeseries_q, axis=1)
+    # time series of all generators are calculated at once and converted to
+    # MW and Mvar
+    gen_df_p, gen_df_q = network.timeseries.components_timeseries(
+        generators, timesteps, dtype=np.float64)
+    gen_df_p = pd.concat([gen_df_p / 1e3] + lv_gen_timeseries_p, axis=1)
+    gen_df_q = pd.concat([gen_df_q / 1e3] + lv_gen_timeseries_q, axis=1)
 
     return gen_df_p, gen_df_q
 
@@ -951,37 +1115,29 @@ def _pypsa_generator_timeseries_aggregated_at_lv_station(network, timesteps):
     generation_q = []
 
     for lv_grid in network.mv_grid.lv_grids:
+        generators = list(lv_grid.generators)
+        gen_p, gen_q = network.timeseries.components_timeseries(
+            generators, timesteps, dtype=np.float64)
         # Determine aggregated generation at LV stations
         generation = {}
-        for gen in lv_grid.generators:
-            # for type in gen.type:
-            #     for subtype in gen.subtype:
+        for position, gen in enumerate(generators):
             gen_name = '_'.join([gen.type,
                                  gen.subtype,
                                  'aggregated',
                                  'LV_grid',
                                  str(lv_grid.id)])
-
             generation.setdefault(gen.type, {})
-            generation[gen.type].setdefault(gen.subtype, {})
-            generation[gen.type][gen.subtype].setdefault('timeseries_p', [])
-            generation[gen.type][gen.subtype].setdefault('timeseries_q', [])
-            generation[gen.type][gen.subtype]['timeseries_p'].append(
-                gen.pypsa_timeseries('p').rename(gen_name).to_frame().loc[
-                    timesteps])
-            generation[gen.type][gen.subtype]['timeseries_q'].append(
-                gen.pypsa_timeseries('q').rename(gen_name).to_frame().loc[
-                    timesteps])
+            generation[gen.type].setdefault(gen.subtype, (gen_name, []))
+            generation[gen.type][gen.subtype][1].append(position)
 
         for k_type, v_type in generation.items():
-            for k_type, v_subtype in v_type.items():
-                col_name = v_subtype['timeseries_p'][0].columns[0]
+            for k_subtype, (col_name, positions) in v_type.items():
                 generation_p.append(
-                    pd.concat(v_subtype['timeseries_p'],
-                              axis=1).sum(axis=1).rename(col_name).to_frame())
+                    (gen_p.iloc[:, positions].sum(axis=1) / 1e3).rename(
+                        col_name).to_frame())
                 generation_q.append(
-                    pd.concat(v_subtype['timeseries_q'], axis=1).sum(
-                        axis=1).rename(col_name).to_frame())
+                    (gen_q.iloc[:, positions].sum(axis=1) / 1e3).rename(
+                        col_name).to_frame())
 
     return generation_p, generation_q
 
@@ -1016,27 +1172,21 @@ def _pypsa_load_timeseries_aggregated_at_lv_station(network, timesteps):
     load_q = []
 
     for lv_grid in network.mv_grid.lv_grids:
+        loads = list(lv_grid.graph.nodes_by_attribute('load'))
+        lv_load_p, lv_load_q = network.timeseries.components_timeseries(
+            loads, timesteps, dtype=np.float64)
         # Determine aggregated load at LV stations
         load = {}
-        for lo in lv_grid.graph.nodes_by_attribute('load'):
-            for sector, val in lo.consumption.items():
-                load.setdefault(sector, {})
-                load[sector].setdefault('timeseries_p', [])
-                load[sector].setdefault('timeseries_q', [])
-
-                load[sector]['timeseries_p'].append(
-                    lo.pypsa_timeseries('p').rename(repr(lo)).to_frame().loc[
-                        timesteps])
-                load[sector]['timeseries_q'].append(
-                    lo.pypsa_timeseries('q').rename(repr(lo)).to_frame().loc[
-                        timesteps])
-
-        for sector, val in load.items():
+        for position, lo in enumerate(loads):
+            for sector in lo.consumption.keys():
+                load.setdefault(sector, []).append(position)
+
+        for sector, positions in load.items():
             load_p.append(
-                pd.concat(val['timeseries_p'], axis=1).sum(axis=1).rename(
+                (lv_load_p.iloc[:, positions].sum(axis=1) / 1e3).rename(
                     '_'.join(['Load', sector, repr(lv_grid)])).to_frame())
             load_q.append(
-                pd.concat(val['timeseries_q'], axis=1).sum(axis=1).rename(
+                (lv_load_q.iloc[:, positions].sum(axis=1) / 1e3).rename(
                     '_'.join(['Load', sector, repr(lv_grid)])).to_frame())
 
     return load_p, load_q
@@ -1284,10 +1434,10 @@ def process_pfa_results(network, pypsa, timesteps):
     bus1_v_mag_pu.index = list(lines_bus1.keys())
 
     # Get line current
-    network.results._i_res = np.hypot(
+    network.results._i_res = (np.hypot(
         pypsa.lines_t['p0'], pypsa.lines_t['q0']).truediv(
         pypsa.lines['v_nom'] * bus0_v_mag_pu.T,
-            axis='columns') / sqrt(3) * 1e3
+            axis='columns') / sqrt(3) * 1e3).loc[timesteps, :]
 
     # process results at nodes
     generators_names = [repr(g) for g in network.mv_grid.generators]
@@ -1384,355 +1534,211 @@ def process_pfa_results(network, pypsa, timesteps):
         {'mv': pfa_v_mag_pu_mv.loc[timesteps, :],
          'lv': pfa_v_mag_pu_lv.loc[timesteps, :]}, axis=1)
 
+    # results are approximate only in case of screening (see parameter
+    # `screening_margin` in :meth:`~.grid.network.EDisGo.analyze`)
+    network.results.pfa_approximated = pd.Series(
+        False, index=network.results.pfa_v_mag_pu.index)
 
-def update_pypsa_generator_import(network):
-    """
-    Translate graph based grid representation to PyPSA Network
+    # store results in floating point type of the network
+    if network.dtype != np.float64:
+        for name in network.results.power_flow_results:
+            if name not in ['pfa_approximated', 'pfa_not_converged']:
+                setattr(network.results, name,
+                        getattr(network.results, name).astype(network.dtype))
 
-    For details from a user perspective see API documentation of
-    :meth:`~.grid.network.EDisGo.analyze` of the API class
-    :class:`~.grid.network.EDisGo`.
-
-    Translating eDisGo's grid topology to PyPSA representation is structured
-    into translating the topology and adding time series for components of the
-    grid. In both cases translation of MV grid only (`mode='mv'`), LV grid only
-    (`mode='lv'`), MV and LV (`mode=None`) share some code. The
-    code is organized as follows:
 
-    * Medium-voltage only (`mode='mv'`): All medium-voltage grid components are
-      exported by :func:`mv_to_pypsa` including the LV station. LV grid load
-      and generation is considered using :func:`add_aggregated_lv_components`.
-      Time series are collected by `_pypsa_load_timeseries` (as example
-      for loads, generators and buses) specifying `mode='mv'`). Timeseries
-      for aggregated load/generation at substations are determined individually.
-    * Low-voltage only (`mode='lv'`): LV grid topology including the MV-LV
-      transformer is exported. The slack is defind at primary side of the MV-LV
-      transformer.
-    * Both level MV+LV (`mode=None`): The entire grid topology is translated to
-      PyPSA in order to perform a complete power flow analysis in both levels
-      together. First, both grid levels are translated seperately using
-      :func:`mv_to_pypsa` and :func:`lv_to_pypsa`. Those are merge by
-      :func:`combine_mv_and_lv`. Time series are obtained at once for both grid
-      levels.
+class PyPSASynchronizer:
+    """
+    Keeps the pypsa representation in sync with changes of the grid.
 
-    This PyPSA interface is aware of translation errors and performs so checks
-    on integrity of data converted to PyPSA grid representation
+    Graphs (see :class:`~.grid.grids.Graph`) and components record changes
+    of lines, nodes and station transformers (see :meth:`record`). Recorded
+    changes are applied to the pypsa representation by :meth:`apply`, which
+    is called before each power flow analysis, by updating only the rows of
+    the changed components in the component tables and time series of the
+    pypsa network.
 
-    * Sub-graphs/ Sub-networks: It is ensured the grid has no islanded parts
-    * Completeness of time series: It is ensured each component has a time
-      series
-    * Buses available: Each component (load, generator, line, transformer) is
-      connected to a bus. The PyPSA representation is check for completeness of
-      buses.
-    * Duplicate labels in components DataFrames and components' time series
-      DataFrames
+    Changes are only recorded while a pypsa representation exists. In case
+    stations are added or removed or the pypsa representation does not
+    contain the whole grid topology, :attr:`~.grid.network.Network.pypsa` is
+    reset to None by :meth:`apply` so that it is set up again in the next
+    power flow analysis.
 
     Parameters
     ----------
     network : :class:`~.grid.network.Network`
-        eDisGo grid container
-    mode : str
-        Determines grid levels that are translated to
-        `PyPSA grid representation
-        <https://www.pypsa.org/doc/components.html#network>`_. Specify
-
-        * None to export MV and LV grid levels. None is the default.
-        * ('mv' to export MV grid level only. This includes cumulative load and
-          generation from underlying LV grid aggregated at respective LV
-          station. This option is implemented, though the rest of edisgo does
-          not handle it yet.)
-        * ('lv' to export LV grid level only. This option is not yet
-           implemented)
-    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>` or \
-        :pandas:`pandas.Timestamp<timestamp>`
-        Timesteps specifies which time steps to export to pypsa representation
-        and use in power flow analysis.
-
-    Returns
-    -------
-        :pypsa:`pypsa.Network<network>`
-            The `PyPSA network
-            <https://www.pypsa.org/doc/components.html#network>`_ container.
 
     """
 
-    # get topology and time series data
-    if network.pypsa.edisgo_mode is None:
-        mv_components = mv_to_pypsa(network)
-        lv_components = lv_to_pypsa(network)
-        components = combine_mv_and_lv(mv_components, lv_components)
-    elif network.pypsa.edisgo_mode is 'mv':
-        raise NotImplementedError
-    elif network.pypsa.edisgo_mode is 'lv':
-        raise NotImplementedError
-    else:
-        raise ValueError("Provide proper mode or leave it empty to export "
-                         "entire grid topology.")
-
-    # check topology
-    _check_topology(components)
-
-    # create power flow problem
-    pypsa_network = PyPSANetwork()
-    pypsa_network.edisgo_mode = network.pypsa.edisgo_mode
-    pypsa_network.set_snapshots(network.pypsa.snapshots)
-
-    # import grid topology to PyPSA network
-    # buses are created first to avoid warnings
-    pypsa_network.import_components_from_dataframe(components['Bus'], 'Bus')
-
-    for k, comps in components.items():
-        if k is not 'Bus' and not comps.empty:
-            pypsa_network.import_components_from_dataframe(comps, k)
-
-    # import time series to PyPSA network
-    pypsa_network.generators_t.p_set = network.pypsa.generators_t.p_set
-    pypsa_network.generators_t.q_set = network.pypsa.generators_t.q_set
-    pypsa_network.loads_t.p_set = network.pypsa.loads_t.p_set
-    pypsa_network.loads_t.q_set = network.pypsa.loads_t.q_set
-    pypsa_network.storage_units_t.p_set = network.pypsa.storage_units_t.p_set
-    pypsa_network.storage_units_t.q_set = network.pypsa.storage_units_t.q_set
-    pypsa_network.buses_t.v_mag_pu_set = network.pypsa.buses_t.v_mag_pu_set
-
-    network.pypsa = pypsa_network
-
-    if len(list(components['Generator'].index.values)) > 1:
-        update_pypsa_generator_timeseries(network)
-    if list(components['Bus'].index.values):
-        update_pypsa_bus_timeseries(network)
-    if len(list(components['StorageUnit'].index.values)) > 0:
-        update_pypsa_storage_timeseries(network)
-
-    _check_integrity_of_pypsa(pypsa_network)
-
-
-def update_pypsa_grid_reinforcement(network, equipment_changes):
+    def __init__(self, network):
+        self._network = network
+        self._changes = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._changes)
+
+    def record(self, kind, component):
+        """
+        Records the change of a component.
+
+        Parameters
+        ----------
+        kind : :obj:`str`
+            Kind of change. Possible options are 'line' for added, removed or
+            changed lines, 'node' for added, removed or changed nodes and
+            'station' for changed transformers of a station.
+        component : :class:`~.grid.components.Component`
+            Changed component.
+
+        """
+        if self._network.pypsa is None:
+            return
+        self._changes[(kind, component)] = None
+
+    def clear(self):
+        """
+        Removes all recorded changes.
+
+        """
+        self._changes.clear()
+
+    def apply(self):
+        """
+        Applies recorded changes to the pypsa representation.
+
+        The current state of each changed component is written to the pypsa
+        representation, i.e. components that are part of the graph of their
+        grid are added or updated and all other components removed.
+
+        """
+        pypsa = self._network.pypsa
+        changes = list(self._changes)
+        self._changes.clear()
+        if pypsa is None or not changes:
+            return
+
+        lines = [c for kind, c in changes if kind == 'line']
+        nodes = [c for kind, c in changes if kind == 'node']
+        stations = [c for kind, c in changes if kind == 'station']
+        if (pypsa.edisgo_mode is not None or
+                any([isinstance(_, Station) for _ in nodes])):
+            logger.debug('Pypsa representation is set up again after changes '
+                         'of stations.')
+            self._network.pypsa = None
+            return
+        logger.debug('Apply changes of {} line(s), {} node(s) and {} '
+                     'station(s) to pypsa representation.'.format(
+                         len(lines), len(nodes), len(stations)))
+
+        self._apply_nodes(pypsa, nodes)
+        self._apply_lines(pypsa, lines)
+        self._apply_stations(pypsa, stations)
+
+    def _apply_nodes(self, pypsa, nodes):
+        if not nodes:
+            return
+        present = [_ for _ in nodes
+                   if _.grid is not None and _ in _.grid.graph]
+        component_types = [(Generator, 'generators', 'generator'),
+                           (Load, 'loads', 'load'),
+                           (Storage, 'storage_units', 'storage')]
+
+        # remove buses and components of all changed nodes
+        _drop_components(pypsa, 'buses', ['Bus_' + repr(_) for _ in nodes])
+        for cls, list_name, _ in component_types:
+            names = [repr(_) for _ in nodes if isinstance(_, cls)]
+            if names:
+                _drop_components(pypsa, list_name, names)
+
+        # add buses and components of nodes in the graph
+        for lv in [False, True]:
+            level_nodes = [_ for _ in present
+                           if isinstance(_.grid, LVGrid) is lv]
+            if not level_nodes:
+                continue
+            pypsa.import_components_from_dataframe(_pypsa_buses(
+                [repr(_) for _ in level_nodes],
+                [_.grid.voltage_nom for _ in level_nodes],
+                [None if lv else _.geom.x for _ in level_nodes],
+                [None if lv else _.geom.y for _ in level_nodes]), 'Bus')
+            storages = [_ for _ in level_nodes if isinstance(_, Storage)]
+            if storages:
+                pypsa.import_components_from_dataframe(_pypsa_storages(
+                    storages, p_nom_factor=1 if lv else 1e-3), 'StorageUnit')
+        generators = [_ for _ in present if isinstance(_, Generator)]
+        if generators:
+            pypsa.import_components_from_dataframe(
+                _pypsa_generators(generators), 'Generator')
+        loads = [_ for _ in present if isinstance(_, Load)]
+        if loads:
+            pypsa.import_components_from_dataframe(
+                _pypsa_loads(loads), 'Load')
+
+        # time series of added components and buses
+        for cls, _, component_type in component_types:
+            components = [_ for _ in present if isinstance(_, cls)]
+            if components:
+                _update_pypsa_timeseries_by_type(
+                    self._network, component_type,
+                    components_to_update=components)
+        update_pypsa_bus_timeseries(self._network)
+
+    def _apply_lines(self, pypsa, lines):
+        if not lines:
+            return
+        _drop_components(pypsa, 'lines', [repr(_) for _ in lines])
+        for lv in [False, True]:
+            level_lines = []
+            for line in lines:
+                if (line.grid is None or
+                        isinstance(line.grid, LVGrid) is not lv):
+                    continue
+                try:
+                    adj_nodes = line.grid.graph.nodes_from_line(line)
+                except KeyError:
+                    # line was removed
+                    continue
+                level_lines.append({'line': line, 'adj_nodes': adj_nodes})
+            if not level_lines:
+                continue
+            station_labels = {
+                node: node.__repr__(side='lv' if lv else 'mv')
+                for _ in level_lines for node in _['adj_nodes']
+                if isinstance(node, LVStation)}
+            pypsa.import_components_from_dataframe(
+                _pypsa_lines(level_lines, station_labels), 'Line')
+
+    def _apply_stations(self, pypsa, stations):
+        # transformers of the MV station are not part of the power flow
+        # analysis
+        stations = [_ for _ in stations if isinstance(_, LVStation)]
+        if not stations:
+            return
+        transformers = pypsa.transformers
+        buses = set(zip(_bus_names([_.__repr__(side='mv') for _ in stations]),
+                        _bus_names([_.__repr__(side='lv') for _ in stations])))
+        _drop_components(pypsa, 'transformers', transformers.index[[
+            _ in buses for _ in zip(transformers.bus0, transformers.bus1)]])
+        pypsa.import_components_from_dataframe(
+            _pypsa_transformers(stations), 'Transformer')
+
+
+def _drop_components(pypsa, list_name, names):
     """
-    Update equipment data of lines and transformers after grid reinforcement.
-
-    During grid reinforcement (cf.
-    :func:`edisgo.flex_opt.reinforce_grid.reinforce_grid`) grid topology and
-    equipment of lines and transformers are changed.
-    In order to save time and not do a full translation of eDisGo's grid
-    topology to the PyPSA format, this function provides an updater for data
-    that may change during grid reinforcement.
-
-    The PyPSA grid topology :meth:`edisgo.grid.network.Network.pypsa` is update
-    by changed equipment stored in
-    :attr:`edisgo.grid.network.Network.equipment_changes`.
-
-    Parameters
-    ----------
-    network : Network
-        eDisGo grid container
-    equipment_changes : `pandas.DataFrame<dataframe>`
-        Dataframe with latest equipment changes (of latest iteration step)
-        from grid reinforcement. See `equipment_changes` property of
-        :class:`~.grid.network.Results` for more information on the Dataframe.
-
-    """
-
-    # Step 1: Update transformers
-    transformers = equipment_changes[
-        equipment_changes['equipment'].apply(isinstance, args=(Transformer,))]
-    # HV/MV transformers are excluded because it's not part of the PFA
-    removed_transformers = [repr(_) for _ in
-                            transformers[transformers['change'] == 'removed'][
-                                'equipment'].tolist() if _.voltage_op < 10]
-    added_transformers = transformers[transformers['change'] == 'added']
-
-    transformer = {'name': [],
-                   'bus0': [],
-                   'bus1': [],
-                   'type': [],
-                   'model': [],
-                   'x': [],
-                   'r': [],
-                   's_nom': [],
-                   'tap_ratio': []}
-
-    for idx, row in added_transformers.iterrows():
-
-        if isinstance(idx, LVStation):
-            # we choose voltage of transformers' primary side
-
-            transformer['bus0'].append('_'.join(['Bus', idx.__repr__(
-                side='mv')]))
-            transformer['bus1'].append('_'.join(['Bus', idx.__repr__(
-                side='lv')]))
-            transformer['name'].append(repr(row['equipment']))
-            transformer['type'].append("")
-            transformer['model'].append('pi')
-            transformer['r'].append(row['equipment'].type.r_pu)
-            transformer['x'].append(row['equipment'].type.x_pu)
-            transformer['s_nom'].append(row['equipment'].type.S_nom / 1e3)
-            transformer['tap_ratio'].append(1)
-
-    network.pypsa.transformers.drop(removed_transformers, inplace=True)
-
-    if transformer['name']:
-        network.pypsa.import_components_from_dataframe(
-            pd.DataFrame(transformer).set_index('name'), 'Transformer')
-
-    # Step 2: Update lines
-    lines = equipment_changes.loc[equipment_changes.index[
-        equipment_changes.reset_index()['index'].apply(
-            isinstance, args=(Line,))]]
-    changed_lines = lines[lines['change'] == 'changed']
-
-    lv_stations = network.mv_grid.graph.nodes_by_attribute('lv_station')
-
-    omega = 2 * pi * 50
-
-    for idx, row in changed_lines.iterrows():
-        # Update line parameters
-        network.pypsa.lines.loc[repr(idx), 'r'] = (
-            idx.type['R_per_km'] / idx.quantity * idx.length)
-        network.pypsa.lines.loc[repr(idx), 'x'] = (
-            idx.type['L_per_km'] / 1e3 * omega / idx.quantity * idx.length)
-        network.pypsa.lines.loc[repr(idx), 's_nom'] = (
-            sqrt(3) * idx.type['I_max_th'] * idx.type[
-                'U_n'] * idx.quantity / 1e3)
-        network.pypsa.lines.loc[repr(idx), 'length'] = idx.length
-
-        # Update buses line is connected to
-        adj_nodes = idx.grid.graph.nodes_from_line(idx)
-
-        if adj_nodes[0] in lv_stations:
-            side = 'lv' if isinstance(idx.grid, LVGrid) else 'mv'
-            bus0 = '_'.join(['Bus', adj_nodes[0].__repr__(side=side)])
-        else:
-            bus0 = '_'.join(['Bus', repr(adj_nodes[0])])
-
-        if adj_nodes[1] in lv_stations:
-            side = 'lv' if isinstance(idx.grid, LVGrid) else 'mv'
-            bus1 = '_'.join(['Bus', adj_nodes[1].__repr__(side=side)])
-        else:
-            bus1 = '_'.join(['Bus', repr(adj_nodes[1])])
+    Drops components with given names from pypsa component table in place
+    and their columns from all time series of the component, e.g. set points
+    and power flow results.
 
-        network.pypsa.lines.loc[repr(idx), 'bus0'] = bus0
-        network.pypsa.lines.loc[repr(idx), 'bus1'] = bus1
+    Names not in the table or time series are skipped.
 
-
-def update_pypsa_storage(pypsa, storages, storages_lines):
     """
-    Adds storages and their lines to pypsa representation of the edisgo graph.
-
-    This function effects the following attributes of the pypsa network:
-    components ('StorageUnit'), storage_units, storage_units_t (p_set, q_set),
-    buses, lines
-
-    Parameters
-    -----------
-    pypsa : :pypsa:`pypsa.Network<network>`
-    storages : :obj:`list`
-        List with storages of type :class:`~.grid.components.Storage` to add
-        to pypsa network.
-    storages_lines : :obj:`list`
-        List with lines of type :class:`~.grid.components.Line` that connect
-        storages to the grid.
-
-    """
-    bus = {'name': [], 'v_nom': [], 'x': [], 'y': []}
-
-    line = {'name': [],
-            'bus0': [],
-            'bus1': [],
-            'type': [],
-            'x': [],
-            'r': [],
-            's_nom': [],
-            'length': []}
-
-    storage = {
-        'name': [],
-        'bus': [],
-        'p_nom': [],
-        'state_of_charge_initial': [],
-        'efficiency_store': [],
-        'efficiency_dispatch': [],
-        'standing_loss': []}
-
-    for s in storages:
-        bus_name = '_'.join(['Bus', repr(s)])
-
-        storage['name'].append(repr(s))
-        storage['bus'].append(bus_name)
-        storage['p_nom'].append(s.nominal_power / 1e3)
-        storage['state_of_charge_initial'].append(s.soc_initial)
-        storage['efficiency_store'].append(s.efficiency_in)
-        storage['efficiency_dispatch'].append(s.efficiency_out)
-        storage['standing_loss'].append(s.standing_loss)
-
-        bus['name'].append(bus_name)
-        bus['v_nom'].append(s.grid.voltage_nom)
-        bus['x'].append(s.geom.x)
-        bus['y'].append(s.geom.y)
-
-    omega = 2 * pi * 50
-    for l in storages_lines:
-        line['name'].append(repr(l))
-
-        adj_nodes = l.grid.graph.nodes_from_line(l)
-        if isinstance(l.grid, LVGrid):
-            if isinstance(adj_nodes[0], LVStation):
-                line['bus0'].append(
-                    '_'.join(['Bus', adj_nodes[0].__repr__(side='lv')]))
-            else:
-                line['bus0'].append('_'.join(['Bus', repr(adj_nodes[0])]))
-
-            if isinstance(adj_nodes[1], LVStation):
-                line['bus1'].append(
-                    '_'.join(['Bus', adj_nodes[1].__repr__(side='lv')]))
-            else:
-                line['bus1'].append('_'.join(['Bus', repr(adj_nodes[1])]))
-        else:
-            if isinstance(adj_nodes[0], LVStation):
-                line['bus0'].append(
-                    '_'.join(['Bus', adj_nodes[0].__repr__(side='mv')]))
-            elif isinstance(adj_nodes[0], MVStation):
-                line['bus0'].append(
-                    '_'.join(['Bus', adj_nodes[0].__repr__(side='lv')]))
-            else:
-                line['bus0'].append('_'.join(['Bus', repr(adj_nodes[0])]))
-
-            if isinstance(adj_nodes[1], LVStation):
-                line['bus1'].append(
-                    '_'.join(['Bus', adj_nodes[1].__repr__(side='mv')]))
-            elif isinstance(adj_nodes[1], MVStation):
-                line['bus1'].append(
-                    '_'.join(['Bus', adj_nodes[1].__repr__(side='lv')]))
-            else:
-                line['bus1'].append('_'.join(['Bus', repr(adj_nodes[1])]))
-
-        line['type'].append("")
-        line['x'].append(l.type['L_per_km'] * omega / 1e3 * l.length)
-        line['r'].append(l.type['R_per_km'] * l.length)
-        line['s_nom'].append(
-            sqrt(3) * l.type['I_max_th'] * l.type['U_n'] / 1e3)
-        line['length'].append(l.length)
-
-    # import new components to pypsa
-    pypsa.import_components_from_dataframe(
-        pd.DataFrame(bus).set_index('name'), 'Bus')
-    pypsa.import_components_from_dataframe(
-        pd.DataFrame(storage).set_index('name'), 'StorageUnit')
-    pypsa.import_components_from_dataframe(
-        pd.DataFrame(line).set_index('name'), 'Line')
-
-    # import time series of storages and buses to pypsa
-    timeseries_storage_p = pd.DataFrame()
-    timeseries_storage_q = pd.DataFrame()
-    for s in storages:
-        timeseries_storage_p[repr(s)] = s.pypsa_timeseries('p').loc[
-            pypsa.storage_units_t.p_set.index]
-        timeseries_storage_q[repr(s)] = s.pypsa_timeseries('q').loc[
-            pypsa.storage_units_t.q_set.index]
-
-    import_series_from_dataframe(pypsa, timeseries_storage_p,
-                                 'StorageUnit', 'p_set')
-    import_series_from_dataframe(pypsa, timeseries_storage_q,
-                                 'StorageUnit', 'q_set')
+    df = getattr(pypsa, list_name)
+    df.drop(df.index.intersection(names), inplace=True)
+    pnl = getattr(pypsa, list_name + '_t')
+    for attr, values in list(pnl.items()):
+        columns = values.columns.intersection(names)
+        if len(columns):
+            pnl[attr] = values.drop(columns, axis=1)
 
 
 def update_pypsa_timeseries(network, loads_to_update=None,
@@ -1926,6 +1932,49 @@ def update_pypsa_bus_timeseries(network, timesteps=None):
     network.pypsa.buses_t.v_mag_pu_set = v_mag_pu_set
 
 
+def _bulk_timeseries(pypsa_ts, components_in_pypsa, values, labels,
+                     timesteps):
+    """
+    Sets up time series of pypsa components with given columns replaced.
+
+    The returned time series are aligned to the index of the pypsa
+    components. In case the time steps are not changed time series of
+    components that are not updated are kept, otherwise they are dropped.
+
+    Parameters
+    ----------
+    pypsa_ts : :pandas:`pandas.DataFrame<dataframe>`
+        Current time series in pypsa representation, e.g. `loads_t.p_set`.
+    components_in_pypsa : :pandas:`pandas.Index<index>`
+        Index of the components in pypsa representation.
+    values : :numpy:`numpy.ndarray<ndarray>`
+        New time series with one row per time step and one column per updated
+        component.
+    labels : :pandas:`pandas.Index<index>`
+        Representatives of the updated components.
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps of `values`.
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Updated time series.
+
+    """
+    keep = pypsa_ts.index.equals(timesteps)
+    if keep:
+        columns = components_in_pypsa[components_in_pypsa.isin(
+            labels.union(pypsa_ts.columns))]
+    else:
+        columns = components_in_pypsa[components_in_pypsa.isin(labels)]
+    data = np.empty((len(timesteps), len(columns)), dtype=np.float64)
+    if keep:
+        kept = columns.isin(pypsa_ts.columns) & ~columns.isin(labels)
+        data[:, kept] = pypsa_ts.loc[:, columns[kept]].values
+    data[:, columns.get_indexer(labels)] = values
+    return pd.DataFrame(data, index=timesteps, columns=columns)
+
+
 def _update_pypsa_timeseries_by_type(network, type, components_to_update=None,
                                      timesteps=None):
     """
@@ -1961,6 +2010,14 @@ def _update_pypsa_timeseries_by_type(network, type, components_to_update=None,
         existing in pypsa representation are updated. If not None current
         time steps are overwritten by given time steps. Default: None.
 
+    Notes
+    -----
+    Time series of all specified components are obtained at once from
+    :meth:`~.grid.network.TimeSeries.components_timeseries` and assigned to
+    the pypsa representation in one step (see :func:`_bulk_timeseries`).
+    Time series of components that are not updated are kept as long as the
+    time steps are not changed.
+
     """
 
     # pypsa dataframe to update
@@ -1997,18 +2054,24 @@ def _update_pypsa_timeseries_by_type(network, type, components_to_update=None,
         if not hasattr(timesteps, "__len__"):
             timesteps = [timesteps]
 
-        p_set = pd.DataFrame()
-        q_set = pd.DataFrame()
-        for comp in components_to_update:
-            if repr(comp) in components_in_pypsa:
-                p_set[repr(comp)] = comp.pypsa_timeseries('p').loc[timesteps]
-                q_set[repr(comp)] = comp.pypsa_timeseries('q').loc[timesteps]
-            else:
-                raise KeyError("Tried to update component {} but could not "
-                               "find it in pypsa network.".format(comp))
-        # overwrite pypsa time series
-        pypsa_ts.p_set = p_set
-        pypsa_ts.q_set = q_set
+        labels = pd.Index([repr(_) for _ in components_to_update])
+        missing = ~labels.isin(components_in_pypsa)
+        if missing.any():
+            raise KeyError("Tried to update component {} but could not "
+                           "find it in pypsa network.".format(
+                               components_to_update[missing.argmax()]))
+        p, q = network.timeseries.components_timeseries(
+            components_to_update, timesteps, dtype=np.float64)
+        # overwrite pypsa time series in one step
+        pypsa_ts.p_set = _bulk_timeseries(
+            pypsa_ts.p_set, components_in_pypsa, p.values / 1e3, labels,
+            p.index)
+        pypsa_ts.q_set = _bulk_timeseries(
+            pypsa_ts.q_set, components_in_pypsa, q.values / 1e3, labels,
+            q.index)
+        # residual load is obtained from pypsa representation and needs to
+        # be reevaluated
+        network.timeseries.reset_timesteps_load_feedin_case()
 
     # MV and aggregated LV loads
     elif network.pypsa.edisgo_mode is 'mv':
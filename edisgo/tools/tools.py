@@ -41,6 +41,160 @@ def select_worstcase_snapshots(network):
     return timestamp
 
 
+def select_representative_snapshots(network, number_of_snapshots=10,
+                                    extremes=False, seed=0):
+    """
+    Select representative snapshots from time series by clustering
+
+    Time steps are clustered with k-medoids on the residual load
+    (load - generation) of each MV feeder and LV grid and the normalized
+    feed-in of fluctuating generators of each type (and weather cell). The
+    medoid of each cluster is a time step of the time series representing
+    all time steps in the cluster. Additionally, time steps with maximum and
+    minimum residual load in the whole grid and, if `extremes` is True, with
+    maximum and minimum value of each clustered feature are selected, as the
+    worst cases are usually not represented by a cluster's medoid.
+
+    By default at most `number_of_snapshots` + 2 time steps are returned.
+    Selecting the extremes of each feature adds up to two time steps per LV
+    grid, MV feeder and type of fluctuating generator, which may be several
+    hundred time steps in large grids.
+
+    Parameters
+    ----------
+    network : :class:`~.grid.network.Network`
+        Network for which representative snapshots are identified.
+    number_of_snapshots : :obj:`int`
+        Number of clusters and thus number of representative time steps
+        besides the extreme ones. Default: 10.
+    extremes : :obj:`Boolean`
+        If True, time steps with maximum and minimum value of each feature,
+        e.g. of the residual load of each LV grid, are selected. If False
+        only time steps with maximum and minimum residual load of the whole
+        grid are added. Default: False.
+    seed : :obj:`int`
+        Seed of the random initialization of the medoids. Default: 0.
+
+    Returns
+    -------
+    :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Representative and extreme time steps.
+
+    """
+    timeindex = network.timeseries.timeindex
+    features = _snapshot_features(network)
+    residual_load = features.sum(axis=1)
+
+    # scale features to [-1, 1] so that all grids are weighted equally
+    scaled_features = features.values / np.maximum(
+        np.abs(features.values).max(axis=0), 1e-9)
+    generation = network.timeseries._generation_fluctuating
+    if isinstance(generation, pd.DataFrame):
+        scaled_features = np.hstack([
+            scaled_features, generation.loc[timeindex, :].values])
+
+    medoids = _k_medoids(scaled_features, number_of_snapshots,
+                         np.random.RandomState(seed))
+    positions = set(medoids)
+    positions.update([residual_load.values.argmax(),
+                      residual_load.values.argmin()])
+    if extremes:
+        positions.update(scaled_features.argmax(axis=0))
+        positions.update(scaled_features.argmin(axis=0))
+    return timeindex[sorted(positions)]
+
+
+def _snapshot_features(network):
+    """
+    Residual load in kW of each MV feeder and LV grid.
+
+    Loads, generators and storages in the MV grid are allocated to their MV
+    feeder, if assigned (see :func:`~.grid.tools.assign_mv_feeder_to_nodes`),
+    and otherwise to the MV grid.
+
+    """
+    components = []
+    signs = []
+    groups = []
+    grids = [network.mv_grid] + list(network.mv_grid.lv_grids)
+    for grid in grids:
+        for sign, grid_components in [
+                (1, grid.graph.nodes_by_attribute('load')),
+                (-1, grid.generators),
+                (-1, grid.graph.nodes_by_attribute('storage'))]:
+            for comp in grid_components:
+                components.append(comp)
+                signs.append(sign)
+                if grid is network.mv_grid:
+                    feeder = getattr(comp, 'mv_feeder', None)
+                    groups.append(grid if feeder is None else feeder)
+                else:
+                    groups.append(grid)
+    group_positions = {}
+    for group in groups:
+        group_positions.setdefault(group, len(group_positions))
+    allocation = np.zeros((len(components), len(group_positions)))
+    allocation[np.arange(len(components)),
+               [group_positions[_] for _ in groups]] = signs
+    p = network.timeseries.components_timeseries(components)[0]
+    return pd.DataFrame(p.values.astype(np.float64).dot(allocation),
+                        index=p.index,
+                        columns=[repr(_) for _ in group_positions])
+
+
+def _distances(a, b):
+    """
+    Euclidean distances between rows of `a` and rows of `b`.
+
+    """
+    squared = (a ** 2).sum(axis=1)[:, np.newaxis] + \
+              (b ** 2).sum(axis=1)[np.newaxis, :] - 2 * a.dot(b.T)
+    return np.sqrt(np.maximum(squared, 0))
+
+
+def _k_medoids(features, k, random_state, max_iterations=100,
+               block_size=512):
+    """
+    Positions of the medoids of `k` clusters of the rows of `features`.
+
+    Medoids are initialized like k-means++ and improved by alternately
+    assigning each row to its closest medoid and choosing the row with the
+    smallest sum of distances to all rows of a cluster as its new medoid.
+
+    """
+    n = features.shape[0]
+    if k >= n:
+        return np.arange(n)
+    medoids = [random_state.randint(n)]
+    closest = _distances(features, features[medoids])[:, 0] ** 2
+    for _ in range(1, k):
+        if closest.sum() > 0:
+            medoids.append(random_state.choice(n, p=closest / closest.sum()))
+        else:
+            medoids.append(random_state.choice(
+                np.setdiff1d(np.arange(n), medoids)))
+        closest = np.minimum(closest, _distances(
+            features, features[medoids[-1:]])[:, 0] ** 2)
+    medoids = np.array(medoids)
+
+    for _ in range(max_iterations):
+        labels = _distances(features, features[medoids]).argmin(axis=1)
+        new_medoids = medoids.copy()
+        for cluster in range(k):
+            members = np.flatnonzero(labels == cluster)
+            if members.size == 0:
+                continue
+            costs = np.concatenate([
+                _distances(features[members[start:start + block_size]],
+                           features[members]).sum(axis=1)
+                for start in range(0, members.size, block_size)])
+            new_medoids[cluster] = members[costs.argmin()]
+        if (new_medoids == medoids).all():
+            break
+        medoids = new_medoids
+    return medoids
+
+
 def get_residual_load_from_pypsa_network(pypsa_network):
     """
     Calculates residual load in MW in MV grid and underlying LV grids.
@@ -115,14 +269,10 @@ def assign_load_feedin_case(network):
             gens.extend(list(grid.graph.nodes_by_attribute('storage')))
             loads.extend(list(grid.graph.nodes_by_attribute('load')))
 
-        generation_timeseries = pd.Series(
-            0, index=network.timeseries.timeindex)
-        for gen in gens:
-            generation_timeseries += gen.timeseries.p
-
-        load_timeseries = pd.Series(0, index=network.timeseries.timeindex)
-        for load in loads:
-            load_timeseries += load.timeseries.p
+        generation_timeseries = network.timeseries.components_timeseries(
+            gens)[0].sum(axis=1)
+        load_timeseries = network.timeseries.components_timeseries(
+            loads)[0].sum(axis=1)
 
         residual_load = load_timeseries - generation_timeseries
 
@@ -207,3 +357,58 @@ def calculate_relative_line_load(network, configs, line_load, line_voltages,
             'i_nom').T)
 
     return i_res.divide(i_allowed)
+
+
+def memmap_dataframe(df, filename, dtype=np.float64):
+    """
+    Stores dataframe values in a memory-mapped file.
+
+    Values are written to `filename` and the returned dataframe reads them
+    from there on access instead of holding them in memory. Index and columns
+    are kept in memory.
+
+    Parameters
+    ----------
+    df : :pandas:`pandas.DataFrame<dataframe>`
+        Dataframe with numerical values, e.g. normalized time series.
+    filename : :obj:`str`
+        File to store the values in. An existing file is overwritten.
+    dtype : :numpy:`numpy.dtype<dtype>`
+        Floating point type to store the values in. Default: numpy.float64.
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<dataframe>`
+        Dataframe with same index and columns as `df` whose values are
+        read-only and memory-mapped from `filename`.
+
+    """
+    values = np.memmap(filename, dtype=dtype, mode='w+', shape=df.shape)
+    values[:] = df.values
+    values.flush()
+    del values
+    values = np.memmap(filename, dtype=dtype, mode='r', shape=df.shape)
+    return pd.DataFrame(values, index=df.index, columns=df.columns,
+                        copy=False)
+
+
+def time_windows(timesteps, window):
+    """
+    Splits time steps into consecutive windows.
+
+    Parameters
+    ----------
+    timesteps : :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps to split.
+    window : :obj:`int`
+        Number of time steps per window. The last window may be shorter.
+
+    Returns
+    -------
+    :obj:`list` of :pandas:`pandas.DatetimeIndex<datetimeindex>`
+        Time steps of each window.
+
+    """
+    if window < 1:
+        raise ValueError('Window needs to contain at least one time step.')
+    return [timesteps[_:_ + window] for _ in range(0, len(timesteps), window)]
@@ -0,0 +1,113 @@
+"""
+Benchmark of the voltage deviation check.
+
+Compares the former node by node check of voltage deviations with the
+array based check in
+:func:`edisgo.flex_opt.check_tech_constraints._critical_voltage_deviation`
+on random voltages and asserts that both yield the same critical nodes.
+
+Usage: python benchmark_voltage_deviation.py [number_of_nodes] [number_of_timesteps]
+
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from edisgo.flex_opt.check_tech_constraints import \
+    _critical_voltage_deviation
+
+
+def create_test_data(number_of_nodes, number_of_timesteps, seed=0):
+    """
+    Creates random voltages and per time step voltage limits.
+
+    """
+    random_state = np.random.RandomState(seed)
+    timeindex = pd.date_range('1/1/2011', periods=number_of_timesteps,
+                              freq='H')
+    v_mag_pu = pd.DataFrame(
+        random_state.normal(1.0, 0.03,
+                            size=(number_of_timesteps, number_of_nodes)),
+        index=timeindex,
+        columns=['Node_{}'.format(_) for _ in range(number_of_nodes)])
+    feedin_case = random_state.rand(number_of_timesteps) < 0.5
+    v_dev_allowed_upper = pd.Series(np.where(feedin_case, 1.05, 1.1),
+                                    index=timeindex)
+    v_dev_allowed_lower = pd.Series(np.where(feedin_case, 0.9, 0.95),
+                                    index=timeindex)
+    return v_mag_pu, v_dev_allowed_upper, v_dev_allowed_lower
+
+
+def node_by_node_voltage_deviation(v_mag_pu_pfa, v_dev_allowed_upper,
+                                   v_dev_allowed_lower):
+    """
+    Voltage deviation check node by node as it was done before.
+
+    """
+    crit_nodes = {}
+    for node in v_mag_pu_pfa.columns:
+        overvoltage = v_mag_pu_pfa[node][
+            (v_mag_pu_pfa[node] > (v_dev_allowed_upper.loc[
+                v_mag_pu_pfa.index]))]
+        undervoltage = v_mag_pu_pfa[node][
+            (v_mag_pu_pfa[node] < (v_dev_allowed_lower.loc[
+                v_mag_pu_pfa.index]))]
+        overvoltage_diff = overvoltage - v_dev_allowed_upper.loc[
+            overvoltage.index]
+        undervoltage_diff = v_dev_allowed_lower.loc[
+            undervoltage.index] - undervoltage
+        if not overvoltage.empty and (
+                undervoltage.empty or
+                overvoltage_diff.max() > undervoltage_diff.max()):
+            crit_nodes[node] = (overvoltage_diff.max(),
+                                overvoltage_diff.idxmax())
+        elif not undervoltage.empty:
+            crit_nodes[node] = (undervoltage_diff.max(),
+                                undervoltage_diff.idxmax())
+    return crit_nodes
+
+
+def array_voltage_deviation(v_mag_pu_pfa, v_dev_allowed_upper,
+                            v_dev_allowed_lower):
+    """
+    Voltage deviation check of all nodes using array operations.
+
+    """
+    v_dev, time_position = _critical_voltage_deviation(
+        v_mag_pu_pfa.values,
+        v_dev_allowed_upper.loc[v_mag_pu_pfa.index].values[:, np.newaxis],
+        v_dev_allowed_lower.loc[v_mag_pu_pfa.index].values[:, np.newaxis],
+        np.zeros(len(v_mag_pu_pfa.columns), dtype=int))
+    return {v_mag_pu_pfa.columns[i]: (v_dev[i],
+                                      v_mag_pu_pfa.index[time_position[i]])
+            for i in np.flatnonzero(time_position >= 0)}
+
+
+def benchmark_voltage_deviation(number_of_nodes=10000,
+                                number_of_timesteps=8760):
+    v_mag_pu, upper, lower = create_test_data(number_of_nodes,
+                                              number_of_timesteps)
+
+    start = time.time()
+    crit_nodes_array = array_voltage_deviation(v_mag_pu, upper, lower)
+    time_array = time.time() - start
+
+    start = time.time()
+    crit_nodes_loop = node_by_node_voltage_deviation(v_mag_pu, upper, lower)
+    time_loop = time.time() - start
+
+    assert crit_nodes_array.keys() == crit_nodes_loop.keys()
+    for node, (v_dev, timestep) in crit_nodes_loop.items():
+        assert np.isclose(crit_nodes_array[node][0], v_dev)
+        assert crit_nodes_array[node][1] == timestep
+
+    print('{} nodes, {} time steps, {} critical nodes'.format(
+        number_of_nodes, number_of_timesteps, len(crit_nodes_loop)))
+    print('node by node: {:.2f} s'.format(time_loop))
+    print('array based: {:.2f} s'.format(time_array))
+    print('speedup: {:.1f}'.format(time_loop / time_array))
+
+
+if __name__ == '__main__':
+    benchmark_voltage_deviation(*[int(_) for _ in sys.argv[1:3]])
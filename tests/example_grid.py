@@ -0,0 +1,141 @@
+"""
+Shared set up of power flow analyses of the example ding0 grid, changes of
+the grid and comparison of power flow results used in several tests.
+It requires a ding0 grid called ding0_grid_example.pkl in the same directory.
+
+"""
+import copy
+import numpy as np
+import pandas as pd
+
+from edisgo import EDisGo
+from edisgo.grid.components import Transformer
+
+
+def set_up_example_grid(dtype=np.float64, load_scaling=None,
+                        grid_changes=None):
+    """
+    Sets up the example grid with eight hourly time steps of feed-in and load.
+
+    `load_scaling` can be a dictionary with time steps as keys and factors
+    to scale the load of these time steps with as values, e.g. to provoke
+    voltage collapse. `grid_changes` can be a function called with the
+    EDisGo object to change the grid, e.g. :func:`change_grid`.
+
+    """
+    timeindex = pd.date_range('2011-01-01 00:00', periods=8, freq='H')
+    feedin_pu = pd.DataFrame(
+        {'solar': np.array([0.0, 0.0, 0.5, 0.5, 0.8, 0.8, 1.0, 1.0]),
+         'wind': np.array([0.0, 1.0, 0.5, 1.0, 0.6, 1.0, 0.0, 1.0])},
+        index=timeindex)
+    gen_dispatchable_df = pd.DataFrame(
+        {'other': [0.3] * len(timeindex)},
+        index=timeindex)
+    edisgo = EDisGo(
+        ding0_grid="ding0_grid_example.pkl",
+        timeseries_generation_fluctuating=feedin_pu,
+        timeseries_generation_dispatchable=gen_dispatchable_df,
+        timeseries_load='demandlib',
+        timeindex=timeindex,
+        dtype=dtype)
+    if load_scaling is not None:
+        load = edisgo.network.timeseries.load.copy()
+        for timestep, factor in load_scaling.items():
+            load.loc[timestep, :] *= factor
+        edisgo.network.timeseries.load = load
+    if grid_changes is not None:
+        grid_changes(edisgo)
+    return edisgo
+
+
+def run_power_flow(dtype=np.float64, load_scaling=None, grid_changes=None,
+                   **kwargs):
+    """
+    Conducts power flow analysis of the example grid set up by
+    :func:`set_up_example_grid` and returns the results.
+
+    Further keyword arguments are passed to
+    :meth:`edisgo.grid.network.EDisGo.analyze`.
+
+    """
+    edisgo = set_up_example_grid(dtype=dtype, load_scaling=load_scaling,
+                                 grid_changes=grid_changes)
+    edisgo.analyze(**kwargs)
+    return edisgo.network.results
+
+
+def change_grid(edisgo):
+    """
+    Integrates a storage, changes type and quantity of a line, adds a
+    transformer to an LV station and removes and re-adds a generator.
+
+    """
+    network = edisgo.network
+    timeindex = network.timeseries.timeindex
+    edisgo.integrate_storage(
+        timeseries=pd.Series(100., index=timeindex),
+        position='hvmv_substation_busbar',
+        timeseries_reactive_power=pd.Series(10., index=timeindex))
+
+    lv_grid = [_ for _ in network.mv_grid.lv_grids if _.generators][0]
+
+    # change type and quantity of a line
+    line = next(lv_grid.graph.lines())['line']
+    line.type = network.equipment_data['lv_cables'].iloc[0]
+    line.quantity = 2
+
+    # add transformer to LV station
+    station = lv_grid.station
+    transformer = station.transformers[0]
+    station.add_transformer(Transformer(
+        id='LVStation_{}_transformer_{}'.format(
+            str(station.id), str(len(station.transformers) + 1)),
+        geom=transformer.geom,
+        mv_grid=transformer.mv_grid,
+        grid=transformer.grid,
+        voltage_op=transformer.voltage_op,
+        type=copy.deepcopy(transformer.type)))
+
+    # remove and re-add generator
+    generator = lv_grid.generators[0]
+    graph = lv_grid.graph
+    node_attributes = dict(graph.nodes[generator])
+    edges = [(generator, neighbor, dict(attributes))
+             for neighbor, attributes in graph.adj[generator].items()]
+    graph.remove_node(generator)
+    graph.add_node(generator, **node_attributes)
+    graph.add_edges_from(edges)
+
+
+def compare_results(results_reference, results, v_error_max=1e-6,
+                    i_error_max=1e-4, p_error_max=1e-4, timesteps=None):
+    """
+    Asserts that results deviate from the reference results by less than the
+    given errors, in the given time steps if provided.
+
+    Voltage errors are absolute errors in p.u., current and power errors are
+    relative to the maximum current or active power of each line,
+    transformer and the MV station in the reference results.
+
+    """
+    if timesteps is None:
+        timesteps = results_reference.pfa_v_mag_pu.index
+    v_reference = results_reference.pfa_v_mag_pu.loc[timesteps]
+    i_reference = results_reference.i_res.loc[timesteps]
+    p_reference = results_reference.pfa_p.loc[timesteps]
+    assert results.pfa_v_mag_pu.index.equals(timesteps)
+    assert results.i_res.index.equals(timesteps)
+    assert results.pfa_p.index.equals(timesteps)
+
+    v_error = (results.pfa_v_mag_pu.astype(np.float64) -
+               v_reference).abs().max().max()
+    i_error = ((results.i_res.astype(np.float64) - i_reference).abs().max() /
+               i_reference.abs().max().replace(0, 1)).max()
+    p_error = ((results.pfa_p.astype(np.float64) - p_reference).abs().max() /
+               p_reference.abs().max().replace(0, 1)).max()
+    assert v_error < v_error_max
+    assert i_error < i_error_max
+    assert p_error < p_error_max
+    assert np.allclose(results.hv_mv_exchanges,
+                       results_reference.hv_mv_exchanges.loc[timesteps],
+                       rtol=1e-4, atol=1e-3)
@@ -0,0 +1,220 @@
+"""
+Compares the violations determined by
+:class:`edisgo.flex_opt.check_tech_constraints.ConstraintEvaluator` to the
+critical lines, stations and nodes returned by the check functions
+:func:`~edisgo.flex_opt.check_tech_constraints.mv_line_load`,
+:func:`~edisgo.flex_opt.check_tech_constraints.lv_line_load`,
+:func:`~edisgo.flex_opt.check_tech_constraints.hv_mv_station_load`,
+:func:`~edisgo.flex_opt.check_tech_constraints.mv_lv_station_load`,
+:func:`~edisgo.flex_opt.check_tech_constraints.mv_voltage_deviation` and
+:func:`~edisgo.flex_opt.check_tech_constraints.lv_voltage_deviation`, for all
+grids and for some LV grids and MV feeders only, and tests that the recheck in
+grid reinforcement finds issues outside of the changed grids.
+It requires a ding0 grid called ding0_grid_example.pkl in the same directory.
+
+"""
+import pandas as pd
+from unittest import mock
+
+from edisgo import EDisGo
+from edisgo.flex_opt import check_tech_constraints as checks
+from edisgo.flex_opt.check_tech_constraints import ConstraintEvaluator
+from edisgo.flex_opt.reinforce_grid import _recheck_grids
+from edisgo.grid.tools import assign_mv_feeder_to_nodes
+
+
+def set_up_network():
+    edisgo = EDisGo(ding0_grid='ding0_grid_example.pkl',
+                    worst_case_analysis='worst-case')
+    edisgo.analyze()
+    network = edisgo.network
+    assign_mv_feeder_to_nodes(network.mv_grid)
+    return network
+
+
+def to_report(kind, crit, column, grid=None):
+    """
+    Converts results of the check functions to the rows of
+    :meth:`ConstraintEvaluator.report` of the given kind.
+
+    """
+    if isinstance(crit, dict):
+        return pd.concat([to_report(kind, crit_grid, column, grid=grid)
+                          for grid, crit_grid in crit.items()] +
+                         [to_report(kind, pd.DataFrame(), column)])
+    if crit.empty:
+        return pd.DataFrame(columns=['kind', 'component', 'grid',
+                                     'magnitude', 'time_index'])
+    return pd.DataFrame(
+        {'kind': kind,
+         'component': list(crit.index),
+         'grid': [grid if grid is not None else _.grid for _ in crit.index],
+         'magnitude': crit[column].values,
+         'time_index': crit['time_index'].values},
+        columns=['kind', 'component', 'grid', 'magnitude', 'time_index'])
+
+
+def legacy_report(network):
+    return pd.concat([
+        to_report('mv_station_load', checks.hv_mv_station_load(network),
+                  's_pfa'),
+        to_report('lv_station_load', checks.mv_lv_station_load(network),
+                  's_pfa'),
+        to_report('mv_line_load', checks.mv_line_load(network),
+                  'max_rel_overload'),
+        to_report('lv_line_load', checks.lv_line_load(network),
+                  'max_rel_overload'),
+        to_report('mv_voltage', checks.mv_voltage_deviation(
+            network, voltage_levels='mv'), 'v_mag_pu'),
+        to_report('lv_station_voltage', checks.lv_voltage_deviation(
+            network, mode='stations', voltage_levels='lv'), 'v_mag_pu'),
+        to_report('lv_voltage', checks.lv_voltage_deviation(
+            network, voltage_levels='lv'), 'v_mag_pu')],
+        ignore_index=True)
+
+
+def compare_reports(report, report_reference):
+    def sort(df):
+        df = df.assign(label=[repr(_) for _ in df.component])
+        return df.sort_values(['kind', 'label']).drop(
+            columns='label').reset_index(drop=True)
+
+    report = sort(report)
+    report_reference = sort(report_reference)
+    assert list(report.kind) == list(report_reference.kind)
+    assert list(report.component) == list(report_reference.component)
+    assert list(report.grid) == list(report_reference.grid)
+    assert list(pd.DatetimeIndex(report.time_index)) == \
+        list(pd.DatetimeIndex(report_reference.time_index))
+    pd.testing.assert_series_equal(
+        report.magnitude.astype(float),
+        report_reference.magnitude.astype(float))
+
+
+def compare_frames(crit, crit_reference):
+    if crit_reference.empty:
+        assert crit.empty
+    else:
+        pd.testing.assert_frame_equal(crit, crit_reference, check_like=True)
+
+
+def test_constraint_evaluator():
+    network = set_up_network()
+    evaluator = ConstraintEvaluator(network)
+
+    compare_frames(evaluator.crit_stations('mv'),
+                   checks.hv_mv_station_load(network))
+    compare_frames(evaluator.crit_stations('lv'),
+                   checks.mv_lv_station_load(network))
+    compare_frames(evaluator.crit_lines('mv'), checks.mv_line_load(network))
+    compare_frames(evaluator.crit_lines('lv'), checks.lv_line_load(network))
+    for kind, crit_reference in [
+            ('mv_voltage', checks.mv_voltage_deviation(
+                network, voltage_levels='mv')),
+            ('lv_station_voltage', checks.lv_voltage_deviation(
+                network, mode='stations', voltage_levels='lv')),
+            ('lv_voltage', checks.lv_voltage_deviation(
+                network, voltage_levels='lv'))]:
+        crit_nodes = evaluator.crit_nodes(kind)
+        assert set(crit_nodes.keys()) == set(crit_reference.keys())
+        for grid, crit in crit_nodes.items():
+            compare_frames(crit, crit_reference[grid])
+
+    report = evaluator.report()
+    # the example grid is not reinforced yet
+    assert not report.empty
+    assert evaluator.has_violations()
+    compare_reports(report, legacy_report(network))
+
+
+def test_constraint_evaluator_restricted():
+    network = set_up_network()
+    report_reference = legacy_report(network)
+
+    # restrict to the LV grids and MV feeder with the first violations
+    lv_grids = list(report_reference.loc[
+        report_reference.kind.isin(['lv_line_load', 'lv_voltage']),
+        'grid'].unique()[:2])
+    mv_feeders = set([
+        getattr(_, 'mv_feeder', None) for _ in report_reference.loc[
+            report_reference.kind == 'mv_voltage', 'component']])
+    mv_feeders = list(mv_feeders - {None})[:1]
+    assert lv_grids and mv_feeders
+
+    def mv_feeder(kind, component):
+        if kind == 'mv_line_load':
+            nodes = network.mv_grid.graph.nodes_from_line(component)
+        else:
+            nodes = [component]
+        for node in nodes:
+            if getattr(node, 'mv_feeder', None) is not None:
+                return node.mv_feeder
+        return None
+
+    def is_checked(row):
+        if row.kind in ['mv_line_load', 'mv_voltage']:
+            feeder = mv_feeder(row.kind, row.component)
+            return feeder is None or feeder in mv_feeders
+        if row.kind == 'mv_station_load':
+            return True
+        return row.grid in lv_grids
+
+    report_reference = report_reference[
+        report_reference.apply(is_checked, axis=1)]
+    assert (report_reference.kind == 'lv_voltage').any()
+    assert (report_reference.kind == 'mv_voltage').any()
+
+    evaluator = ConstraintEvaluator(network, lv_grids=lv_grids,
+                                    mv_feeders=mv_feeders)
+    compare_reports(evaluator.report(), report_reference)
+
+
+def test_recheck_grids():
+    network = set_up_network()
+    report = ConstraintEvaluator(network, kinds=['lv_voltage']).report()
+    assert not report.empty
+    # the screen of all grids includes the time steps of all violations
+    timesteps = checks.timesteps_near_limits(network, margin=0,
+                                             kinds=['lv_voltage'])
+    assert pd.DatetimeIndex(report.time_index).isin(timesteps).all()
+
+    calls = []
+
+    def check(lv_grids=None, mv_feeders=None):
+        calls.append(lv_grids)
+        return ConstraintEvaluator(
+            network, kinds=['lv_voltage'], lv_grids=lv_grids).crit_nodes(
+            'lv_voltage')
+
+    # changed LV grid without issues while other LV grids have issues
+    changed_grids = [_ for _ in network.mv_grid.lv_grids
+                     if _ not in set(report.grid)][:1]
+    assert changed_grids
+    crit_nodes = _recheck_grids(network, check, bool, ['lv_voltage'],
+                                changed_grids, [])
+    assert calls == [changed_grids, None]
+    assert set(crit_nodes.keys()) == set(report.grid)
+
+    # issues in the changed LV grid are returned without checking all grids
+    calls.clear()
+    crit_grids = list(report.grid.unique()[:1])
+    crit_nodes = _recheck_grids(network, check, bool, ['lv_voltage'],
+                                crit_grids, [])
+    assert calls == [crit_grids]
+    assert list(crit_nodes.keys()) == crit_grids
+
+    # all grids are not checked if the screen does not find any violations
+    calls.clear()
+    with mock.patch('edisgo.flex_opt.check_tech_constraints.'
+                    'timesteps_near_limits',
+                    return_value=pd.DatetimeIndex([])):
+        crit_nodes = _recheck_grids(network, check, bool, ['lv_voltage'],
+                                    changed_grids, [])
+    assert calls == [changed_grids]
+    assert not crit_nodes
+
+
+if __name__ == '__main__':
+    test_constraint_evaluator()
+    test_constraint_evaluator_restricted()
+    test_recheck_grids()
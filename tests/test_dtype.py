@@ -0,0 +1,26 @@
+"""
+Compares power flow results of time series and results stored as float32
+with results stored as float64 and asserts that voltage, current and power
+errors stay within given bounds.
+Power flow analyses are set up in :mod:`example_grid`, which requires a
+ding0 grid called ding0_grid_example.pkl in the same directory.
+
+"""
+import numpy as np
+
+from example_grid import run_power_flow, compare_results
+
+
+def test_float32_results(v_error_max=1e-6, i_error_max=1e-4):
+    results_64 = run_power_flow(dtype=np.float64)
+    results_32 = run_power_flow(dtype=np.float32)
+
+    assert (results_32.pfa_v_mag_pu.dtypes == np.float32).all()
+    assert (results_32.i_res.dtypes == np.float32).all()
+
+    compare_results(results_64, results_32, v_error_max=v_error_max,
+                    i_error_max=i_error_max)
+
+
+if __name__ == '__main__':
+    test_float32_results()
@@ -0,0 +1,107 @@
+"""
+Tests the log of equipment changes
+:class:`edisgo.grid.network.EquipmentChanges` by adding, dropping and
+selecting changes and converting the log to a dataframe and back.
+
+"""
+import pandas as pd
+
+from edisgo.grid.network import EquipmentChanges
+from edisgo.grid.components import Line, LVStation, Storage, Transformer
+
+
+def create_test_log():
+    lines = [Line(id=_) for _ in range(3)]
+    station = LVStation(id=1)
+    transformers = [Transformer(id=_) for _ in range(2)]
+    storage = Storage(id=1)
+
+    changes = EquipmentChanges()
+    changes.append(storage, 0, 'added', storage)
+    changes.extend(lines[:2], 1, 'changed', ['NAYY 4x1x150'] * 2, [2, 1])
+    changes.extend([station] * 2, 1, 'added', transformers, [1, 1])
+    changes.append(lines[2], 2, 'changed', 'NAYY 4x1x150', 2)
+    changes.append(station, 2, 'removed', transformers[0])
+    return changes, lines, station, transformers, storage
+
+
+def test_append_extend_drop():
+    changes, lines, station, transformers, storage = create_test_log()
+    assert len(changes) == 7
+    assert changes.last_iteration_step == 2
+    assert lines[0] in changes
+    assert Line(id=0) not in changes
+
+    df = changes.to_dataframe()
+    assert list(df.columns) == EquipmentChanges.columns
+    assert list(df.index) == [storage, lines[0], lines[1], station, station,
+                              lines[2], station]
+    assert list(df.iteration_step) == [0, 1, 1, 1, 1, 2, 2]
+    assert list(df.quantity) == [1, 2, 1, 1, 1, 2, 1]
+    assert list(df.equipment[3:5]) == transformers
+
+    # dataframe is kept until the next change
+    assert changes.to_dataframe() is df
+    changes.drop(station)
+    assert changes.to_dataframe() is not df
+    assert len(changes) == 4
+    assert station not in changes
+    assert list(changes.to_dataframe().index) == [
+        storage, lines[0], lines[1], lines[2]]
+    assert changes.select(kind='transformer').empty
+
+    # dropping a component without changes does not change the log
+    changes.drop(Line(id=0))
+    assert len(changes) == 4
+
+
+def test_select():
+    changes, lines, station, transformers, storage = create_test_log()
+
+    df = changes.select(iteration_step=1)
+    assert list(df.index) == [lines[0], lines[1], station, station]
+    df = changes.select(iteration_step=1, kind='line')
+    assert list(df.index) == lines[:2]
+    df = changes.select(kind='transformer')
+    assert list(df.equipment) == transformers + [transformers[0]]
+    assert list(df.change) == ['added', 'added', 'removed']
+    assert list(changes.select(kind='other').index) == [storage]
+    assert changes.select(iteration_step=3).empty
+    assert list(changes.select(iteration_step=3).columns) == \
+        EquipmentChanges.columns
+
+    # changes of this and all later iteration steps
+    df = changes.select(min_iteration_step=1)
+    assert list(df.iteration_step) == [1, 1, 1, 1, 2, 2]
+    df = changes.select(min_iteration_step=2, kind='line')
+    assert list(df.index) == [lines[2]]
+    # iteration step takes precedence over minimum iteration step
+    df = changes.select(iteration_step=1, min_iteration_step=2)
+    assert list(df.iteration_step) == [1, 1, 1, 1]
+    assert changes.select(min_iteration_step=3).empty
+
+    changes.drop(lines[2])
+    df = changes.select(min_iteration_step=2)
+    assert list(df.index) == [station]
+
+
+def test_dataframe_round_trip():
+    changes = create_test_log()[0]
+    df = changes.to_dataframe()
+    changes_new = EquipmentChanges.from_dataframe(df)
+    pd.testing.assert_frame_equal(changes_new.to_dataframe(), df)
+    assert changes_new.last_iteration_step == changes.last_iteration_step
+    for kind in ['line', 'transformer', 'other']:
+        pd.testing.assert_frame_equal(changes_new.select(kind=kind),
+                                      changes.select(kind=kind))
+
+    # empty log
+    assert EquipmentChanges().to_dataframe().empty
+    assert len(EquipmentChanges.from_dataframe(pd.DataFrame())) == 0
+    assert len(EquipmentChanges.from_dataframe(None)) == 0
+
+
+if __name__ == '__main__':
+    test_append_extend_drop()
+    test_select()
+    test_dataframe_round_trip()
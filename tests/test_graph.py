@@ -0,0 +1,137 @@
+"""
+Tests the index of adjacent nodes of lines and the index of nodes and lines
+by type in :class:`edisgo.grid.grids.Graph` and asserts that a lookup with
+the index does not search all edges.
+
+"""
+import networkx as nx
+from unittest import mock
+
+from edisgo.grid.grids import Graph
+from edisgo.grid.components import BranchTee, Line, Load
+
+
+def create_test_graph(number_of_lines):
+    """
+    Creates a graph with a chain of branch tees connected by lines.
+
+    """
+    graph = Graph()
+    nodes = [BranchTee(id=_ + 1) for _ in range(number_of_lines + 1)]
+    lines = [Line(id=_ + 1) for _ in range(number_of_lines)]
+    graph.add_nodes_from(nodes, type='branch_tee')
+    graph.add_edges_from(
+        [(nodes[i], nodes[i + 1], {'line': lines[i]})
+         for i in range(number_of_lines)], type='line')
+    return graph, nodes, lines
+
+
+def search_nodes_from_line(graph, line):
+    """
+    Lookup of adjacent nodes in all edges of the graph as it was done before.
+
+    """
+    return dict([(v, k) for k, v in
+                 nx.get_edge_attributes(graph, name='line').items()])[line]
+
+
+def test_nodes_from_line():
+    graph, nodes, lines = create_test_graph(10)
+
+    for line in lines:
+        assert graph.nodes_from_line(line) == \
+               search_nodes_from_line(graph, line)
+        u, v = graph.nodes_from_line(line)
+        assert graph.line_from_nodes(u, v) is line
+        assert graph.line_from_nodes(v, u) is line
+
+    # replace line
+    new_line = Line(id='new')
+    graph.remove_edge(nodes[2], nodes[3])
+    graph.add_edge(nodes[3], nodes[2], line=new_line, type='line')
+    assert graph.nodes_from_line(new_line) == \
+           search_nodes_from_line(graph, new_line)
+    try:
+        graph.nodes_from_line(lines[2])
+        raise AssertionError('Removed line is still in the graph.')
+    except KeyError:
+        pass
+
+    # remove node with its lines
+    graph.remove_node(nodes[5])
+    for line in [lines[4], lines[5]]:
+        try:
+            graph.nodes_from_line(line)
+            raise AssertionError('Removed line is still in the graph.')
+        except KeyError:
+            pass
+    try:
+        graph.line_from_nodes(nodes[4], nodes[5])
+        raise AssertionError('Removed line is still in the graph.')
+    except nx.NetworkXError:
+        pass
+
+    # re-add node
+    graph.add_edge(nodes[4], nodes[5], line=lines[4], type='line')
+    assert graph.nodes_from_line(lines[4]) == \
+           search_nodes_from_line(graph, lines[4])
+
+
+def search_lines_by_type(graph, line_type=None):
+    """
+    Lines of given type searched for in all edges of the graph.
+
+    """
+    lines = [(k, graph[k[0]][k[1]]['line']) for k, v in
+             nx.get_edge_attributes(graph, name='type').items()
+             if line_type is None or v == line_type]
+    return [{'adj_nodes': _[0], 'line': _[1]}
+            for _ in sorted(lines, key=lambda _: repr(_[1]))]
+
+
+def test_nodes_and_lines_by_attribute():
+    graph, nodes, lines = create_test_graph(10)
+    load = Load(id=1)
+    graph.add_node(load, type='load')
+    graph.add_edge(nodes[0], load, line=Line(id='aggr'), type='line_aggr')
+
+    assert graph.nodes_by_attribute('branch_tee') == nodes
+    assert graph.nodes_by_attribute('load') == [load]
+    assert graph.nodes_by_attribute('generator') == []
+    for line_type in [None, 'line', 'line_aggr']:
+        assert list(graph.lines_by_attribute(line_type)) == \
+               search_lines_by_type(graph, line_type)
+
+    graph.remove_node(nodes[3])
+    graph.remove_node(load)
+    assert graph.nodes_by_attribute('branch_tee') == \
+           nodes[:3] + nodes[4:]
+    assert graph.nodes_by_attribute('load') == []
+    for line_type in [None, 'line', 'line_aggr']:
+        assert list(graph.lines_by_attribute(line_type)) == \
+               search_lines_by_type(graph, line_type)
+
+
+def test_nodes_from_line_without_search(number_of_lines=1000):
+    graph, nodes, lines = create_test_graph(number_of_lines)
+    nodes_search = [search_nodes_from_line(graph, _) for _ in lines]
+
+    with mock.patch('networkx.get_edge_attributes',
+                    wraps=nx.get_edge_attributes) as search:
+        nodes_index = [graph.nodes_from_line(_) for _ in lines]
+        assert nodes_index == nodes_search
+        # lookup with index does not search all edges of the graph
+        assert search.call_count == 0
+
+        # lines added by changing the attribute dict of an edge directly
+        # are not indexed and therefore searched for in all edges
+        new_line = Line(id='new')
+        graph[nodes[0]][nodes[1]]['line'] = new_line
+        assert graph.nodes_from_line(new_line) == (nodes[0], nodes[1])
+        assert search.call_count == 1
+
+
+if __name__ == '__main__':
+    test_nodes_from_line()
+    test_nodes_and_lines_by_attribute()
+    test_nodes_from_line_without_search()
@@ -0,0 +1,98 @@
+"""
+Tests that :class:`edisgo.grid.network.Limits` only updates the allowed load
+of the line or station that changed when type or quantity of a line or the
+transformers of a station change.
+It requires a ding0 grid called ding0_grid_example.pkl in the same directory.
+
+"""
+import copy
+
+from edisgo import EDisGo
+from edisgo.grid.components import Transformer
+
+
+def get_allowed_load(network):
+    limits = network.limits
+    grids = [network.mv_grid] + list(network.mv_grid.lv_grids)
+    lines = {}
+    stations = {}
+    for grid in grids:
+        for line in grid.graph.lines():
+            lines[line['line']] = limits.allowed_line_load(line['line'])
+        stations[grid.station] = limits.allowed_station_load(grid.station)
+    return lines, stations
+
+
+def assert_only_changed(cached, new, changed):
+    assert set(cached.keys()) == set(new.keys())
+    for component, values in new.items():
+        if component is changed:
+            assert values is not cached[component]
+        else:
+            # cached entries of unchanged components are kept
+            assert values is cached[component]
+
+
+def test_limits_reset():
+    edisgo = EDisGo(ding0_grid='ding0_grid_example.pkl',
+                    worst_case_analysis='worst-case')
+    network = edisgo.network
+    lines, stations = get_allowed_load(network)
+    voltage_limits = network.limits.voltage_limits('mv')
+
+    lv_grid = list(network.mv_grid.lv_grids)[0]
+    line = next(lv_grid.graph.lines())['line']
+
+    # change quantity of a line
+    i_allowed = lines[line]
+    line.quantity = line.quantity + 1
+    lines_new, stations_new = get_allowed_load(network)
+    assert_only_changed(lines, lines_new, line)
+    assert_only_changed(stations, stations_new, None)
+    assert lines_new[line][0] > i_allowed[0]
+    assert lines_new[line][1] > i_allowed[1]
+    lines = lines_new
+
+    # change type of a line
+    line_type = network.equipment_data['lv_cables'].loc[
+        network.equipment_data['lv_cables'].I_max_th !=
+        line.type['I_max_th']].iloc[0]
+    line.type = line_type
+    lines_new, stations_new = get_allowed_load(network)
+    assert_only_changed(lines, lines_new, line)
+    assert_only_changed(stations, stations_new, None)
+    assert lines_new[line][0] == (line_type['I_max_th'] * line.quantity *
+                                  network.config[
+                                      'grid_expansion_load_factors'][
+                                      'lv_feedin_case_line'])
+    lines = lines_new
+
+    # add transformer to LV station
+    station = lv_grid.station
+    s_station = stations[station][0]
+    transformer = station.transformers[0]
+    station.add_transformer(Transformer(
+        id='LVStation_{}_transformer_{}'.format(
+            str(station.id), str(len(station.transformers) + 1)),
+        geom=transformer.geom,
+        mv_grid=transformer.mv_grid,
+        grid=transformer.grid,
+        voltage_op=transformer.voltage_op,
+        type=copy.deepcopy(transformer.type)))
+    lines_new, stations_new = get_allowed_load(network)
+    assert_only_changed(lines, lines_new, None)
+    assert_only_changed(stations, stations_new, station)
+    assert stations_new[station][0] == s_station + transformer.type.S_nom
+
+    # voltage limits are not affected by changes of the grid topology
+    assert network.limits.voltage_limits('mv') is voltage_limits
+
+    # all entries are reset without a component
+    network.limits.reset()
+    lines_new, stations_new = get_allowed_load(network)
+    assert all([lines_new[_] is not lines[_] for _ in lines])
+    assert network.limits.voltage_limits('mv') is not voltage_limits
+
+
+if __name__ == '__main__':
+    test_limits_reset()
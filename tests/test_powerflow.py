@@ -0,0 +1,190 @@
+"""
+Compares power flow results of the backward/forward sweep in
+:func:`edisgo.tools.powerflow.sweep_pf`, also for a grid with parallel
+transformers, and of the Z-bus power flow in
+:func:`edisgo.tools.powerflow.zbus_pf` with power flow results of PyPSA and
+asserts that voltage, current and power errors stay within given bounds.
+Also checks that only time steps close to limits are analyzed exactly when
+screening time steps by :func:`edisgo.tools.powerflow.linear_pf`, that all
+time steps are analyzed exactly if the grid is not radial and that
+time steps that do not converge are recorded while results of the other
+time steps are kept, and that time steps the engine does not converge for
+are solved by damped Z-bus iterations only if non-convergence is recorded.
+Also checks that warm started power flow analyses take fewer iterations.
+Power flow analyses are set up in :mod:`example_grid`, which requires a
+ding0 grid called ding0_grid_example.pkl in the same directory.
+
+"""
+import numpy as np
+from unittest import mock
+
+from edisgo import EDisGo
+from edisgo.tools import powerflow
+
+from example_grid import run_power_flow, compare_results, change_grid, \
+    set_up_example_grid
+
+
+def test_sweep_pf():
+    compare_results(run_power_flow(engine='pypsa'),
+                    run_power_flow(engine='sweep'))
+
+
+def test_sweep_pf_parallel_transformers():
+    # LV station with two transformers exported as parallel branches
+    compare_results(run_power_flow(engine='pypsa', grid_changes=change_grid),
+                    run_power_flow(engine='sweep', grid_changes=change_grid))
+
+
+def test_zbus_pf():
+    compare_results(run_power_flow(engine='pypsa'),
+                    run_power_flow(engine='zbus'))
+
+
+def test_warm_start():
+    edisgo = set_up_example_grid()
+    edisgo.analyze(engine='sweep')
+    pypsa = edisgo.network.pypsa
+    timesteps = pypsa.snapshots
+
+    # flat start
+    n_iter_flat = powerflow.sweep_pf(pypsa, timesteps)['n_iter']['0']
+    v_flat = pypsa.buses_t['v_mag_pu'].loc[timesteps].copy()
+    # start from voltages of the first power flow analysis
+    seeded = edisgo.network.pf_seed.apply(pypsa, timesteps)
+    n_iter_warm = powerflow.sweep_pf(
+        pypsa, timesteps, use_seed=True)['n_iter']['0']
+    v_warm = pypsa.buses_t['v_mag_pu'].loc[timesteps]
+
+    assert seeded.equals(timesteps)
+    assert n_iter_warm.sum() < n_iter_flat.sum()
+    assert np.allclose(v_warm, v_flat, atol=1e-8)
+
+
+def test_warm_start_windows(window=3):
+    # only voltages of the time steps of the current window are kept
+    edisgo = set_up_example_grid()
+    edisgo.analyze(engine='sweep', window=window)
+    assert len(edisgo.network.pf_seed) <= window
+    assert edisgo.network.pf_seed.timesteps.isin(
+        edisgo.network.pypsa.snapshots).all()
+
+
+def close_rings(edisgo):
+    """
+    Closes all switch disconnectors of the MV grid.
+
+    """
+    for switch in edisgo.network.mv_grid.graph.nodes_by_attribute(
+            'mv_disconnecting_point'):
+        switch.close()
+
+
+def test_screening(screening_margin=0.5, v_error_max=0.01):
+    results_pypsa = run_power_flow(engine='pypsa')
+    results = run_power_flow(engine='pypsa',
+                             screening_margin=screening_margin)
+
+    approximated = results.pfa_approximated
+    assert approximated.index.equals(results_pypsa.pfa_v_mag_pu.index)
+    exact = approximated.index[~approximated.values]
+    # exactly analyzed time steps equal results of PyPSA
+    assert (results.pfa_v_mag_pu.loc[exact] -
+            results_pypsa.pfa_v_mag_pu.loc[exact]).abs().max().max() < 1e-6
+    # approximate voltages are close to results of PyPSA
+    assert (results.pfa_v_mag_pu - results_pypsa.pfa_v_mag_pu).abs(
+        ).max().max() < v_error_max
+
+
+def test_screening_parallel_transformers(screening_margin=0.5):
+    results_pypsa = run_power_flow(engine='pypsa', grid_changes=change_grid)
+    results = run_power_flow(engine='pypsa', grid_changes=change_grid,
+                             screening_margin=screening_margin)
+
+    exact = results.pfa_approximated.index[~results.pfa_approximated.values]
+    assert (results.pfa_v_mag_pu.loc[exact] -
+            results_pypsa.pfa_v_mag_pu.loc[exact]).abs().max().max() < 1e-6
+
+
+def test_screening_rings(screening_margin=0.5):
+    # the approximation needs a radial grid, therefore all time steps are
+    # analyzed exactly
+    results_pypsa = run_power_flow(engine='pypsa', grid_changes=close_rings)
+    results = run_power_flow(engine='pypsa', grid_changes=close_rings,
+                             screening_margin=screening_margin)
+
+    assert not results.pfa_approximated.any()
+    compare_results(results_pypsa, results)
+
+
+def test_record_non_convergence():
+    results_pypsa = run_power_flow(engine='pypsa')
+    results = run_power_flow(engine='pypsa', non_convergence='record')
+
+    assert results.pfa_not_converged.empty
+    compare_results(results_pypsa, results)
+
+
+def test_bisect_non_convergence(load_factor=100.):
+    results_pypsa = run_power_flow(engine='pypsa')
+    # voltage collapse in the first time step
+    timestep = results_pypsa.pfa_v_mag_pu.index[0]
+    results = run_power_flow(engine='pypsa',
+                             load_scaling={timestep: load_factor},
+                             non_convergence='bisect')
+
+    not_converged = results.pfa_not_converged
+    assert list(not_converged.index) == [timestep]
+    assert 0 < not_converged.at[timestep, 'load_scaling'] < 1
+    # results of the other time steps are kept
+    compare_results(results_pypsa, results,
+                    timesteps=results_pypsa.pfa_v_mag_pu.index[1:])
+
+
+def test_damped_retry():
+    results_pypsa = run_power_flow(engine='pypsa')
+    timestep = results_pypsa.pfa_v_mag_pu.index[0]
+    run_pf = EDisGo._run_pf
+    calls = []
+
+    def run_pf_not_converged(self, engine, timesteps, use_seed):
+        # the engine does not converge for the first time step and leaves
+        # wrong voltages
+        calls.append(timesteps)
+        pf_results = run_pf(self, engine, timesteps, use_seed)
+        converged = pf_results['converged']
+        converged.loc[converged.index == timestep, '0'] = False
+        self.network.pypsa.buses_t.v_mag_pu.loc[timestep, :] = 0.5
+        return pf_results
+
+    with mock.patch.object(EDisGo, '_run_pf', run_pf_not_converged):
+        try:
+            run_power_flow(engine='pypsa')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('Non-convergence of the engine is not '
+                                 'raised.')
+        # analysis with warm start and retry with flat start
+        assert len(calls) == 2
+        assert list(calls[1]) == [timestep]
+
+        results = run_power_flow(engine='pypsa', non_convergence='record')
+
+    # results of the time step are taken from the damped Z-bus iterations
+    assert results.pfa_not_converged.empty
+    compare_results(results_pypsa, results)
+
+
+if __name__ == '__main__':
+    test_sweep_pf()
+    test_sweep_pf_parallel_transformers()
+    test_zbus_pf()
+    test_warm_start()
+    test_warm_start_windows()
+    test_screening()
+    test_screening_parallel_transformers()
+    test_screening_rings()
+    test_record_non_convergence()
+    test_bisect_non_convergence()
+    test_damped_retry()
@@ -0,0 +1,51 @@
+"""
+Changes the grid topology the way grid reinforcement, generator import and
+storage integration do and asserts that the pypsa representation updated by
+:class:`edisgo.tools.pypsa_io.PyPSASynchronizer` equals a pypsa
+representation set up again by :func:`edisgo.tools.pypsa_io.to_pypsa`.
+It requires a ding0 grid called ding0_grid_example.pkl in the same directory.
+
+"""
+import pandas as pd
+
+from edisgo import EDisGo
+from edisgo.tools import pypsa_io
+
+from example_grid import change_grid
+
+
+def test_synchronizer():
+    edisgo = EDisGo(ding0_grid='ding0_grid_example.pkl',
+                    worst_case_analysis='worst-case')
+    # set up pypsa representation including power flow results
+    edisgo.analyze()
+    change_grid(edisgo)
+
+    network = edisgo.network
+    network.pypsa_synchronizer.apply()
+    pypsa = network.pypsa
+    pypsa_new = pypsa_io.to_pypsa(
+        network, None, network.timeseries.timeindex)
+
+    for name in ['buses', 'lines', 'transformers', 'generators', 'loads',
+                 'storage_units']:
+        pd.testing.assert_frame_equal(
+            getattr(pypsa, name), getattr(pypsa_new, name),
+            check_like=True, check_dtype=False)
+    for name in ['generators', 'loads', 'storage_units']:
+        for attr in ['p_set', 'q_set']:
+            pd.testing.assert_frame_equal(
+                getattr(pypsa, name + '_t')[attr],
+                getattr(pypsa_new, name + '_t')[attr],
+                check_like=True, check_dtype=False)
+
+    # time series of removed components are dropped as well
+    for name in ['buses', 'lines', 'transformers', 'generators', 'loads',
+                 'storage_units']:
+        index = getattr(pypsa, name).index
+        for attr, values in getattr(pypsa, name + '_t').items():
+            assert values.columns.isin(index).all(), (name, attr)
+
+
+if __name__ == '__main__':
+    test_synchronizer()
@@ -0,0 +1,150 @@
+"""
+Compares the time series of all loads, generators and storages calculated at
+once by :meth:`edisgo.grid.network.TimeSeries.components_timeseries` to the
+time series returned by the `timeseries` getter of each component, in the
+worst-case analysis and in the time series analysis, and tests that time
+series cached in :class:`edisgo.grid.network.ComponentTimeSeriesCache` are
+recalculated on changes and evicted when exceeding the memory cap.
+It requires a ding0 grid called ding0_grid_example.pkl in the same directory.
+
+"""
+import numpy as np
+import pandas as pd
+
+from edisgo import EDisGo
+from edisgo.grid.components import GeneratorFluctuating
+
+from example_grid import set_up_example_grid
+
+
+def get_components(network):
+    grids = [network.mv_grid] + list(network.mv_grid.lv_grids)
+    components = []
+    for grid in grids:
+        components.extend(grid.generators)
+        components.extend(list(grid.graph.nodes_by_attribute('load')))
+        components.extend(list(grid.graph.nodes_by_attribute('storage')))
+    return components
+
+
+def compare_components_timeseries(network, components):
+    timeindex = network.timeseries.timeindex
+    p, q = network.timeseries.components_timeseries(components)
+    assert p.index.equals(timeindex)
+    assert list(p.columns) == [repr(_) for _ in components]
+    assert q.index.equals(p.index)
+    assert q.columns.equals(p.columns)
+    for comp in components:
+        ts = comp.timeseries.loc[timeindex, :]
+        assert np.allclose(p[repr(comp)], ts['p'], rtol=1e-6, atol=1e-6), \
+            repr(comp)
+        assert np.allclose(q[repr(comp)], ts['q'], rtol=1e-6, atol=1e-6), \
+            repr(comp)
+
+    # time series of a subset of time steps
+    timesteps = timeindex[[0, -1]]
+    p_subset, q_subset = network.timeseries.components_timeseries(
+        components, timesteps=timesteps)
+    pd.testing.assert_frame_equal(p_subset, p.loc[timesteps, :])
+    pd.testing.assert_frame_equal(q_subset, q.loc[timesteps, :])
+
+
+def test_components_timeseries_worst_case():
+    edisgo = EDisGo(ding0_grid='ding0_grid_example.pkl',
+                    worst_case_analysis='worst-case')
+    network = edisgo.network
+    compare_components_timeseries(network, get_components(network))
+
+
+def test_components_timeseries():
+    edisgo = set_up_example_grid()
+    network = edisgo.network
+    timeindex = network.timeseries.timeindex
+    edisgo.integrate_storage(
+        timeseries=pd.Series(100., index=timeindex),
+        position='hvmv_substation_busbar',
+        timeseries_reactive_power=pd.Series(10., index=timeindex))
+    components = get_components(network)
+
+    # components with own reactive power time series are retrieved from
+    # their getter
+    generator = network.mv_grid.generators[0]
+    generator.timeseries_reactive = pd.Series(
+        np.linspace(-10., 10., len(timeindex)), index=timeindex)
+    compare_components_timeseries(network, components)
+
+
+def test_component_timeseries_cache():
+    edisgo = set_up_example_grid()
+    network = edisgo.network
+    timeseries = network.timeseries
+    cache = timeseries.component_timeseries_cache
+    generator = [_ for _ in network.mv_grid.generators
+                 if isinstance(_, GeneratorFluctuating)][0]
+    load = list(network.mv_grid.graph.nodes_by_attribute('load'))[0]
+
+    # cached time series is not changed by changing the returned copy
+    ts = generator.timeseries
+    info = cache.info
+    ts_changed = generator.timeseries
+    ts_changed.loc[:, 'p'] = -1.
+    pd.testing.assert_frame_equal(generator.timeseries, ts)
+    assert cache.info['hits'] == info['hits'] + 2
+    assert cache.info['misses'] == info['misses']
+
+    # time series are recalculated when the component changes
+    generator.nominal_capacity = 2 * generator.nominal_capacity
+    assert np.allclose(generator.timeseries['p'], 2 * ts['p'])
+    assert np.allclose(generator.timeseries['q'], 2 * ts['q'])
+    ts = generator.timeseries
+
+    generator.power_factor = 0.8
+    assert np.allclose(generator.timeseries['p'], ts['p'])
+    assert np.allclose(generator.timeseries['q'].abs(),
+                       ts['p'].abs() * np.tan(np.arccos(0.8)))
+    ts = generator.timeseries
+
+    generator.reactive_power_mode = 'capacitive' \
+        if generator.q_sign == -1 else 'inductive'
+    assert np.allclose(generator.timeseries['q'], -ts['q'])
+    ts = generator.timeseries
+
+    curtailment = ts['p'] / 2
+    generator.curtailment = curtailment
+    assert np.allclose(generator.timeseries['p'], ts['p'] - curtailment)
+    generator.curtailment = None
+    ts = generator.timeseries
+
+    # time series are recalculated when the underlying time series change
+    timeseries.generation_fluctuating = timeseries.generation_fluctuating / 2
+    assert np.allclose(generator.timeseries['p'], ts['p'] / 2)
+    ts_load = load.timeseries
+    timeseries.load = timeseries.load * 3
+    assert np.allclose(load.timeseries['p'], 3 * ts_load['p'])
+    assert np.allclose(load.timeseries['q'], 3 * ts_load['q'])
+
+    # least recently used time series are evicted when exceeding the memory
+    # cap
+    cache.clear()
+    generator.timeseries
+    load.timeseries
+    assert len(cache) == 2
+    evictions = cache.info['evictions']
+    cache.max_memory = cache.memory - 1
+    assert len(cache) == 1
+    assert cache.memory <= cache.max_memory
+    assert cache.info['evictions'] == evictions + 1
+    # the generator was used least recently and is recalculated
+    info = cache.info
+    load.timeseries
+    assert cache.info['hits'] == info['hits'] + 1
+    generator.timeseries
+    assert cache.info['misses'] == info['misses'] + 1
+    assert cache.info['evictions'] == evictions + 2
+    assert len(cache) == 1
+
+
+if __name__ == '__main__':
+    test_components_timeseries_worst_case()
+    test_components_timeseries()
+    test_component_timeseries_cache()